@@ -0,0 +1,9 @@
+#!/bin/sh
+
+# Set PYTHONPATH environment variable
+export PYTHONPATH=/home/app/web/src
+
+# Migrations and static files are handled by start-prod.sh, this server only serves
+# the async read endpoints under /api/async/ (see compose/nginx/nginx.conf)
+echo "Starting Django ASGI server..."
+gunicorn config.asgi:application --worker-class uvicorn_worker.UvicornWorker --bind 0.0.0.0:8001
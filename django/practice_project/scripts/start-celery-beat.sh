@@ -0,0 +1,9 @@
+#!/bin/sh
+
+# Set PYTHONPATH environment variable
+export PYTHONPATH=/home/app/web/src
+cd /home/app/web/src || exit 1
+
+# Sends the periodic tasks of CELERY_BEAT_SCHEDULE, a single instance must run
+echo "Starting Celery beat..."
+exec celery -A config beat --loglevel=info
@@ -0,0 +1,20 @@
+#!/bin/sh
+
+# Set PYTHONPATH environment variable
+export PYTHONPATH=/home/app/web/src
+cd /home/app/web/src || exit 1
+
+# Each worker consumes its own queues of CELERY_TASK_ROUTES. Slow queues use a low
+# prefetch so that a worker busy with a batch doesn't hold messages others could run
+QUEUES=${CELERY_QUEUES:-default}
+CONCURRENCY=${CELERY_CONCURRENCY:-4}
+PREFETCH_MULTIPLIER=${CELERY_PREFETCH_MULTIPLIER:-4}
+
+echo "Starting Celery worker of the $QUEUES queues..."
+exec celery -A config worker \
+  --queues "$QUEUES" \
+  --hostname "$QUEUES@%h" \
+  --concurrency "$CONCURRENCY" \
+  --prefetch-multiplier "$PREFETCH_MULTIPLIER" \
+  -O fair \
+  --loglevel=info
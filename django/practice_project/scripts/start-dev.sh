@@ -11,4 +11,4 @@ python manage.py migrate
 # Start both Django development server and Celery worker in the background
 echo "Starting Django development server and Celery worker..."
 python manage.py runserver 0.0.0.0:8000 &
-celery -A config worker --loglevel=info
+celery -A config worker --queues realtime,default,bulk --loglevel=info
@@ -3,3 +3,9 @@ from .comment import CommentViewSet
 from .post import PostViewSet
 from .like import LikeViewSet
 from .notification import NotificationViewSet
+from .async_read import (
+    AsyncPostListView,
+    AsyncPostDetailView,
+    AsyncCommentListView,
+    AsyncNotificationListView,
+)
@@ -0,0 +1,142 @@
+import asyncio
+
+from rest_framework.exceptions import NotFound
+
+# Utils
+from utils import (
+    AsyncHydratedSearchResults,
+    AsyncReadAPIView,
+    KeysetPaginationMixin,
+    StandardPagination,
+)
+
+# Models
+from apps.feeds.models import Comment, Notification, Post
+
+# Serializers
+from apps.feeds.serializers import (
+    CommentSerializer,
+    NotificationSerializer,
+    PostSerializer,
+)
+
+# Documents
+from apps.feeds.documents import PostDocument
+
+# Counters and notifications
+from apps.feeds import notifications
+from apps.feeds.counters import aattach_pending_counters
+
+# Views
+from apps.feeds.apis.comment import CommentViewSet
+from apps.feeds.apis.notification import NotificationViewSet
+from apps.feeds.apis.post import PostViewSet
+
+
+class AsyncPostListView(KeysetPaginationMixin, AsyncReadAPIView):
+    """
+    Async version of `PostViewSet.list`, served by the uvicorn workers.
+
+    Takes the same parameters, except `feed`. Responses are not cached, the state of
+    the viewer is annotated by the query of the page.
+    """
+
+    pagination_class = StandardPagination
+    document_class = PostDocument
+    keyset_ordering = PostViewSet.keyset_ordering
+
+    use_search = PostViewSet.use_search
+
+    def use_keyset_pagination(self):
+        # Search results are paginated with page numbers
+        return super().use_keyset_pagination() and not self.use_search()
+
+    async def get(self, request):
+        queryset = (
+            Post.objects.with_feed_relations().with_viewer_state(request.user).active()
+        )
+        posts = queryset.order_by(*self.keyset_ordering)
+
+        if self.use_search():
+            elastic_search = self.document_class.apply_query_params(
+                self.document_class.async_search(), request.query_params
+            )
+
+            posts = AsyncHydratedSearchResults(elastic_search, queryset)
+
+        paginated_posts = await self.paginator.apaginate_queryset(posts, request)
+        await aattach_pending_counters(paginated_posts)
+
+        serializer = PostSerializer(paginated_posts, many=True)
+
+        return self.paginator.get_paginated_response(serializer.data).data
+
+
+class AsyncPostDetailView(AsyncReadAPIView):
+    """Async version of `PostViewSet.retrieve`, served by the uvicorn workers."""
+
+    async def get(self, request, pk):
+        post = await (
+            Post.objects.with_feed_relations()
+            .with_viewer_state(request.user)
+            .active()
+            .filter(id=pk)
+            .afirst()
+        )
+
+        if post is None:
+            raise NotFound("No Post matches the given query.")
+
+        await aattach_pending_counters([post])
+
+        return PostSerializer(post).data
+
+
+class AsyncCommentListView(KeysetPaginationMixin, AsyncReadAPIView):
+    """Async version of `CommentViewSet.list`, served by the uvicorn workers."""
+
+    pagination_class = StandardPagination
+    keyset_ordering = CommentViewSet.keyset_ordering
+
+    async def get(self, request, post_id):
+        comments = (
+            Comment.objects.select_related("user")
+            .filter(post_id=post_id)
+            .active()
+            .order_by(*self.keyset_ordering)
+        )
+
+        paginated_comments = await self.paginator.apaginate_queryset(comments, request)
+        serializer = CommentSerializer(paginated_comments, many=True)
+
+        return self.paginator.get_paginated_response(serializer.data).data
+
+
+class AsyncNotificationListView(KeysetPaginationMixin, AsyncReadAPIView):
+    """
+    Async version of `NotificationViewSet.list`, served by the uvicorn workers.
+
+    The page and the unread count are read concurrently.
+    """
+
+    pagination_class = StandardPagination
+    keyset_ordering = NotificationViewSet.keyset_ordering
+
+    async def get(self, request):
+        queryset = Notification.objects.filter(user=request.user).order_by(
+            *self.keyset_ordering
+        )
+
+        if request.query_params.get("unread") == "true":
+            queryset = queryset.filter(read_at__isnull=True)
+
+        paginated_notifications, unread_count = await asyncio.gather(
+            self.paginator.apaginate_queryset(queryset, request),
+            notifications.aget_unread_count(request.user.id),
+        )
+        serializer = NotificationSerializer(paginated_notifications, many=True)
+
+        data = self.paginator.get_paginated_response(serializer.data).data
+        data["unread_count"] = unread_count
+
+        return data
@@ -68,4 +68,4 @@ class CategoryViewSet(
     permission_classes = [IsAuthenticated, IsAdminOrReadOnlyPermission]
     serializer_class = CategorySerializer
     pagination_class = StandardPagination
-    queryset = Category.objects.active()
+    queryset = Category.objects.active().order_by("name")
@@ -1,4 +1,3 @@
-from rest_framework_extensions.cache.mixins import CacheResponseMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import (
@@ -9,9 +8,10 @@ from rest_framework.mixins import (
     DestroyModelMixin,
 )
 
-
 # Utils
 from utils import (
+    PayloadCacheResponseMixin,
+    KeysetPaginationMixin,
     StandardPagination,
     extend_schema,
     extend_schema_view,
@@ -57,7 +57,8 @@ from apps.feeds.permissions import IsAuthorAdminOrReadOnlyPermission
     ),
 )
 class CommentViewSet(
-    CacheResponseMixin,
+    KeysetPaginationMixin,
+    PayloadCacheResponseMixin,
     ListModelMixin,
     RetrieveModelMixin,
     CreateModelMixin,
@@ -74,6 +75,7 @@ class CommentViewSet(
     permission_classes = [IsAuthenticated, IsAuthorAdminOrReadOnlyPermission]
     serializer_class = CommentSerializer
     pagination_class = StandardPagination
+    keyset_ordering = ("created", "id")
 
     def get_queryset(self):
         """
@@ -83,10 +85,13 @@ class CommentViewSet(
         post_id = self.kwargs.get("post_id")
         comment_id = self.kwargs.get("pk")
 
+        # The serializer reads the author's username of every comment
+        comments = Comment.objects.select_related("user")
+
         if comment_id and post_id:
-            return Comment.objects.filter(id=comment_id, post_id=post_id).active()
+            return comments.filter(id=comment_id, post_id=post_id).active()
 
-        return Comment.objects.filter(post_id=post_id).active()
+        return comments.filter(post_id=post_id).active().order_by(*self.keyset_ordering)
 
     def perform_create(self, serializer):
         user_id = self.request.user.id
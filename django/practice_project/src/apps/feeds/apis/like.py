@@ -4,12 +4,19 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 
 # Models
-from apps.feeds.models import Post, Like
+from apps.feeds.models import Post
+
+# Likes
+from apps.feeds import likes
 
 # Utils
-from utils import extend_schema, extend_schema_view
+from utils import extend_schema, extend_schema_view, OpenApiParameter
+
+# Most posts whose liked state can be looked up at once
+MAX_LIKED_LOOKUP = 100
 
 
 @extend_schema_view(
@@ -23,7 +30,22 @@ from utils import extend_schema, extend_schema_view
             HTTP_200_OK: {"message": "Post unliked"},
             HTTP_201_CREATED: {"message": "Post liked"},
         },
-    )
+    ),
+    liked=extend_schema(
+        summary="Check which posts are liked",
+        description="Return the IDs, among the given ones, of the posts liked by the "
+        "authenticated user.",
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                str,
+                OpenApiParameter.QUERY,
+                description=f"Required, comma-separated IDs of at most "
+                f"{MAX_LIKED_LOOKUP} posts",
+            ),
+        ],
+        responses={HTTP_200_OK: {"liked": [1, 2]}},
+    ),
 )
 class LikeViewSet(
     CreateModelMixin,
@@ -36,12 +58,34 @@ class LikeViewSet(
     @action(detail=True, methods=["post"], url_path="like")
     def like_or_unlike(self, request, *args, **kwargs):
         post_id = self.kwargs.get("post_id")
-        post = Post.objects.get(pk=post_id)
 
-        like, created = Like.objects.get_or_create(post=post, user=request.user)
+        # A single statement on PostgreSQL, see `apps.feeds.likes`
+        try:
+            liked = likes.toggle_like(post_id, request.user.id)
+        except Post.DoesNotExist:
+            raise NotFound("Post not found")
 
-        if created:
+        if liked:
             return Response({"message": "Post liked"}, status=HTTP_201_CREATED)
         else:
-            like.delete()
             return Response({"message": "Post unliked"}, status=HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="liked")
+    def liked(self, request, *args, **kwargs):
+        try:
+            post_ids = {
+                int(post_id)
+                for post_id in request.query_params.get("ids", "").split(",")
+                if post_id
+            }
+        except ValueError:
+            raise ValidationError({"ids": "Must be comma-separated integers."})
+
+        if len(post_ids) > MAX_LIKED_LOOKUP:
+            raise ValidationError(
+                {"ids": f"At most {MAX_LIKED_LOOKUP} posts can be looked up."}
+            )
+
+        liked = likes.get_liked_post_ids(request.user.id, post_ids)
+
+        return Response({"liked": sorted(liked)})
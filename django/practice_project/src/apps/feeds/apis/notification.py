@@ -1,36 +1,97 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 # Models
 from apps.feeds.models import Notification
 
+# Notifications
+from apps.feeds import notifications
+
 # Serializers
-from apps.feeds.serializers import NotificationSerializer
+from apps.feeds.serializers import NotificationSerializer, NotificationReadSerializer
 
 # Utils
-from utils import extend_schema_view, extend_schema, StandardPagination
+from utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+    KeysetPaginationMixin,
+    StandardPagination,
+)
 
 
 @extend_schema_view(
     list=extend_schema(
         summary="Retrieve user notifications",
-        description="Retrieve all notifications for the current user with pagination.",
+        description=(
+            "Retrieve the notifications of the current user, newest first. Pass "
+            "`pagination=keyset` to link the pages by a `cursor` instead of numbering "
+            "them. `unread_count` is the number of unread notifications."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "unread",
+                bool,
+                OpenApiParameter.QUERY,
+                description="Only return unread notifications when `true`",
+            ),
+        ],
         responses={200: NotificationSerializer(many=True)},
     ),
+    mark_read=extend_schema(
+        summary="Mark notifications as read",
+        description=(
+            "Mark the given notifications of the current user as read, or all of "
+            "them when `ids` is omitted."
+        ),
+        request=NotificationReadSerializer,
+        responses={200: {"updated": 0, "unread_count": 0}},
+    ),
 )
-class NotificationViewSet(viewsets.GenericViewSet):
+class NotificationViewSet(KeysetPaginationMixin, viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
     pagination_class = StandardPagination
+    keyset_ordering = ("-created", "-id")
 
     def list(self, request, *args, **kwargs):
         """
-        Retrieve all notifications for the authenticated user, with pagination.
+        Retrieve the notifications of the authenticated user, with pagination.
+
+        Pages are read from the `(user, created, id)` index, and the unread count is
+        cached in Redis rather than counted.
         """
-        queryset = Notification.objects.filter(user=request.user)
+        queryset = Notification.objects.filter(user=request.user).order_by(
+            *self.keyset_ordering
+        )
+
+        if request.query_params.get("unread") == "true":
+            queryset = queryset.filter(read_at__isnull=True)
 
         # Paginate the queryset
         paginated_notifications = self.paginate_queryset(queryset)
         serializer = self.get_serializer(paginated_notifications, many=True)
 
-        return self.get_paginated_response(serializer.data)
+        response = self.get_paginated_response(serializer.data)
+        response.data["unread_count"] = notifications.get_unread_count(request.user.id)
+
+        return response
+
+    @action(detail=False, methods=["post"], url_path="read")
+    def mark_read(self, request, *args, **kwargs):
+        """Mark notifications of the authenticated user as read, in one UPDATE."""
+        serializer = NotificationReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        updated = notifications.mark_read(
+            request.user.id, serializer.validated_data.get("ids")
+        )
+
+        return Response(
+            {
+                "updated": updated,
+                "unread_count": notifications.get_unread_count(request.user.id),
+            }
+        )
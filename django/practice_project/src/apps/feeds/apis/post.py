@@ -1,5 +1,7 @@
-from rest_framework_extensions.cache.mixins import CacheResponseMixin
-from rest_framework_extensions.cache.decorators import cache_response
+import re
+import time
+
+from django.db import transaction
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import (
@@ -12,11 +14,17 @@ from rest_framework.mixins import (
 
 # Utils
 from utils import (
+    PayloadCacheResponseMixin,
+    KeysetPaginationMixin,
     OpenApiParameter,
     StandardPagination,
     extend_schema_view,
     extend_schema,
+    set_etag,
+    swr_cache_response,
+    HydratedSearchResults,
 )
+from utils.metrics import incr_metric
 
 # Models
 from apps.feeds.models import Post
@@ -30,6 +38,18 @@ from apps.feeds.permissions import IsAuthorAdminOrReadOnlyPermission
 # Documents
 from apps.feeds.documents import PostDocument
 
+# Counters
+from apps.feeds.counters import attach_pending_counters
+
+# Timelines
+from apps.feeds.timelines import get_home_timeline
+
+# Opening of each post rendered by `PostSerializer`, `id` is its first field
+POST_ID_PATTERN = re.compile(rb'\{"id":(\d+),')
+
+# State of the viewer as rendered in the shared cached content, once per post
+VIEWER_STATE_PLACEHOLDER = b'"liked_by_me":false,"commented_by_me":false'
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -37,6 +57,14 @@ from apps.feeds.documents import PostDocument
         description="Retrieve a list of active posts with optional filters.",
         responses={200: PostSerializer(many=True)},
         parameters=[
+            OpenApiParameter(
+                "feed",
+                str,
+                OpenApiParameter.QUERY,
+                description='Set to "home" for the posts of the categories the user '
+                "posted, liked or commented in, newest first. Other filters are ignored",
+                enum=["home"],
+            ),
             OpenApiParameter(
                 "search",
                 str,
@@ -50,6 +78,25 @@ from apps.feeds.documents import PostDocument
                 description='Order posts by "comments" or "likes"',
                 enum=["modified", "comments_count", "likes_count"],
             ),
+            OpenApiParameter(
+                "page_size",
+                int,
+                OpenApiParameter.QUERY,
+                description="Number of posts per page (at most 100)",
+            ),
+            OpenApiParameter(
+                "pagination",
+                str,
+                OpenApiParameter.QUERY,
+                description='Set to "keyset" to paginate with cursors instead of page numbers',
+                enum=["keyset"],
+            ),
+            OpenApiParameter(
+                "cursor",
+                str,
+                OpenApiParameter.QUERY,
+                description="Cursor of the page to retrieve, from the `next` link of the previous page",
+            ),
             OpenApiParameter(
                 "latitude",
                 float,
@@ -93,7 +140,8 @@ from apps.feeds.documents import PostDocument
     ),
 )
 class PostViewSet(
-    CacheResponseMixin,
+    KeysetPaginationMixin,
+    PayloadCacheResponseMixin,
     ListModelMixin,
     RetrieveModelMixin,
     CreateModelMixin,
@@ -109,6 +157,32 @@ class PostViewSet(
     serializer_class = PostSerializer
     pagination_class = StandardPagination
     document_class = PostDocument
+    keyset_ordering = ("-modified", "-id")
+
+    # Cached content is shared by every user, the ETag is set after `add_viewer_state`
+    conditional_cache_response = False
+
+    def use_search(self):
+        """Whether the list is searched in Elasticsearch rather than the database."""
+        query_params = self.request.query_params
+
+        return bool(
+            query_params.get("search")
+            or query_params.get("order_by")
+            or (query_params.get("latitude") and query_params.get("longitude"))
+        )
+
+    def use_home_feed(self):
+        """Whether the list is the home timeline of the user (see `apps.feeds.timelines`)."""
+        return self.request.query_params.get("feed") == "home"
+
+    def use_keyset_pagination(self):
+        # Search results and timelines are paginated with page numbers
+        return (
+            super().use_keyset_pagination()
+            and not self.use_search()
+            and not self.use_home_feed()
+        )
 
     def get_queryset(self):
         """
@@ -118,45 +192,128 @@ class PostViewSet(
         post_id = self.kwargs.get("pk")
 
         if post_id:
-            return Post.objects.filter(id=post_id).active()
+            return Post.objects.with_feed_relations().filter(id=post_id).active()
 
         return self.queryset
 
-    @cache_response()
     def list(self, request, *args, **kwargs):
-        # Get the search term from query parameters, if provided
-        search = self.request.query_params.get("search")
-        order_by = self.request.query_params.get("order_by")
-        latitude = self.request.query_params.get("latitude")
-        longitude = self.request.query_params.get("longitude")
-        distance = self.request.query_params.get("distance")
+        if self.use_home_feed():
+            return self.list_home(request)
 
-        # Get all active posts by default
-        posts = Post.objects.all().active().order_by("-modified")
+        response = self.list_all(request, *args, **kwargs)
 
-        if search or order_by or (latitude and longitude):
-            # Get all posts from Elasticsearch
-            elastic_search = self.document_class.search()
+        return self.add_viewer_state(response)
 
-            elastic_search = self.document_class.apply_search(
-                elastic_search,
-                search,
-            )
-            elastic_search = self.document_class.apply_ordering(
-                elastic_search,
-                order_by,
-            )
-            elastic_search = self.document_class.apply_distance_filtering(
-                elastic_search, latitude, longitude, distance
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+
+        return self.add_viewer_state(response)
+
+    def add_viewer_state(self, response):
+        """
+        Set `liked_by_me` and `commented_by_me` in a cached response.
+
+        Cached responses are shared by every user, the state of the viewer is read for
+        the posts of the page afterwards with a single query, and spliced into the
+        rendered JSON rather than decoding and rendering it again. Quotes are escaped
+        in JSON strings, so the patterns can't match inside a title or content. The
+        ETag is computed on the final content.
+
+        Its cost is counted in `viewer_state_seconds` of the payload metric of the
+        action, next to the latency of the hits, see `show_metrics`.
+        """
+        if response.status_code != 200:
+            return response
+
+        started = time.perf_counter()
+
+        post_ids = [
+            int(post_id) for post_id in POST_ID_PATTERN.findall(response.content)
+        ]
+        states = {
+            post_id: (liked, commented)
+            for post_id, liked, commented in Post.objects.filter(id__in=post_ids)
+            .with_viewer_state(self.request.user)
+            .values_list("id", "liked_by_me", "commented_by_me")
+            if liked or commented
+        }
+
+        if states:
+            parts = response.content.split(VIEWER_STATE_PLACEHOLDER)
+            content = [parts[0]]
+
+            # Each post has a placeholder, after its ID
+            for post_id, part in zip(post_ids, parts[1:]):
+                liked, commented = states.get(post_id, (False, False))
+                content += [
+                    b'"liked_by_me":%s,"commented_by_me":%s'
+                    % (
+                        b"true" if liked else b"false",
+                        b"true" if commented else b"false",
+                    ),
+                    part,
+                ]
+
+            response.content = b"".join(content)
+
+        payload_metric_name = f"cache:{self.__class__.__name__}.{self.action}:payload"
+        incr_metric(payload_metric_name, "viewer_states")
+        incr_metric(
+            payload_metric_name, "viewer_state_seconds", time.perf_counter() - started
+        )
+
+        return set_etag(self.request, response)
+
+    def list_home(self, request):
+        """
+        List the home timeline of the user.
+
+        Post IDs are read from the precomputed timeline, then loaded with one query,
+        along with the state of the viewer. Timelines differ per user, so they aren't
+        cached with the other lists.
+        """
+        timeline = get_home_timeline(
+            request.user.id,
+            Post.objects.with_feed_relations().with_viewer_state(request.user).active(),
+        )
+
+        paginated_posts = self.paginate_queryset(timeline)
+        attach_pending_counters(paginated_posts)
+
+        serializer = self.get_serializer(paginated_posts, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @swr_cache_response(metric_name="cache:PostViewSet.list")
+    def list_all(self, request, *args, **kwargs):
+        # Get all active posts by default
+        queryset = Post.objects.with_feed_relations().active()
+        posts = queryset.order_by(*self.keyset_ordering)
+
+        if self.use_search():
+            # Get all posts from Elasticsearch, searched, ordered and filtered
+            elastic_search = self.document_class.apply_query_params(
+                self.document_class.search(), self.request.query_params
             )
 
-            # Get the posts from the search results
-            posts = elastic_search.execute().hits
+            # Only the requested page is fetched from Elasticsearch, then loaded from the database
+            posts = HydratedSearchResults(elastic_search, queryset)
 
         paginated_posts = self.paginate_queryset(posts)
+
+        # Read the likes and comments not yet flushed to the statistics in one round trip
+        attach_pending_counters(paginated_posts)
+
         serializer = self.get_serializer(paginated_posts, many=True)
 
         return self.get_paginated_response(serializer.data)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        # The post, its statistics and outbox events are saved together, the events
+        # are published in one batch once the transaction commits
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.conf import settings
+from elasticsearch_dsl import async_connections
 
 
 class FeedsConfig(AppConfig):
@@ -7,3 +9,6 @@ class FeedsConfig(AppConfig):
 
     def ready(self):
         import apps.feeds.signals
+
+        # Clients of the async views, `django_elasticsearch_dsl` configures the others
+        async_connections.configure(**settings.ELASTICSEARCH_DSL)
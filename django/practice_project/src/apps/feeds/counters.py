@@ -0,0 +1,229 @@
+"""
+Write-behind buffer of the like and comment counters of posts.
+
+Signals add deltas to a Redis hash per post instead of updating `PostStatistics`,
+`flush_post_counters_task` periodically applies them to the database in bulk.
+Until then, `Post.likes_count` and `Post.comments_count` add the pending deltas
+so that counts stay accurate in real time.
+
+A flush doesn't delete the deltas it applies: they are first moved to a claimed hash
+per post, still counted by the reads, and only deleted once the UPDATE committed.
+A post is claimed by one flush at a time, claims of a flush that died are taken over
+after `POST_COUNTERS_CLAIM_TIMEOUT` seconds. Deltas are applied at least once: if a
+flush dies between its commit and the deletion of its claims, they are applied again.
+"""
+
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# Utils
+from utils.async_redis import get_async_redis_connection
+
+# Prefix of the Redis hashes holding the pending deltas of each post
+COUNTERS_KEY_PREFIX = "post_counters"
+
+# Redis set of the IDs of the posts having pending deltas
+DIRTY_KEY = f"{COUNTERS_KEY_PREFIX}:dirty"
+
+# Redis sorted set of the IDs of the posts whose deltas are being flushed, scored with
+# the time they were claimed
+CLAIMED_KEY = f"{COUNTERS_KEY_PREFIX}:claimed"
+
+# Claims a post for a flush, unless another flush holds it since less than the claim
+# timeout: its pending deltas are then left for the next flush. Otherwise moves the
+# pending deltas to the claimed ones, and returns these
+CLAIM_SCRIPT = """
+local claimed_at = redis.call("zscore", KEYS[3], ARGV[1])
+if claimed_at and tonumber(claimed_at) > tonumber(ARGV[2]) - tonumber(ARGV[3]) then
+    if redis.call("exists", KEYS[1]) == 1 then
+        redis.call("sadd", KEYS[4], ARGV[1])
+    end
+    return false
+end
+redis.call("zadd", KEYS[3], ARGV[2], ARGV[1])
+local counters = redis.call("hgetall", KEYS[1])
+for index = 1, #counters, 2 do
+    redis.call("hincrby", KEYS[2], counters[index], counters[index + 1])
+end
+redis.call("del", KEYS[1])
+return redis.call("hgetall", KEYS[2])
+"""
+
+
+def get_counters_key(post_id):
+    """Return the Redis key of the hash holding the pending deltas of a post."""
+    return f"{COUNTERS_KEY_PREFIX}:{post_id}"
+
+
+def get_claimed_key(post_id):
+    """Return the Redis key of the hash holding the deltas of a post being flushed."""
+    return f"{CLAIMED_KEY}:{post_id}"
+
+
+def incr_post_counter(post_id, field, delta):
+    """
+    Buffers a change of a post counter.
+
+    Args:
+        post_id: ID of the post.
+        field: Counter of `PostStatistics` to change, e.g. 'likes_count'.
+        delta: Amount to add, negative to decrement.
+    """
+    pipeline = get_redis_connection("default").pipeline(transaction=False)
+    pipeline.hincrby(get_counters_key(post_id), field, delta)
+    pipeline.sadd(DIRTY_KEY, post_id)
+    pipeline.execute()
+
+
+def _parse(counters):
+    return {field.decode(): int(delta) for field, delta in counters.items()}
+
+
+def _merge(pending, claimed):
+    """Return the sum of the pending and claimed deltas of a post."""
+    counters = _parse(pending)
+
+    for field, delta in _parse(claimed).items():
+        counters[field] = counters.get(field, 0) + delta
+
+    return counters
+
+
+def get_pending_counters(post_ids):
+    """
+    Returns the deltas not yet applied to the database, claimed by a flush or not.
+
+    Args:
+        post_ids: IDs of the posts.
+
+    Returns:
+        dict: Mapping of post ID to a dict of counter name to delta.
+    """
+    pipeline = get_redis_connection("default").pipeline(transaction=False)
+
+    for post_id in post_ids:
+        pipeline.hgetall(get_counters_key(post_id))
+        pipeline.hgetall(get_claimed_key(post_id))
+
+    results = pipeline.execute()
+
+    return {
+        post_id: _merge(pending, claimed)
+        for post_id, pending, claimed in zip(post_ids, results[::2], results[1::2])
+    }
+
+
+def attach_pending_counters(posts):
+    """Load the pending deltas of many posts in one round trip."""
+    posts = list(posts)
+    pending_counters = get_pending_counters([post.id for post in posts])
+
+    for post in posts:
+        post.pending_counters = pending_counters[post.id]
+
+
+async def aattach_pending_counters(posts):
+    """Asynchronous version of `attach_pending_counters`, for the async views."""
+    posts = list(posts)
+    pipeline = get_async_redis_connection().pipeline(transaction=False)
+
+    for post in posts:
+        pipeline.hgetall(get_counters_key(post.id))
+        pipeline.hgetall(get_claimed_key(post.id))
+
+    results = await pipeline.execute()
+
+    for post, pending, claimed in zip(posts, results[::2], results[1::2]):
+        post.pending_counters = _merge(pending, claimed)
+
+
+def claim_pending_counters(limit):
+    """
+    Claims the pending deltas of up to `limit` posts for a flush.
+
+    The deltas of each post are moved atomically, increments made in the meantime are
+    kept for the next flush. A post is only claimed by one flush at a time: posts
+    claimed by another flush are skipped, unless it didn't finish within
+    `POST_COUNTERS_CLAIM_TIMEOUT` seconds, then they are claimed again.
+
+    Returns:
+        dict: Mapping of post ID to a dict of counter name to delta, to pass to
+            `release_claimed_counters` once applied.
+    """
+    connection = get_redis_connection("default")
+    now = time.time()
+
+    post_ids = {int(post_id) for post_id in connection.spop(DIRTY_KEY, limit)}
+    post_ids.update(
+        int(post_id)
+        for post_id in connection.zrangebyscore(
+            CLAIMED_KEY, "-inf", now - settings.POST_COUNTERS_CLAIM_TIMEOUT
+        )
+    )
+
+    if not post_ids:
+        return {}
+
+    claim = connection.register_script(CLAIM_SCRIPT)
+    pipeline = connection.pipeline(transaction=False)
+
+    for post_id in post_ids:
+        claim(
+            keys=[
+                get_counters_key(post_id),
+                get_claimed_key(post_id),
+                CLAIMED_KEY,
+                DIRTY_KEY,
+            ],
+            args=[post_id, now, settings.POST_COUNTERS_CLAIM_TIMEOUT],
+            client=pipeline,
+        )
+
+    deltas = {}
+    empty_post_ids = set()
+
+    for post_id, counters in zip(post_ids, pipeline.execute()):
+        # Claimed by another flush
+        if counters is None:
+            continue
+
+        # HGETALL replies of scripts are flat lists of fields and values
+        counters = dict(zip(counters[::2], counters[1::2]))
+
+        if counters:
+            deltas[post_id] = _parse(counters)
+        else:
+            empty_post_ids.add(post_id)
+
+    # Posts that had nothing pending have nothing to flush
+    release_claimed_counters(empty_post_ids)
+
+    return deltas
+
+
+def release_claimed_counters(post_ids):
+    """Deletes the claimed deltas of posts once they are saved to the database."""
+    if not post_ids:
+        return
+
+    pipeline = get_redis_connection("default").pipeline(transaction=True)
+    pipeline.delete(*[get_claimed_key(post_id) for post_id in post_ids])
+    pipeline.zrem(CLAIMED_KEY, *post_ids)
+    pipeline.execute()
+
+
+def unclaim_counters(post_ids):
+    """
+    Gives back the claimed deltas of posts that could not be saved to the database.
+
+    They stay counted by the reads, and are claimed again by the next flush.
+    """
+    if not post_ids:
+        return
+
+    pipeline = get_redis_connection("default").pipeline(transaction=True)
+    pipeline.sadd(DIRTY_KEY, *post_ids)
+    pipeline.zrem(CLAIMED_KEY, *post_ids)
+    pipeline.execute()
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django_elasticsearch_dsl import Document, Index, fields
 from django_elasticsearch_dsl.registries import registry
+from elasticsearch_dsl import AsyncSearch
 
 # Models
 from apps.feeds.models import Post, PostStatistics
@@ -37,6 +38,26 @@ class PostDocument(Document):
         if isinstance(related_instance, PostStatistics):
             return related_instance.post
 
+    @classmethod
+    def async_search(cls):
+        """Return an `AsyncSearch` of the index, using the `AsyncElasticsearch` client."""
+        return AsyncSearch(using=cls._get_using(), index=cls._default_index())
+
+    @classmethod
+    def apply_query_params(cls, elastic_search, query_params):
+        """Apply the search, ordering and distance filter of the post list parameters."""
+        elastic_search = cls.apply_search(elastic_search, query_params.get("search"))
+        elastic_search = cls.apply_ordering(
+            elastic_search, query_params.get("order_by")
+        )
+
+        return cls.apply_distance_filtering(
+            elastic_search,
+            query_params.get("latitude"),
+            query_params.get("longitude"),
+            query_params.get("distance"),
+        )
+
     @classmethod
     def apply_search(cls, elastic_search, search):
         if search:
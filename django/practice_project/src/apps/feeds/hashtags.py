@@ -0,0 +1,204 @@
+"""
+Extraction of the hashtags of posts.
+
+The hashtags of posts are rebuilt by `extract_and_associate_hashtags_task` with a
+constant number of queries, whatever the number of posts and tags. The hash of the
+content they were extracted from is cached, so saves that don't change the content
+don't queue the task at all.
+
+Posts waiting for their hashtags are also queued in a Redis sorted set, scored with
+the time they were queued. Each task extracts its post together with up to
+`HASHTAGS_BATCH_SIZE` waiting posts, so a backlog of tasks is worked off in a few
+batches: the tasks of posts already extracted by another batch have nothing left to do.
+"""
+
+import hashlib
+import re
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django_redis import get_redis_connection
+
+# Models
+from apps.feeds.models import Hashtag, Post
+
+# Utils
+from utils.metrics import incr_metric
+
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+
+# Longest name a hashtag can be stored with
+MAX_NAME_LENGTH = Hashtag._meta.get_field("name").max_length
+
+# Redis sorted set of the IDs of the posts waiting for their hashtags
+PENDING_KEY = "hashtags:pending"
+
+METRIC_NAME = "hashtags"
+
+
+def extract_hashtags(content):
+    """Return the distinct hashtags of a text, in order of first appearance."""
+    names = HASHTAG_PATTERN.findall(content or "")
+
+    return [name for name in dict.fromkeys(names) if len(name) <= MAX_NAME_LENGTH]
+
+
+def get_content_hash(content):
+    return hashlib.sha1((content or "").encode()).hexdigest()
+
+
+def get_content_hash_key(post_id):
+    """Return the cache key of the hash of the content the hashtags were extracted from."""
+    return f"hashtags:content:{post_id}"
+
+
+def has_content_changed(post):
+    """Whether the hashtags of a post may differ from the ones last extracted."""
+    return cache.get(get_content_hash_key(post.id)) != get_content_hash(post.content)
+
+
+def associate_hashtags(post_id):
+    """Replaces the hashtags of a post by the ones found in its content."""
+    associate_hashtags_many([post_id])
+
+
+def associate_hashtags_many(post_ids, only_changed=False):
+    """
+    Replaces the hashtags of posts by the ones found in their content.
+
+    Missing hashtags are inserted with one `INSERT ... ON CONFLICT DO NOTHING`, and
+    only the links that changed are written, with one query for every post.
+
+    Args:
+        post_ids: IDs of the posts.
+        only_changed: Skip the posts whose content didn't change since their hashtags
+            were last extracted.
+
+    Returns:
+        int: Number of posts whose hashtags were extracted.
+    """
+    posts = list(Post.objects.only("id", "content").filter(id__in=post_ids))
+
+    if only_changed:
+        content_hashes = cache.get_many(
+            [get_content_hash_key(post.id) for post in posts]
+        )
+        posts = [
+            post
+            for post in posts
+            if content_hashes.get(get_content_hash_key(post.id))
+            != get_content_hash(post.content)
+        ]
+
+    if not posts:
+        return 0
+
+    names = {post.id: extract_hashtags(post.content) for post in posts}
+    all_names = set().union(*names.values())
+
+    if all_names:
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in sorted(all_names)], ignore_conflicts=True
+        )
+        hashtag_ids = dict(
+            Hashtag.objects.filter(name__in=all_names).values_list("name", "id")
+        )
+    else:
+        hashtag_ids = {}
+
+    through = Post.hashtags.through
+    current_ids = defaultdict(set)
+
+    for post_id, hashtag_id in through.objects.filter(post_id__in=names).values_list(
+        "post_id", "hashtag_id"
+    ):
+        current_ids[post_id].add(hashtag_id)
+
+    added = []
+    removed = Q()
+
+    for post in posts:
+        post_hashtag_ids = {hashtag_ids[name] for name in names[post.id]}
+        added += [
+            through(post_id=post.id, hashtag_id=hashtag_id)
+            for hashtag_id in post_hashtag_ids - current_ids[post.id]
+        ]
+
+        if current_ids[post.id] - post_hashtag_ids:
+            removed |= Q(
+                post_id=post.id,
+                hashtag_id__in=current_ids[post.id] - post_hashtag_ids,
+            )
+
+    if added:
+        through.objects.bulk_create(added, ignore_conflicts=True)
+
+    if removed:
+        through.objects.filter(removed).delete()
+
+    cache.set_many(
+        {
+            get_content_hash_key(post.id): get_content_hash(post.content)
+            for post in posts
+        },
+        None,
+    )
+
+    return len(posts)
+
+
+def enqueue_posts(post_ids):
+    """Queues posts to be extracted by the next batch, keeping their queuing time."""
+    now = time.time()
+
+    get_redis_connection("default").zadd(
+        PENDING_KEY, {post_id: now for post_id in post_ids}, nx=True
+    )
+
+
+def associate_pending_hashtags(post_id):
+    """
+    Extracts the hashtags of a post, and of up to `HASHTAGS_BATCH_SIZE` waiting posts.
+
+    Posts already extracted by another batch are skipped, their content hash is
+    up to date. Posts of a failed batch are queued again before the error is raised.
+
+    Args:
+        post_id: ID of the post of the task.
+
+    Returns:
+        int: Number of posts extracted.
+    """
+    connection = get_redis_connection("default")
+
+    pipeline = connection.pipeline()
+    pipeline.zrem(PENDING_KEY, post_id)
+    pipeline.zpopmin(PENDING_KEY, settings.HASHTAGS_BATCH_SIZE - 1)
+    _, popped = pipeline.execute()
+
+    queued = {int(member): score for member, score in popped}
+    started_at = time.time()
+
+    try:
+        extracted = associate_hashtags_many([post_id, *queued], only_changed=True)
+    except Exception:
+        if queued:
+            connection.zadd(PENDING_KEY, queued, nx=True)
+        raise
+
+    if extracted:
+        finished_at = time.time()
+
+        incr_metric(METRIC_NAME, "posts", extracted)
+        incr_metric(METRIC_NAME, "batches")
+        incr_metric(METRIC_NAME, "seconds", finished_at - started_at)
+        incr_metric(
+            METRIC_NAME,
+            "lag_seconds",
+            finished_at - min(queued.values(), default=started_at),
+        )
+
+    return extracted
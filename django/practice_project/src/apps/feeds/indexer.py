@@ -0,0 +1,206 @@
+"""
+Batching Elasticsearch indexer of posts.
+
+Saves of posts and of their statistics don't index the post right away, its ID is
+added to a Redis sorted set instead, scored with the time it was first queued.
+`index_pending_posts_task` drains the set every `ELASTICSEARCH_INDEX_INTERVAL`
+seconds, or as soon as `ELASTICSEARCH_INDEX_BATCH_SIZE` posts are waiting, and
+indexes each batch with a single bulk request.
+
+A batch is removed from the set before it is indexed, so that posts saved in the
+meantime are queued again. Batches whose bulk request fails are queued again, but a
+worker killed in between loses its batch: these posts are indexed on their next save,
+or by `reindex_posts`.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django_elasticsearch_dsl.apps import DEDConfig
+from django_elasticsearch_dsl.signals import RealTimeSignalProcessor
+from django_redis import get_redis_connection
+from elasticsearch import helpers
+from elasticsearch_dsl.connections import connections
+
+# Models
+from apps.feeds.models import Post, PostStatistics
+
+# Documents
+from apps.feeds.documents import PostDocument
+
+# Counters
+from apps.feeds import counters, tasks
+
+# Utils
+from utils.debounce import debounce
+from utils.metrics import incr_metric
+
+logger = logging.getLogger(__name__)
+
+# Redis sorted set of the IDs of the posts waiting to be indexed
+PENDING_KEY = "es_index:pending"
+
+METRIC_NAME = "es_indexer"
+
+# Index being rebuilt by the `reindex_posts` command, live updates are written to it too
+REINDEX_TARGET_KEY = "es_index:reindex_target"
+
+
+def enqueue_posts(post_ids):
+    """
+    Queues posts to be indexed by the next drain.
+
+    A post queued several times before the drain is indexed once, its lag is counted
+    from the first time it was queued.
+
+    Args:
+        post_ids: IDs of the posts to index.
+    """
+    if not DEDConfig.autosync_enabled() or not post_ids:
+        return
+
+    connection = get_redis_connection("default")
+    now = time.time()
+
+    pipeline = connection.pipeline(transaction=False)
+    pipeline.zadd(PENDING_KEY, {post_id: now for post_id in post_ids}, nx=True)
+    pipeline.zcard(PENDING_KEY)
+    added, pending = pipeline.execute()
+
+    # Posts already waiting are indexed once, with their state at the next drain
+    if len(post_ids) > added:
+        incr_metric(METRIC_NAME, "collapsed", len(post_ids) - added)
+
+    # Don't wait for the periodic drain once a full batch is waiting
+    if pending >= settings.ELASTICSEARCH_INDEX_BATCH_SIZE:
+        debounce(tasks.index_pending_posts_task, countdown=0)
+
+
+def restore_posts(queued):
+    """Queue again posts that could not be indexed, keeping their queuing time."""
+    get_redis_connection("default").zadd(PENDING_KEY, queued, nx=True)
+
+
+def get_index_lag():
+    """Return the number of seconds the oldest queued post has been waiting."""
+    oldest = get_redis_connection("default").zrange(PENDING_KEY, 0, 0, withscores=True)
+
+    return time.time() - oldest[0][1] if oldest else 0.0
+
+
+def get_reindex_target():
+    """Return the name of the index being rebuilt, if any."""
+    target = get_redis_connection("default").get(REINDEX_TARGET_KEY)
+
+    return target.decode() if target else None
+
+
+def get_indexing_queryset():
+    """Return the posts with the relations read by `PostDocument` loaded up front."""
+    return Post.objects.select_related("user", "statistics")
+
+
+def index_posts(posts):
+    """
+    Indexes posts with a single bulk request.
+
+    Requests rejected because Elasticsearch is overloaded (429) are retried with an
+    exponential backoff by `helpers.bulk`. While `reindex_posts` runs, the documents
+    are written to the index being rebuilt as well.
+
+    Returns:
+        int: Number of indexed documents.
+    """
+    document = PostDocument()
+    actions = [
+        document._prepare_action(post, "index")
+        for post in posts
+        if document.should_index_object(post)
+    ]
+
+    target = get_reindex_target()
+    if target:
+        actions += [{**action, "_index": target} for action in actions]
+
+    indexed, _ = helpers.bulk(
+        connections.get_connection(),
+        actions,
+        chunk_size=settings.ELASTICSEARCH_INDEX_BATCH_SIZE,
+        max_retries=settings.ELASTICSEARCH_INDEX_MAX_RETRIES,
+        initial_backoff=1,
+        max_backoff=30,
+    )
+    return indexed
+
+
+def drain_pending_posts():
+    """
+    Indexes the queued posts, one batch at a time, until the queue is empty.
+
+    Posts of a failed batch are queued again before the error is raised.
+
+    Returns:
+        int: Number of indexed documents.
+    """
+    connection = get_redis_connection("default")
+    batch_size = settings.ELASTICSEARCH_INDEX_BATCH_SIZE
+    total = 0
+
+    while True:
+        queued = dict(connection.zpopmin(PENDING_KEY, batch_size))
+        if not queued:
+            return total
+
+        started_at = time.time()
+
+        try:
+            posts = list(
+                get_indexing_queryset().filter(
+                    id__in=[int(post_id) for post_id in queued]
+                )
+            )
+            counters.attach_pending_counters(posts)
+            indexed = index_posts(posts)
+        except Exception:
+            restore_posts(queued)
+            incr_metric(METRIC_NAME, "errors")
+            raise
+
+        finished_at = time.time()
+        total += indexed
+
+        incr_metric(METRIC_NAME, "docs", indexed)
+        incr_metric(METRIC_NAME, "batches")
+        incr_metric(METRIC_NAME, "seconds", finished_at - started_at)
+        incr_metric(METRIC_NAME, "lag_seconds", finished_at - min(queued.values()))
+
+        if len(queued) < batch_size:
+            return total
+
+
+def get_indexed_post_ids(instance):
+    """Return the IDs of the posts whose document depends on a saved instance."""
+    if isinstance(instance, Post):
+        return [instance.pk]
+
+    if isinstance(instance, PostStatistics):
+        return [instance.post_id]
+
+    return None
+
+
+class BatchedSignalProcessor(RealTimeSignalProcessor):
+    """
+    Signal processor queuing saved posts for the batching indexer.
+
+    Saves of other indexed models are still indexed in real time, as are deletions.
+    """
+
+    def handle_save(self, sender, instance, **kwargs):
+        post_ids = get_indexed_post_ids(instance)
+
+        if post_ids is None:
+            return super().handle_save(sender, instance, **kwargs)
+
+        enqueue_posts(post_ids)
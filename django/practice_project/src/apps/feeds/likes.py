@@ -0,0 +1,115 @@
+"""
+Likes of posts.
+
+A like is toggled with a single statement on PostgreSQL: a `DELETE ... RETURNING`
+and an `INSERT ... ON CONFLICT DO NOTHING RETURNING` chained in one query, so
+concurrent double-taps can't create duplicate likes. The rows are changed by raw
+SQL, `post_save` and `post_delete` are sent here for the like signals. The query also
+returns the fields of the post the signals read, so they don't load it again.
+"""
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+# Models
+from apps.feeds.models import Like, Post
+
+TOGGLE_SQL = """
+WITH deleted AS (
+    DELETE FROM {like} WHERE post_id = %(post_id)s AND user_id = %(user_id)s
+    RETURNING id
+), post AS (
+    SELECT id, user_id, title, category_id FROM {post} WHERE id = %(post_id)s
+), inserted AS (
+    INSERT INTO {like} (post_id, user_id, created, modified)
+    SELECT post.id, %(user_id)s, %(now)s, %(now)s FROM post
+    WHERE NOT EXISTS (SELECT 1 FROM deleted)
+    ON CONFLICT (post_id, user_id) DO NOTHING
+    RETURNING id
+)
+SELECT user_id, title, category_id, (SELECT id FROM deleted), (SELECT id FROM inserted)
+FROM post
+"""
+
+
+def toggle_like(post_id, user_id):
+    """
+    Likes a post, or unlikes it if the user already liked it.
+
+    Returns:
+        bool: Whether the post is now liked by the user.
+
+    Raises:
+        Post.DoesNotExist: If there is no such post.
+    """
+    if connection.vendor != "postgresql":
+        return _toggle_like_orm(post_id, user_id)
+
+    now = timezone.now()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            TOGGLE_SQL.format(like=Like._meta.db_table, post=Post._meta.db_table),
+            {"post_id": post_id, "user_id": user_id, "now": now},
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        raise Post.DoesNotExist
+
+    author_id, title, category_id, deleted_id, inserted_id = row
+    post = Post(id=post_id, user_id=author_id, title=title, category_id=category_id)
+
+    if deleted_id:
+        like = Like(id=deleted_id, post=post, user_id=user_id)
+        post_delete.send(
+            sender=Like, instance=like, using=connection.alias, origin=like
+        )
+        return False
+
+    if inserted_id:
+        like = Like(
+            id=inserted_id, post=post, user_id=user_id, created=now, modified=now
+        )
+        post_save.send(
+            sender=Like,
+            instance=like,
+            created=True,
+            update_fields=None,
+            raw=False,
+            using=connection.alias,
+        )
+
+    # Neither deleted nor inserted: a concurrent request liked the post first
+    return True
+
+
+def _toggle_like_orm(post_id, user_id):
+    """Toggle a like with the ORM, for the databases without `RETURNING` in CTEs."""
+    # Loaded once for the like signals
+    post = Post.objects.only("user_id", "title", "category_id").get(id=post_id)
+
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(post_id=post_id, user_id=user_id).delete()
+
+        if deleted:
+            return False
+
+        try:
+            with transaction.atomic():
+                Like.objects.create(post=post, user_id=user_id)
+        except IntegrityError:
+            # A concurrent request liked the post first
+            pass
+
+    return True
+
+
+def get_liked_post_ids(user_id, post_ids):
+    """Return the IDs, among `post_ids`, of the posts liked by a user, in one query."""
+    return set(
+        Like.objects.filter(user_id=user_id, post_id__in=post_ids).values_list(
+            "post_id", flat=True
+        )
+    )
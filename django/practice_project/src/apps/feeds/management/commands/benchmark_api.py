@@ -0,0 +1,335 @@
+import json
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import accumulate
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+# Models
+from apps.feeds.models import Category, Post, User
+
+# Benchmarks
+import benchmarks
+from benchmarks.elasticsearch import stub_search
+
+# Weight of each endpoint in the traffic, see `Command.get_request`
+ENDPOINTS = {
+    "posts": 25,
+    "home": 10,
+    "search": 5,
+    "post": 15,
+    "comments": 15,
+    "notifications": 10,
+    "like": 10,
+    "comment": 7,
+    "create_post": 3,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API with a mix of reads and writes sent in-process to a seeded "
+        "dataset, and write the requests per second, p50/p95/p99 latencies and queries "
+        "per request of each endpoint to a JSON file (see `benchmarks.compare`)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the dataset, seeded with `seed_mock_data` if missing, and of "
+            "the traffic",
+        )
+        parser.add_argument(
+            "--users", type=int, default=1000, help="Number of users to seed"
+        )
+        parser.add_argument(
+            "--posts", type=int, default=10000, help="Number of posts to seed"
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Number of timed requests, spread over the endpoints",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=100,
+            help="Number of requests sent before the timed ones",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of threads sending requests",
+        )
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=list(ENDPOINTS),
+            default=list(ENDPOINTS),
+            help="Endpoints in the traffic",
+        )
+        parser.add_argument(
+            "--hot-posts",
+            type=int,
+            default=1000,
+            help="Number of most recent posts read, liked and commented",
+        )
+        parser.add_argument(
+            "--elasticsearch",
+            action="store_true",
+            help="Search the Elasticsearch index instead of the stub",
+        )
+        parser.add_argument(
+            "--label",
+            help="Name of the run, the current git commit by default",
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of the JSON results, benchmarks/results/<label>.json by default",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["requests"] < 1 or kwargs["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive")
+
+        prefix = f"seed{kwargs['seed']}_"
+        if not User.objects.filter(username__startswith=prefix).exists():
+            call_command(
+                "seed_mock_data",
+                seed=kwargs["seed"],
+                users=kwargs["users"],
+                posts=kwargs["posts"],
+                stdout=self.stdout,
+            )
+
+        self.seed = kwargs["seed"]
+        self.users = list(User.objects.filter(username__startswith=prefix))
+        self.category_ids = list(Category.objects.values_list("id", flat=True))
+        self.post_ids = list(
+            Post.objects.active()
+            .order_by("-id")
+            .values_list("id", flat=True)[: kwargs["hot_posts"]]
+        )
+        if not self.post_ids:
+            raise CommandError("There is no post to read")
+
+        self.endpoints = kwargs["endpoints"]
+        self.cum_weights = list(accumulate(ENDPOINTS[name] for name in self.endpoints))
+
+        label = kwargs["label"] or self.get_commit() or "latest"
+        output = Path(
+            kwargs["output"]
+            or Path(benchmarks.__file__).parent / "results" / f"{label}.json"
+        )
+
+        with nullcontext() if kwargs["elasticsearch"] else stub_search():
+            self.work("warmup", kwargs["warmup"])
+            samples, elapsed = self.run(kwargs["requests"], kwargs["concurrency"])
+
+        results = {
+            "meta": {
+                "label": label,
+                "created": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "seed": self.seed,
+                "users": len(self.users),
+                "posts": Post.objects.count(),
+                "requests": kwargs["requests"],
+                "concurrency": kwargs["concurrency"],
+                "elasticsearch": "real" if kwargs["elasticsearch"] else "stub",
+                "seconds": round(elapsed, 3),
+            },
+            "total": summarize(
+                [sample for name in samples for sample in samples[name]], elapsed
+            ),
+            "endpoints": {
+                name: summarize(samples[name])
+                for name in self.endpoints
+                if samples[name]
+            },
+        }
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2) + "\n")
+
+        self.write_results(results)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def get_commit(self):
+        """Return the short hash of the current git commit, None outside of a checkout."""
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def run(self, requests, concurrency):
+        """
+        Send the timed requests from `concurrency` threads.
+
+        Returns:
+            tuple: The samples of each endpoint, and the elapsed seconds.
+        """
+        shares = [
+            requests // concurrency + (worker < requests % concurrency)
+            for worker in range(concurrency)
+        ]
+        started = time.perf_counter()
+
+        if concurrency == 1:
+            results = [self.work(0, requests)]
+        else:
+            with ThreadPoolExecutor(concurrency) as executor:
+                results = list(
+                    executor.map(self.work_in_thread, range(concurrency), shares)
+                )
+
+        elapsed = time.perf_counter() - started
+
+        samples = defaultdict(list)
+        for result in results:
+            for name, sample in result:
+                samples[name].append(sample)
+
+        return samples, elapsed
+
+    def work_in_thread(self, worker, count):
+        try:
+            return self.work(worker, count)
+        finally:
+            # Connections are opened per thread
+            connections.close_all()
+
+    def work(self, worker, count):
+        """
+        Send requests picked at random from the endpoints, with the traffic seed.
+
+        Returns:
+            list: A (endpoint, (latency in seconds, queries, failed)) tuple per request.
+        """
+        rng = random.Random(f"{self.seed}:{worker}")
+        # Failed requests are counted as errors instead of stopping the benchmark
+        client = APIClient(raise_request_exception=False)
+        samples = []
+
+        for _ in range(count):
+            name = rng.choices(self.endpoints, cum_weights=self.cum_weights)[0]
+            method, path, data = self.get_request(name, rng)
+            client.force_authenticate(user=rng.choice(self.users))
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, data, format="json")
+                latency = time.perf_counter() - started
+
+            samples.append((name, (latency, len(queries), response.status_code >= 400)))
+
+        return samples
+
+    def get_request(self, name, rng):
+        """Return the method, path and data of a request to an endpoint."""
+        post_id = rng.choice(self.post_ids)
+
+        if name == "posts":
+            return "get", "/api/posts/", None
+        if name == "home":
+            return "get", "/api/posts/", {"feed": "home"}
+        if name == "search":
+            return "get", "/api/posts/", {"search": f"post {rng.randrange(1000)}"}
+        if name == "post":
+            return "get", f"/api/posts/{post_id}/", None
+        if name == "comments":
+            return "get", f"/api/posts/{post_id}/comments/", None
+        if name == "notifications":
+            return "get", "/api/notifications/", None
+        if name == "like":
+            return "post", f"/api/posts/{post_id}/like/", None
+        if name == "comment":
+            return (
+                "post",
+                f"/api/posts/{post_id}/comments/",
+                {"content": f"Benchmark comment #tag{rng.randrange(100)}"},
+            )
+
+        return (
+            "post",
+            "/api/posts/",
+            {
+                # Titles are unique, also across runs on the same dataset
+                "title": f"Benchmark {uuid.uuid4().hex}",
+                "content": f"Benchmark post #tag{rng.randrange(100)}",
+                "category": rng.choice(self.category_ids),
+                "latitude": rng.uniform(-90, 90),
+                "longitude": rng.uniform(-180, 180),
+            },
+        )
+
+    def write_results(self, results):
+        self.stdout.write(
+            f"{'endpoint':<14} {'requests':>8} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}"
+        )
+
+        for name, metrics in [
+            *results["endpoints"].items(),
+            ("total", results["total"]),
+        ]:
+            self.stdout.write(
+                f"{name:<14} {metrics['requests']:8d} {metrics['rps']:9.1f} "
+                f"{metrics['p50_ms']:8.1f} {metrics['p95_ms']:8.1f} "
+                f"{metrics['p99_ms']:8.1f} {metrics['queries_per_request']:8.1f} "
+                f"{metrics['errors']:7d}"
+            )
+
+
+def summarize(samples, elapsed=None):
+    """
+    Return the metrics of the (latency, queries, failed) samples of an endpoint.
+
+    The requests per second are over `elapsed` for the whole run. Endpoints share
+    that time with each other, so without it they are over the time spent serving
+    the endpoint's own requests instead.
+    """
+    latencies = [latency * 1000 for latency, _, _ in samples]
+
+    if elapsed is None:
+        elapsed = sum(latency for latency, _, _ in samples)
+
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+
+    return {
+        "requests": len(samples),
+        "errors": sum(failed for _, _, failed in samples),
+        "rps": round(len(samples) / elapsed, 2),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "queries_per_request": round(
+            sum(queries for _, queries, _ in samples) / len(samples), 2
+        ),
+        "max_queries": max(queries for _, queries, _ in samples),
+    }
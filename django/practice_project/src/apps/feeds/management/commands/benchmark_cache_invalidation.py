@@ -0,0 +1,119 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+# Utils
+from utils import invalidate_tags
+from utils.cache import get_tag_version_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare pattern-based (SCAN) and tag-based cache invalidation "
+        "for different numbers of cached keys"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000],
+            help="Numbers of cached keys to benchmark against",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Number of invalidations to time for each approach",
+        )
+        parser.add_argument(
+            "--location",
+            type=str,
+            default=None,
+            help="Redis URL to benchmark against (defaults to the configured cache)",
+        )
+        parser.add_argument(
+            "--fake",
+            action="store_true",
+            help="Run against an in-process fakeredis server instead of Redis",
+        )
+
+    def handle(self, *args, **kwargs):
+        caches = self.get_caches_setting(kwargs["location"], kwargs["fake"])
+
+        with override_settings(CACHES=caches):
+            for size in kwargs["sizes"]:
+                self.benchmark(size, kwargs["rounds"])
+
+    def get_caches_setting(self, location, fake):
+        """Return the CACHES setting used for the benchmark."""
+        default = dict(settings.CACHES["default"])
+        options = dict(default.get("OPTIONS", {}))
+
+        if location:
+            default["LOCATION"] = location
+
+        if fake:
+            import fakeredis
+
+            options["CONNECTION_POOL_KWARGS"] = {
+                "connection_class": fakeredis.FakeConnection,
+                "server": fakeredis.FakeServer(),
+            }
+
+        default["OPTIONS"] = options
+
+        return {"default": default}
+
+    def populate(self, prefix, size, batch_size=10_000):
+        """Fill the cache with `size` list entries under the given prefix."""
+        for start in range(0, size, batch_size):
+            stop = min(start + batch_size, size)
+            cache.set_many(
+                {
+                    f"{prefix}:posts:params:{index}": b"x"
+                    for index in range(start, stop)
+                },
+                timeout=300,
+            )
+
+    def benchmark(self, size, rounds):
+        prefix = f"benchmark:{uuid.uuid4().hex}"
+        self.populate(prefix, size)
+
+        try:
+            # Pattern based: every invalidation scans the whole keyspace
+            pattern_timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                cache.delete_pattern(f"{prefix}:posts:params:*")
+                pattern_timings.append(time.perf_counter() - started)
+
+                # Restore the deleted entries so every round sees the same keyspace
+                self.populate(prefix, size)
+
+            # Tag based: every invalidation is a single write
+            tag_timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                invalidate_tags(f"{prefix}:posts")
+                tag_timings.append(time.perf_counter() - started)
+        finally:
+            cache.delete_pattern(f"{prefix}:*")
+            cache.delete(get_tag_version_key(f"{prefix}:posts"))
+
+        pattern_ms = sum(pattern_timings) / rounds * 1000
+        tag_ms = sum(tag_timings) / rounds * 1000
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{size:>9} keys: delete_pattern {pattern_ms:10.2f} ms | "
+                f"invalidate_tags {tag_ms:8.3f} ms | "
+                f"speedup x{pattern_ms / tag_ms:.0f}"
+            )
+        )
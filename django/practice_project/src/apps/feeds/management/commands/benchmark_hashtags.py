@@ -0,0 +1,120 @@
+import re
+import time
+import uuid
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# Models
+from apps.feeds.models import Category, Hashtag, Post, User
+
+# Hashtags
+from apps.feeds import hashtags
+
+
+def legacy_associate_hashtags(post_id):
+    """Previous implementation, kept to compare against: two queries per tag."""
+    post = Post.objects.get(id=post_id)
+    hashtag_objects = []
+
+    for tag in re.findall(r"#(\w+)", post.content):
+        hashtag_obj, created = Hashtag.objects.get_or_create(name=tag)
+        hashtag_objects.append(hashtag_obj)
+
+    post.hashtags.set(hashtag_objects)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-tag and the batched hashtag extraction on posts with "
+        "different numbers of hashtags (nothing is kept in the database)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tags",
+            type=int,
+            nargs="+",
+            default=[0, 10, 200],
+            help="Numbers of hashtags in the content of the benchmarked posts",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Number of extractions to time for each approach",
+        )
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            user = User.objects.create(username=f"benchmark-{uuid.uuid4().hex[:8]}")
+            category = Category.objects.create(name=f"benchmark-{uuid.uuid4().hex}")
+
+            for count in kwargs["tags"]:
+                self.benchmark(user, category, count, kwargs["rounds"])
+
+            # Leave the database as it was
+            transaction.set_rollback(True)
+
+    def create_post(self, user, category, count):
+        """Create a post whose content holds `count` new hashtags, without signals."""
+        prefix = uuid.uuid4().hex[:8]
+        content = " ".join(f"#{prefix}_{index}" for index in range(count))
+
+        # bulk_create() doesn't send post_save, the extraction isn't triggered
+        (post,) = Post.objects.bulk_create(
+            [
+                Post(
+                    title=f"Benchmark {prefix}",
+                    content=content or "No hashtags",
+                    user=user,
+                    category=category,
+                )
+            ]
+        )
+        return post
+
+    def measure(self, function, post_ids):
+        """Return the average milliseconds and queries of `function` over the posts."""
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for post_id in post_ids:
+                function(post_id)
+            elapsed = time.perf_counter() - started
+
+        return elapsed / len(post_ids) * 1000, len(queries) / len(post_ids)
+
+    def benchmark(self, user, category, count, rounds):
+        legacy_ids = [self.create_post(user, category, count).id for _ in range(rounds)]
+        batched_ids = [
+            self.create_post(user, category, count).id for _ in range(rounds)
+        ]
+
+        results = {
+            # First extraction: every hashtag has to be created
+            "per tag (new)": self.measure(legacy_associate_hashtags, legacy_ids),
+            "batched (new)": self.measure(hashtags.associate_hashtags, batched_ids),
+            # Content saved again: hashtags and links already exist
+            "per tag (again)": self.measure(legacy_associate_hashtags, legacy_ids),
+            "batched (again)": self.measure(hashtags.associate_hashtags, batched_ids),
+        }
+
+        # Content unchanged: the task isn't queued at all
+        posts = list(Post.objects.filter(id__in=batched_ids))
+        started = time.perf_counter()
+        skipped = sum(not hashtags.has_content_changed(post) for post in posts)
+        skip_ms = (time.perf_counter() - started) / len(posts) * 1000
+
+        cache.delete_many([hashtags.get_content_hash_key(post.id) for post in posts])
+
+        self.stdout.write(self.style.SUCCESS(f"{count} hashtags"))
+        for name, (milliseconds, queries) in results.items():
+            self.stdout.write(
+                f"  {name:<16} {milliseconds:8.2f} ms {queries:6.0f} queries"
+            )
+        self.stdout.write(
+            f"  {'unchanged':<16} {skip_ms:8.2f} ms      0 queries "
+            f"({skipped}/{len(posts)} skipped)"
+        )
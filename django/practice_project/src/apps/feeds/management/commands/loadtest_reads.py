@@ -0,0 +1,143 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Models
+from apps.feeds.models import Post, User
+
+# Read endpoints of the sync API, and of the async one served by uvicorn
+ENDPOINTS = {
+    "posts": ("/api/posts/", "/api/async/posts/"),
+    "post": ("/api/posts/{post}/", "/api/async/posts/{post}/"),
+    "comments": ("/api/posts/{post}/comments/", "/api/async/posts/{post}/comments/"),
+    "notifications": ("/api/notifications/", "/api/async/notifications/"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the read endpoints of the sync (gunicorn) and async (uvicorn) "
+        "servers, and compare their requests per second and p50/p99 latencies"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username", required=True, help="User the requests are authenticated as"
+        )
+        parser.add_argument(
+            "--sync-url",
+            default="http://localhost:8000",
+            help="Base URL of the WSGI server",
+        )
+        parser.add_argument(
+            "--async-url",
+            default="http://localhost:8001",
+            help="Base URL of the ASGI server",
+        )
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=list(ENDPOINTS),
+            default=list(ENDPOINTS),
+            help="Endpoints to load test",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Number of requests sent to each endpoint of each server",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Number of requests in flight at once",
+        )
+        parser.add_argument(
+            "--query",
+            default="",
+            help="Query string added to the post list, e.g. 'order_by=likes_count'",
+        )
+
+    def handle(self, *args, **kwargs):
+        try:
+            user = User.objects.get(username=kwargs["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{kwargs['username']}' does not exist")
+
+        if kwargs["requests"] < 2:
+            raise CommandError("At least 2 requests are needed to compute percentiles")
+
+        post_id = (
+            Post.objects.active().order_by("-id").values_list("id", flat=True).first()
+        )
+        if post_id is None:
+            raise CommandError("There is no post to read")
+
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+        self.stdout.write(
+            f"{kwargs['requests']} requests per run, {kwargs['concurrency']} at once"
+        )
+        self.stdout.write(
+            f"{'endpoint':<14} {'server':<6} {'req/s':>9} {'p50 ms':>9} "
+            f"{'p99 ms':>9} {'errors':>7}"
+        )
+
+        for name in kwargs["endpoints"]:
+            for server, base_url, path in zip(
+                ("sync", "async"),
+                (kwargs["sync_url"], kwargs["async_url"]),
+                ENDPOINTS[name],
+            ):
+                url = base_url.rstrip("/") + path.format(post=post_id)
+                if kwargs["query"] and name == "posts":
+                    url = f"{url}?{kwargs['query']}"
+
+                rps, p50, p99, errors = self.run(
+                    url, kwargs["requests"], kwargs["concurrency"]
+                )
+                self.stdout.write(
+                    f"{name:<14} {server:<6} {rps:9.1f} {p50:9.1f} {p99:9.1f} "
+                    f"{errors:7d}"
+                )
+
+    def fetch(self, url):
+        """Send a GET request, return its latency in seconds and whether it failed."""
+        request = urllib.request.Request(url, headers=self.headers)
+        started = time.perf_counter()
+
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                failed = response.status != 200
+        except (urllib.error.URLError, OSError):
+            failed = True
+
+        return time.perf_counter() - started, failed
+
+    def run(self, url, requests, concurrency):
+        """Return the requests per second, p50 and p99 in ms, and number of errors."""
+        # Warm up connections to the database, Redis and Elasticsearch of the workers
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(self.fetch, [url] * concurrency))
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            started = time.perf_counter()
+            results = list(executor.map(self.fetch, [url] * requests))
+            elapsed = time.perf_counter() - started
+
+        latencies = [latency * 1000 for latency, _ in results]
+        percentiles = statistics.quantiles(latencies, n=100)
+
+        return (
+            requests / elapsed,
+            percentiles[49],
+            percentiles[98],
+            sum(failed for _, failed in results),
+        )
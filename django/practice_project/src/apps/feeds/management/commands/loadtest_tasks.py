@@ -0,0 +1,172 @@
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
+
+# Models
+from apps.feeds.models import Category, Comment, Like, Post, PostStatistics, User
+
+# Hashtags and indexing
+from apps.feeds import hashtags, indexer
+
+# Utils
+from utils.metrics import get_metrics, reset_metrics
+
+QUEUES = ("realtime", "default", "bulk")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a mixed load of posts, likes and comments against the running Celery "
+        "workers, and report how long each kind of background work took to catch up "
+        "and how long tasks waited in each queue"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", type=int, default=200, help="Number of posts to create"
+        )
+        parser.add_argument(
+            "--likes",
+            type=int,
+            default=5,
+            help="Number of likes of each post, by distinct users",
+        )
+        parser.add_argument(
+            "--comments", type=int, default=2, help="Number of comments of each post"
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=20,
+            help="Number of users liking and commenting",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=120,
+            help="Seconds to wait for the background work to catch up",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["likes"] > kwargs["users"]:
+            raise CommandError("A post can't get more likes than there are users")
+
+        users = [
+            User.objects.get_or_create(username=f"loadtest_{index}")[0]
+            for index in range(kwargs["users"])
+        ]
+        category, _ = Category.objects.get_or_create(name="loadtest")
+
+        for name in [hashtags.METRIC_NAME, indexer.METRIC_NAME] + [
+            f"celery:{queue}" for queue in QUEUES
+        ]:
+            reset_metrics(name)
+
+        started = time.time()
+        post_ids = self.generate(users, category, kwargs)
+        load_seconds = time.time() - started
+
+        self.stdout.write(
+            f"Created {len(post_ids)} posts with {kwargs['likes']} likes and "
+            f"{kwargs['comments']} comments each in {load_seconds:.1f}s"
+        )
+
+        expected = (kwargs["likes"] * len(post_ids), kwargs["comments"] * len(post_ids))
+        stages = {
+            "counters": lambda: self.get_counters(post_ids) == expected,
+            "hashtags": lambda: self.count_extracted(post_ids) == len(post_ids),
+            "index": lambda: indexer.get_index_lag() == 0,
+        }
+        caught_up = self.wait(stages, time.time(), kwargs["timeout"])
+
+        self.stdout.write(self.style.SUCCESS("Caught up after the load"))
+        for stage in stages:
+            seconds = caught_up.get(stage)
+            self.stdout.write(
+                f"  {stage:<10} "
+                + (f"{seconds:6.1f}s" if seconds is not None else "timed out")
+            )
+
+        self.write_queue_metrics()
+
+    def generate(self, users, category, kwargs):
+        """Create the posts, each followed by its likes and comments."""
+        run = uuid.uuid4().hex[:8]
+        post_ids = []
+
+        for index in range(kwargs["posts"]):
+            # A request creating a post, its tasks are published once it commits
+            with transaction.atomic():
+                post = Post.objects.create(
+                    title=f"Load test {run} {index}",
+                    content=f"Load test #loadtest #tag{index % 50}",
+                    user=users[index % len(users)],
+                    category=category,
+                )
+            post_ids.append(post.id)
+
+            # Requests liking and commenting, interleaved with the slow post tasks
+            for user in random.sample(users, kwargs["likes"]):
+                Like.objects.create(post_id=post.id, user=user)
+            for number in range(kwargs["comments"]):
+                Comment.objects.create(
+                    post_id=post.id,
+                    user=random.choice(users),
+                    content=f"Load test comment {number}",
+                )
+
+        return post_ids
+
+    def get_counters(self, post_ids):
+        totals = PostStatistics.objects.filter(post_id__in=post_ids).aggregate(
+            likes=Sum("likes_count"), comments=Sum("comments_count")
+        )
+
+        return (totals["likes"] or 0, totals["comments"] or 0)
+
+    def count_extracted(self, post_ids):
+        return (
+            Post.hashtags.through.objects.filter(post_id__in=post_ids)
+            .values("post_id")
+            .distinct()
+            .count()
+        )
+
+    def wait(self, stages, started, timeout):
+        """Poll the stages until they all caught up, return the seconds each took."""
+        caught_up = {}
+
+        while len(caught_up) < len(stages) and time.time() - started < timeout:
+            for stage, is_caught_up in stages.items():
+                if stage not in caught_up and is_caught_up():
+                    caught_up[stage] = time.time() - started
+
+            time.sleep(0.2)
+
+        return caught_up
+
+    def write_queue_metrics(self):
+        self.stdout.write(self.style.SUCCESS("Queues"))
+        self.stdout.write(f"  {'queue':<10} {'tasks':>7} {'wait ms':>9} {'run ms':>9}")
+
+        for queue in QUEUES:
+            counters = get_metrics(f"celery:{queue}")
+            tasks = counters.get("tasks", 0)
+
+            if tasks:
+                self.stdout.write(
+                    f"  {queue:<10} {tasks:7d} "
+                    f"{counters.get('wait_seconds', 0) / tasks * 1000:9.1f} "
+                    f"{counters.get('run_seconds', 0) / tasks * 1000:9.1f}"
+                )
+
+        counters = get_metrics(hashtags.METRIC_NAME)
+        if counters.get("batches"):
+            self.stdout.write(
+                f"Hashtags: {counters['posts']} posts in {counters['batches']} batches, "
+                f"average lag {counters['lag_seconds'] / counters['batches']:.2f}s"
+            )
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+# Models
+from apps.feeds.models import Category, Comment, Like, Post
+
+# Timelines
+from apps.feeds import timelines
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the category and global timelines and the audience of each category "
+        "from the database, home timelines are rebuilt on their next read"
+    )
+
+    def handle(self, *args, **kwargs):
+        self.redis = get_redis_connection("default")
+        max_length = settings.TIMELINE_MAX_LENGTH
+
+        posts = Post.objects.active()
+
+        for category_id in Category.objects.values_list("id", flat=True):
+            self.store(
+                timelines.get_category_key(category_id),
+                posts.filter(category_id=category_id),
+                max_length,
+            )
+
+        self.store(timelines.GLOBAL_KEY, posts, max_length)
+
+        # Home timelines are built again from the new category timelines
+        for pattern in ("home", "merged"):
+            for key in self.redis.scan_iter(
+                match=f"{timelines.TIMELINE_KEY_PREFIX}:{pattern}:*"
+            ):
+                self.redis.delete(key)
+
+        interests = set()
+        for queryset in (
+            posts.values_list("user_id", "category_id"),
+            Like.objects.values_list("user_id", "post__category_id"),
+            Comment.objects.active().values_list("user_id", "post__category_id"),
+        ):
+            interests.update(queryset.distinct())
+
+        for user_id, category_id in interests:
+            timelines.add_interest(user_id, category_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt the timelines and {len(interests)} category audiences"
+            )
+        )
+
+    def store(self, key, posts, max_length):
+        """Replace a timeline by the most recent of the given posts."""
+        scores = {
+            post_id: created.timestamp()
+            for post_id, created in posts.order_by("-created").values_list(
+                "id", "created"
+            )[:max_length]
+        }
+
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.delete(key)
+        if scores:
+            pipeline.zadd(key, scores)
+        pipeline.execute()
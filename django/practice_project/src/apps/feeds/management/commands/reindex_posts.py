@@ -0,0 +1,290 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections as db_connections
+from django_redis import get_redis_connection
+from elasticsearch import helpers
+from elasticsearch_dsl.connections import connections
+
+# Models
+from apps.feeds.models import Post
+
+# Documents
+from apps.feeds.documents import PostDocument
+
+# Indexer
+from apps.feeds import counters, indexer
+
+# Redis hash holding the progress of the running reindex
+CHECKPOINT_KEY = "es_reindex:posts"
+
+# Index searched and written by `PostDocument`, its name becomes the alias
+INDEX = PostDocument._index
+
+
+def build_actions(first_pk, last_pk, index_name):
+    """
+    Build the bulk actions indexing a chunk of posts into `index_name`.
+
+    Runs in a worker process, each chunk is loaded with a single query. Documents are
+    only created: one already written by the live indexer is newer than the chunk.
+    """
+    posts = list(
+        indexer.get_indexing_queryset()
+        .filter(pk__gte=first_pk, pk__lte=last_pk)
+        .order_by("pk")
+    )
+    counters.attach_pending_counters(posts)
+
+    document = PostDocument()
+
+    return [
+        {**document._prepare_action(post, "create"), "_index": index_name}
+        for post in posts
+        if document.should_index_object(post)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the posts Elasticsearch index into a new versioned index "
+        "and atomically point the alias at it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of posts loaded and built by each worker task",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes building documents",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Number of threads sending bulk requests",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume the interrupted reindex from its last checkpoint",
+        )
+        parser.add_argument(
+            "--keep-old",
+            action="store_true",
+            help="Keep the previous index instead of deleting it after the swap",
+        )
+        parser.add_argument(
+            "--abort",
+            action="store_true",
+            help="Abandon the interrupted reindex and delete its index",
+        )
+
+    def handle(self, *args, **kwargs):
+        self.redis = get_redis_connection("default")
+        self.client = connections.get_connection()
+        self.alias = INDEX._name
+
+        checkpoint = self.redis.hgetall(CHECKPOINT_KEY)
+
+        if kwargs["abort"]:
+            if not checkpoint:
+                raise CommandError("There is no interrupted reindex to abort")
+
+            return self.abort(checkpoint[b"index"].decode())
+
+        if kwargs["resume"]:
+            if not checkpoint:
+                raise CommandError("There is no interrupted reindex to resume")
+
+            index_name = checkpoint[b"index"].decode()
+            last_pk = int(checkpoint[b"last_pk"])
+            self.stdout.write(f"Resuming {index_name} after post {last_pk}")
+        else:
+            if checkpoint:
+                raise CommandError(
+                    "A reindex is already in progress, use --resume to continue it"
+                )
+
+            index_name = self.create_index()
+            last_pk = 0
+            self.redis.hset(
+                CHECKPOINT_KEY,
+                mapping={"index": index_name, "last_pk": last_pk, "indexed": 0},
+            )
+
+        # Posts saved from now on are written to the new index by the live indexer too
+        self.redis.set(indexer.REINDEX_TARGET_KEY, index_name)
+
+        try:
+            if b"interrupted_at" in checkpoint:
+                self.requeue_missed_posts(last_pk, float(checkpoint[b"interrupted_at"]))
+
+            started_at = time.monotonic()
+            indexed_now = self.load(index_name, last_pk, kwargs)
+            elapsed = time.monotonic() - started_at
+
+            self.stdout.write(
+                f"Indexed {indexed_now} posts in {elapsed:.1f}s "
+                f"({indexed_now / elapsed if elapsed else 0:.0f} docs/s)"
+            )
+
+            self.swap_alias(index_name, kwargs["keep_old"])
+        except BaseException:
+            # Posts saved until the reindex is resumed are requeued by `--resume`
+            self.redis.hset(CHECKPOINT_KEY, "interrupted_at", time.time())
+            raise
+        finally:
+            self.redis.delete(indexer.REINDEX_TARGET_KEY)
+
+        self.redis.delete(CHECKPOINT_KEY)
+        self.stdout.write(
+            self.style.SUCCESS(f"{self.alias} now points to {index_name}")
+        )
+
+    def create_index(self):
+        """Create an empty versioned index, tuned for bulk loading."""
+        index_name = f"{self.alias}-{time.strftime('%Y%m%d%H%M%S')}"
+
+        index = INDEX.clone(name=index_name)
+        index.settings(refresh_interval="-1", number_of_replicas=0)
+        index.create()
+
+        self.stdout.write(f"Created {index_name}")
+        return index_name
+
+    def abort(self, index_name):
+        """Delete the index of the interrupted reindex and forget its progress."""
+        self.client.indices.delete(index=index_name, ignore_unavailable=True)
+        self.redis.delete(indexer.REINDEX_TARGET_KEY, CHECKPOINT_KEY)
+
+        self.stdout.write(self.style.SUCCESS(f"Aborted the reindex into {index_name}"))
+
+    def requeue_missed_posts(self, last_pk, interrupted_at):
+        """
+        Queue for the live indexer the posts already loaded but saved since the
+        interruption, their updates were not written to the new index.
+        """
+        post_ids = list(
+            Post.objects.filter(
+                pk__lte=last_pk,
+                modified__gte=datetime.fromtimestamp(interrupted_at, tz=timezone.utc),
+            ).values_list("pk", flat=True)
+        )
+        indexer.enqueue_posts(post_ids)
+
+        self.stdout.write(f"Queued {len(post_ids)} posts saved since the interruption")
+
+    def iter_chunks(self, last_pk, chunk_size):
+        """Yield the (first, last) primary keys of each chunk of posts after `last_pk`."""
+        while True:
+            pks = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                return
+
+            yield pks[0], pks[-1]
+            last_pk = pks[-1]
+
+    def load(self, index_name, last_pk, options):
+        """
+        Index every post after `last_pk`, saving a checkpoint after each chunk.
+
+        Chunks are built by a pool of processes and bulk-loaded in key order, at most
+        two chunks per worker are kept in memory.
+
+        Returns:
+            int: Number of posts indexed by this run.
+        """
+        # Connections can't be shared with the forked workers
+        db_connections.close_all()
+
+        indexed_now = 0
+        pending = deque()
+        chunks = self.iter_chunks(last_pk, options["chunk_size"])
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            for first_pk, chunk_last_pk in chunks:
+                pending.append(
+                    (
+                        chunk_last_pk,
+                        executor.submit(
+                            build_actions, first_pk, chunk_last_pk, index_name
+                        ),
+                    )
+                )
+
+                if len(pending) >= 2 * options["workers"]:
+                    indexed_now += self.send(*pending.popleft(), options)
+
+            while pending:
+                indexed_now += self.send(*pending.popleft(), options)
+
+        return indexed_now
+
+    def send(self, chunk_last_pk, future, options):
+        """Bulk-load a built chunk, then checkpoint it."""
+        actions = future.result()
+
+        for ok, item in helpers.parallel_bulk(
+            self.client,
+            actions,
+            thread_count=options["threads"],
+            chunk_size=500,
+            raise_on_error=False,
+        ):
+            # Conflicts are posts already indexed by the live indexer, with newer data
+            if not ok and item["create"]["status"] != 409:
+                raise CommandError(f"Failed to index a post: {item}")
+
+        indexed = self.redis.hincrby(CHECKPOINT_KEY, "indexed", len(actions))
+        self.redis.hset(CHECKPOINT_KEY, "last_pk", chunk_last_pk)
+
+        self.stdout.write(f"Indexed {indexed} posts, up to post {chunk_last_pk}")
+        return len(actions)
+
+    def swap_alias(self, index_name, keep_old):
+        """Point the alias at the new index in a single atomic request."""
+        # Restore the settings lowered for the bulk load
+        self.client.indices.put_settings(
+            index=index_name,
+            settings={"refresh_interval": None, "number_of_replicas": None},
+        )
+        self.client.indices.refresh(index=index_name)
+
+        actions = [{"add": {"index": index_name, "alias": self.alias}}]
+        old_indices = []
+
+        if self.client.indices.exists_alias(name=self.alias):
+            old_indices = list(self.client.indices.get_alias(name=self.alias))
+            actions += [
+                {"remove": {"index": old_index, "alias": self.alias}}
+                for old_index in old_indices
+            ]
+        elif self.client.indices.exists(index=self.alias):
+            # The index was created by `search_index --rebuild` without an alias
+            actions.append({"remove_index": {"index": self.alias}})
+
+        self.client.indices.update_aliases(actions=actions)
+
+        if not keep_old:
+            for old_index in old_indices:
+                if old_index != index_name:
+                    self.client.indices.delete(index=old_index)
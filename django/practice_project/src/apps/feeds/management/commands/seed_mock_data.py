@@ -0,0 +1,364 @@
+import csv
+import random
+import time
+from datetime import timedelta
+from io import StringIO
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+# Models
+from apps.feeds.models import (
+    Category,
+    Comment,
+    Hashtag,
+    Like,
+    Post,
+    PostStatistics,
+    User,
+)
+
+# Hashtags
+from apps.feeds import hashtags
+
+WORDS = (
+    "feed post news update today python django redis celery search cache query "
+    "index timeline comment like share follow weekend travel food music sport "
+    "movie book code data cloud release team city night morning coffee idea"
+).split()
+
+
+def copy_rows(model, fields, rows):
+    """
+    Loads rows into the table of a model with PostgreSQL `COPY`, much faster than
+    INSERT statements for large tables.
+
+    Args:
+        model: The model of the table.
+        fields: Names of the fields given by each row.
+        rows: Tuples of the values of the fields.
+    """
+    buffer = StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(
+        quote_name(model._meta.get_field(field).column) for field in fields
+    )
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote_name(model._meta.db_table)} ({columns}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed users, categories, posts, comments, likes and hashtags in bulk for load "
+        "testing. Rows are generated from a deterministic seed and inserted in batches, "
+        "without sending signals nor queueing tasks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the generated data, also prefixes usernames and titles",
+        )
+        parser.add_argument(
+            "--users", type=int, default=1000, help="Number of users to create"
+        )
+        parser.add_argument(
+            "--categories", type=int, default=20, help="Number of categories to create"
+        )
+        parser.add_argument(
+            "--posts", type=int, default=10000, help="Number of posts to create"
+        )
+        parser.add_argument(
+            "--distribution",
+            choices=["uniform", "zipf"],
+            default="zipf",
+            help="Distribution of the posts among users, zipf gives a few heavy posters",
+        )
+        parser.add_argument(
+            "--zipf-exponent",
+            type=float,
+            default=1.0,
+            help="Skew of the zipf distribution, higher concentrates posts on fewer users",
+        )
+        parser.add_argument(
+            "--hashtags", type=int, default=500, help="Number of distinct hashtags"
+        )
+        parser.add_argument(
+            "--hashtags-per-post", type=int, default=3, help="Hashtags of each post"
+        )
+        parser.add_argument(
+            "--max-comments",
+            type=int,
+            default=5,
+            help="Maximum number of comments of each post",
+        )
+        parser.add_argument(
+            "--max-likes",
+            type=int,
+            default=10,
+            help="Maximum number of likes of each post",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Posts are spread over this many days before now",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of posts inserted, with their rows, by each transaction",
+        )
+        parser.add_argument(
+            "--password", default="password", help="Password of the created users"
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Load comments, likes and hashtag links with COPY (PostgreSQL only)",
+        )
+        parser.add_argument(
+            "--index",
+            action="store_true",
+            help="Rebuild the Elasticsearch index with `reindex_posts` once seeded",
+        )
+
+    def handle(self, *args, **kwargs):
+        self.rng = random.Random(kwargs["seed"])
+        self.prefix = f"seed{kwargs['seed']}"
+        self.use_copy = kwargs["copy"]
+
+        if self.use_copy and connection.vendor != "postgresql":
+            raise CommandError("--copy is only supported on PostgreSQL")
+
+        if User.objects.filter(username__startswith=f"{self.prefix}_").exists():
+            raise CommandError(
+                f"Data of seed {kwargs['seed']} already exists, use another --seed"
+            )
+
+        started = time.perf_counter()
+
+        self.user_ids = self.create_users(kwargs["users"], kwargs["password"])
+        self.category_ids = self.create_categories(kwargs["categories"])
+        self.hashtag_ids = self.create_hashtags(kwargs["hashtags"])
+        self.user_weights = self.get_user_weights(
+            kwargs["distribution"], kwargs["zipf_exponent"]
+        )
+
+        totals = {"posts": 0, "comments": 0, "likes": 0}
+
+        for first in range(0, kwargs["posts"], kwargs["batch_size"]):
+            count = min(kwargs["batch_size"], kwargs["posts"] - first)
+
+            with transaction.atomic():
+                for name, created in self.create_posts(first, count, kwargs).items():
+                    totals[name] += created
+
+            self.stdout.write(f"{first + count}/{kwargs['posts']} posts")
+
+        elapsed = time.perf_counter() - started
+        rows = sum(totals.values())
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(self.user_ids)} users, {len(self.category_ids)} "
+                f"categories, {totals['posts']} posts, {totals['comments']} comments "
+                f"and {totals['likes']} likes in {elapsed:.1f}s "
+                f"({rows / elapsed:.0f} rows/s)"
+            )
+        )
+
+        # Seeded posts skipped the signals filling the timelines and the index
+        call_command("rebuild_timelines", stdout=self.stdout)
+
+        if kwargs["index"]:
+            call_command("reindex_posts", stdout=self.stdout)
+
+    def create_users(self, count, password):
+        """Create the users with a password hashed once, return their IDs."""
+        password = make_password(password)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{self.prefix}_user{number}",
+                    email=f"{self.prefix}_user{number}@example.com",
+                    password=password,
+                )
+                for number in range(count)
+            ],
+            batch_size=5000,
+        )
+
+        return [user.id for user in users]
+
+    def create_categories(self, count):
+        categories = Category.objects.bulk_create(
+            [
+                Category(name=f"{self.prefix} category {number}")
+                for number in range(count)
+            ]
+        )
+
+        return [category.id for category in categories]
+
+    def create_hashtags(self, count):
+        """Create the hashtags missing, return the ID of each name."""
+        names = [f"tag{number}" for number in range(count)]
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in names], ignore_conflicts=True
+        )
+
+        return dict(Hashtag.objects.filter(name__in=names).values_list("name", "id"))
+
+    def get_user_weights(self, distribution, exponent):
+        """Return the cumulative weights of the users picked as authors of the posts."""
+        if distribution == "uniform":
+            weights = [1] * len(self.user_ids)
+        else:
+            # Ranks are shuffled, heavy posters aren't the first users created
+            ranks = list(range(1, len(self.user_ids) + 1))
+            self.rng.shuffle(ranks)
+            weights = [1 / rank**exponent for rank in ranks]
+
+        return list(accumulate(weights))
+
+    def create_posts(self, first, count, kwargs):
+        """
+        Create a batch of posts with their statistics, hashtags, comments and likes.
+
+        Returns:
+            dict: Number of created posts, comments and likes.
+        """
+        rng = self.rng
+        now = timezone.now()
+        max_age = kwargs["days"] * 24 * 60 * 60
+        names = list(self.hashtag_ids)
+        tags_per_post = min(kwargs["hashtags_per_post"], len(names))
+
+        authors = rng.choices(self.user_ids, cum_weights=self.user_weights, k=count)
+        posts = []
+        post_tags = []
+
+        for number, author in zip(range(first, first + count), authors):
+            created = now - timedelta(seconds=rng.uniform(0, max_age))
+            tags = rng.sample(names, tags_per_post)
+
+            post = Post(
+                title=f"{self.prefix} post {number}",
+                content=" ".join(
+                    rng.choices(WORDS, k=30) + [f"#{tag}" for tag in tags]
+                ),
+                user_id=author,
+                category_id=rng.choice(self.category_ids),
+                created=created,
+                modified=created,
+            )
+            # Keep the generated modification time, see ModificationDateTimeField
+            post.update_modified = False
+
+            posts.append(post)
+            post_tags.append(tags)
+
+        Post.objects.bulk_create(posts)
+
+        statistics = []
+        links = []
+        comments = []
+        likes = []
+
+        for post, tags in zip(posts, post_tags):
+            age = (now - post.created).total_seconds()
+            comment_count = rng.randint(0, kwargs["max_comments"])
+            likers = rng.sample(
+                self.user_ids,
+                min(rng.randint(0, kwargs["max_likes"]), len(self.user_ids)),
+            )
+
+            statistics.append(
+                PostStatistics(
+                    post_id=post.id,
+                    likes_count=len(likers),
+                    comments_count=comment_count,
+                )
+            )
+            links += [(post.id, self.hashtag_ids[tag]) for tag in tags]
+            comments += [
+                (
+                    post.id,
+                    rng.choice(self.user_ids),
+                    " ".join(rng.choices(WORDS, k=12)),
+                    post.created + timedelta(seconds=rng.uniform(0, age)),
+                )
+                for _ in range(comment_count)
+            ]
+            likes += [
+                (
+                    post.id,
+                    user_id,
+                    post.created + timedelta(seconds=rng.uniform(0, age)),
+                )
+                for user_id in likers
+            ]
+
+        PostStatistics.objects.bulk_create(statistics)
+
+        self.load(Post.hashtags.through, ["post", "hashtag"], links)
+        self.load(
+            Comment,
+            ["post", "user", "content", "created", "modified"],
+            [(*comment, comment[-1]) for comment in comments],
+        )
+        self.load(
+            Like,
+            ["post", "user", "created", "modified"],
+            [(*like, like[-1]) for like in likes],
+        )
+
+        # The hashtags are up to date, saves not changing the content won't extract them
+        cache.set_many(
+            {
+                hashtags.get_content_hash_key(post.id): hashtags.get_content_hash(
+                    post.content
+                )
+                for post in posts
+            },
+            None,
+        )
+
+        return {"posts": len(posts), "comments": len(comments), "likes": len(likes)}
+
+    def load(self, model, fields, rows):
+        """Insert rows with COPY if enabled, with `bulk_create` otherwise."""
+        if self.use_copy:
+            copy_rows(model, fields, rows)
+            return
+
+        objects = []
+
+        for row in rows:
+            instance = model(
+                **{
+                    model._meta.get_field(field).attname: value
+                    for field, value in zip(fields, row)
+                }
+            )
+            instance.update_modified = False
+            objects.append(instance)
+
+        model.objects.bulk_create(objects, batch_size=5000)
@@ -0,0 +1,105 @@
+from django.core.management.base import BaseCommand
+
+# Utils
+from utils.metrics import get_metrics, list_metrics, reset_metrics
+
+
+class Command(BaseCommand):
+    help = "Display the counters recorded by the feeds caches and background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            help="Metrics to display (all of them by default)",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the displayed metrics after printing them",
+        )
+
+    def handle(self, *args, **kwargs):
+        names = kwargs["names"] or list_metrics()
+
+        if not names:
+            self.stdout.write("No metrics recorded yet")
+            return
+
+        for name in names:
+            counters = get_metrics(name)
+            self.stdout.write(self.style.SUCCESS(name))
+
+            for field, value in sorted(counters.items()):
+                self.stdout.write(f"  {field}: {value}")
+
+            lookups = sum(counters.get(field, 0) for field in ("hit", "stale", "miss"))
+            if lookups:
+                hit_ratio = (
+                    counters.get("hit", 0) + counters.get("stale", 0)
+                ) / lookups
+                self.stdout.write(f"  hit ratio: {hit_ratio:.2%}")
+
+            # Counters recorded by each batch of apps.feeds.indexer
+            if counters.get("seconds"):
+                docs_per_second = counters.get("docs", 0) / counters["seconds"]
+                self.stdout.write(f"  docs/sec: {docs_per_second:.1f}")
+            if counters.get("batches"):
+                average_lag = counters.get("lag_seconds", 0) / counters["batches"]
+                self.stdout.write(f"  average lag: {average_lag:.2f}s")
+
+            # Counters recorded per task by utils.debounce
+            calls = counters.get("scheduled", 0) + counters.get("collapsed", 0)
+            if calls and "scheduled" in counters:
+                self.stdout.write(
+                    f"  collapsed: {counters.get('collapsed', 0) / calls:.2%} of the calls"
+                )
+
+            # Counters recorded per queue by apps.feeds.signals.tasks
+            if counters.get("tasks"):
+                for field in ("wait_seconds", "run_seconds"):
+                    average = counters.get(field, 0) / counters["tasks"] * 1000
+                    self.stdout.write(f"  average {field[:-8]}: {average:.1f}ms")
+
+            # Counters recorded per tier by utils.cache_backends.TwoTierRedisCache
+            for tier in ("local", "redis"):
+                hits = counters.get(f"{tier}_hit", 0)
+                lookups = hits + counters.get(f"{tier}_miss", 0)
+                if lookups:
+                    self.stdout.write(f"  {tier} hit ratio: {hits / lookups:.2%}")
+
+            # Counters recorded per endpoint by utils.cache_response.PayloadCacheMixin
+            if counters.get("rendered_bytes"):
+                saved = counters["rendered_bytes"] - counters.get("stored_bytes", 0)
+                self.stdout.write(
+                    f"  bytes saved: {saved} "
+                    f"({saved / counters['rendered_bytes']:.2%} of the rendered bytes)"
+                )
+            if name.endswith(":payload"):
+                self.write_latencies(
+                    counters, get_metrics(name.removesuffix(":payload"))
+                )
+
+            if kwargs["reset"]:
+                reset_metrics(name)
+
+    def write_latencies(self, counters, outcomes):
+        """Write the average latency of hits and misses, and what a hit saves."""
+        averages = {}
+
+        for outcome in ("hit", "stale", "miss"):
+            if counters.get(f"{outcome}_seconds") and outcomes.get(outcome):
+                averages[outcome] = (
+                    counters[f"{outcome}_seconds"] / outcomes[outcome] * 1000
+                )
+                self.stdout.write(f"  average {outcome}: {averages[outcome]:.2f}ms")
+
+        if "hit" in averages and "miss" in averages:
+            self.stdout.write(
+                f"  latency gained per hit: {averages['miss'] - averages['hit']:.2f}ms"
+            )
+
+        # Added to the cached content of every response, e.g. `liked_by_me` of posts
+        if counters.get("viewer_states"):
+            seconds = counters["viewer_state_seconds"] / counters["viewer_states"]
+            self.stdout.write(f"  average viewer state: {seconds * 1000:.2f}ms")
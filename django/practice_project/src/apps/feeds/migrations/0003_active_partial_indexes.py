@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feeds", "0002_notification_read_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["post", "created", "id"],
+                name="feeds_comment_active_post_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["-modified", "-id"],
+                name="feeds_post_active_modified_idx",
+            ),
+        ),
+    ]
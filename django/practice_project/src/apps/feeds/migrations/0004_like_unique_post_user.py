@@ -0,0 +1,47 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:35
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_likes(apps, schema_editor):
+    """Keep the first like of each (post, user), and recount the likes of those posts."""
+    Like = apps.get_model("feeds", "Like")
+    PostStatistics = apps.get_model("feeds", "PostStatistics")
+
+    duplicates = (
+        Like.objects.values("post_id", "user_id")
+        .annotate(count=Count("id"), first_id=Min("id"))
+        .filter(count__gt=1)
+    )
+    post_ids = set()
+
+    for duplicate in duplicates.iterator():
+        Like.objects.filter(
+            post_id=duplicate["post_id"], user_id=duplicate["user_id"]
+        ).exclude(id=duplicate["first_id"]).delete()
+        post_ids.add(duplicate["post_id"])
+
+    for post_id in post_ids:
+        PostStatistics.objects.filter(post_id=post_id).update(
+            likes_count=Like.objects.filter(post_id=post_id).count()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feeds", "0003_active_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="like",
+            constraint=models.UniqueConstraint(
+                fields=("post", "user"), name="feeds_like_unique_post_user"
+            ),
+        ),
+    ]
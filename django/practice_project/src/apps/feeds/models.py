@@ -1,4 +1,8 @@
 from django.db import models
+from django.utils.functional import cached_property
+
+# Counters
+from apps.feeds import counters
 
 # Models
 from apps.users.models import User
@@ -11,6 +15,23 @@ class Notification(TimeStampedModel):
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="notifications"
     )
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Notification"
+        verbose_name_plural = "Notifications"
+        indexes = [
+            # Inbox pages, newest first
+            models.Index(
+                fields=["user", "-created", "-id"], name="feeds_notif_user_created_idx"
+            ),
+            # Unread count, only unread notifications are indexed
+            models.Index(
+                fields=["user"],
+                condition=models.Q(read_at__isnull=True),
+                name="feeds_notif_user_unread_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message}"
@@ -72,6 +93,23 @@ class PostQuerySet(models.QuerySet):
         """Filter active (non-soft-deleted) posts."""
         return self.filter(deleted_at__isnull=True)
 
+    def with_feed_relations(self):
+        """Load everything `PostSerializer` reads, so a page costs a constant number of queries."""
+        return self.select_related("user", "statistics", "category").prefetch_related(
+            "hashtags"
+        )
+
+    def with_viewer_state(self, user):
+        """Annotate whether `user` liked and commented each post, with EXISTS subqueries."""
+        return self.annotate(
+            liked_by_me=models.Exists(
+                Like.objects.filter(post=models.OuterRef("pk"), user=user)
+            ),
+            commented_by_me=models.Exists(
+                Comment.objects.active().filter(post=models.OuterRef("pk"), user=user)
+            ),
+        )
+
 
 class PostManager(models.Manager):
     """Custom manager for handling `Post` related operations."""
@@ -82,6 +120,12 @@ class PostManager(models.Manager):
     def active(self):
         return self.get_queryset().active()
 
+    def with_feed_relations(self):
+        return self.get_queryset().with_feed_relations()
+
+    def with_viewer_state(self, user):
+        return self.get_queryset().with_viewer_state(user)
+
 
 class Post(TimeStampedModel, SoftDeleteModel):
     """Represents a blog post or an article with content and associated categories/hashtags."""
@@ -104,6 +148,14 @@ class Post(TimeStampedModel, SoftDeleteModel):
     class Meta:
         verbose_name = "Post"
         verbose_name_plural = "Posts"
+        indexes = [
+            # Posts feed, `active().order_by("-modified", "-id")`
+            models.Index(
+                fields=["-modified", "-id"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="feeds_post_active_modified_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Post by {self.user.username} - {self.title}"
@@ -121,15 +173,22 @@ class Post(TimeStampedModel, SoftDeleteModel):
             "lon": self.longitude,
         }
 
+    @cached_property
+    def pending_counters(self):
+        """Return the counter deltas buffered in Redis and not yet saved to PostStatistics."""
+        return counters.get_pending_counters([self.id])[self.id]
+
     @property
     def likes_count(self):
-        """Return the likes count from the related PostStatistics model."""
-        return self.statistics.likes_count if self.statistics else 0
+        """Return the likes count from the related PostStatistics model plus pending likes."""
+        count = self.statistics.likes_count if hasattr(self, "statistics") else 0
+        return max(count + self.pending_counters.get("likes_count", 0), 0)
 
     @property
     def comments_count(self):
-        """Return the comments count from the related PostStatistics model."""
-        return self.statistics.comments_count if self.statistics else 0
+        """Return the comments count from the related PostStatistics model plus pending comments."""
+        count = self.statistics.comments_count if hasattr(self, "statistics") else 0
+        return max(count + self.pending_counters.get("comments_count", 0), 0)
 
 
 class PostStatistics(SoftDeleteModel):
@@ -182,6 +241,14 @@ class Comment(TimeStampedModel, SoftDeleteModel):
     class Meta:
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
+        indexes = [
+            # Comments of a post, `filter(post_id=...).active().order_by("created", "id")`
+            models.Index(
+                fields=["post", "created", "id"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="feeds_comment_active_post_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user} on {self.post}"
@@ -196,6 +263,34 @@ class Like(TimeStampedModel):
     class Meta:
         verbose_name = "Like"
         verbose_name_plural = "Likes"
+        constraints = [
+            # A user likes a post at most once, also used by `ON CONFLICT` in likes.py
+            models.UniqueConstraint(
+                fields=["post", "user"], name="feeds_like_unique_post_user"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} likes {self.post}"
+
+
+class OutboxEvent(models.Model):
+    """
+    A Celery task queued by a signal, saved in the transaction of the change that
+    queued it and published once that transaction commits (see `apps.feeds.outbox`).
+    """
+
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Outbox Event"
+        verbose_name_plural = "Outbox Events"
+        indexes = [
+            # Events left behind, oldest first, see `relay_outbox_task`
+            models.Index(fields=["created"], name="feeds_outbox_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task}{tuple(self.args)}"
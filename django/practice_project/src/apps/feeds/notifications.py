@@ -0,0 +1,272 @@
+"""
+Buffered, coalescing delivery of notifications.
+
+Likes and comments don't create a notification each. Events are counted in a Redis
+hash per (recipient, kind, post) group, and the group is due
+`NOTIFICATIONS_COALESCE_WINDOW` seconds after its first event. `flush_notifications_task`
+then writes a single notification per due group, e.g. "Your post titled 'X' got 37
+likes.", with one bulk INSERT per batch.
+
+The number of unread notifications of each user is cached in Redis as well and kept
+up to date as notifications are delivered and read, so the notifications list
+doesn't have to count rows.
+"""
+
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+# Models
+from apps.feeds.models import Notification
+
+# Utils
+from utils.async_redis import get_async_redis_connection
+
+# Prefix of the Redis hashes holding the pending events of each group
+PENDING_KEY_PREFIX = "notifications:pending"
+
+# Redis sorted set of the pending groups, scored with the time they are due
+DUE_KEY = "notifications:due"
+
+# Prefix of the Redis counters of unread notifications of each user
+UNREAD_KEY_PREFIX = "notifications:unread"
+
+# Changes a cached unread count, counts not cached are computed on the next read
+INCR_IF_CACHED_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return redis.call("incrby", KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+LIKE = "like"
+COMMENT = "comment"
+
+# Messages of a single event, and of several events coalesced together
+MESSAGES = {
+    LIKE: (
+        "Your post titled '{title}' was liked.",
+        "Your post titled '{title}' got {count} likes.",
+    ),
+    COMMENT: (
+        "Your post titled '{title}' has a new comment.",
+        "Your post titled '{title}' got {count} new comments.",
+    ),
+}
+
+
+def get_group(user_id, kind, post_id):
+    return f"{user_id}:{kind}:{post_id}"
+
+
+def get_pending_key(group):
+    """Return the Redis key of the hash holding the pending events of a group."""
+    return f"{PENDING_KEY_PREFIX}:{group}"
+
+
+def get_unread_key(user_id):
+    """Return the Redis key of the number of unread notifications of a user."""
+    return f"{UNREAD_KEY_PREFIX}:{user_id}"
+
+
+def notify(user_id, kind, post_id, title):
+    """
+    Buffers a notification event, to be merged with the events of the same group.
+
+    Args:
+        user_id: ID of the notified user.
+        kind: `LIKE` or `COMMENT`.
+        post_id: ID of the post the event is about.
+        title: Title of the post, the latest one is used in the message.
+    """
+    group = get_group(user_id, kind, post_id)
+    due_at = time.time() + settings.NOTIFICATIONS_COALESCE_WINDOW
+
+    pipeline = get_redis_connection("default").pipeline(transaction=True)
+    pipeline.hincrby(get_pending_key(group), "count", 1)
+    pipeline.hset(get_pending_key(group), "title", title)
+    pipeline.zadd(DUE_KEY, {group: due_at}, nx=True)
+    pipeline.execute()
+
+
+def pop_due_notifications(limit):
+    """
+    Removes and returns up to `limit` groups whose coalescing window is over.
+
+    Returns:
+        dict: Mapping of group to a dict with the `count` of events and the `title`.
+    """
+    connection = get_redis_connection("default")
+    groups = [
+        group.decode()
+        for group in connection.zrangebyscore(DUE_KEY, 0, time.time(), 0, limit)
+    ]
+
+    if not groups:
+        return {}
+
+    pipeline = connection.pipeline(transaction=True)
+
+    for group in groups:
+        pipeline.hgetall(get_pending_key(group))
+        pipeline.delete(get_pending_key(group))
+        pipeline.zrem(DUE_KEY, group)
+
+    results = pipeline.execute()[::3]
+
+    return {
+        group: {"count": int(pending[b"count"]), "title": pending[b"title"].decode()}
+        for group, pending in zip(groups, results)
+        if pending
+    }
+
+
+def restore_notifications(pending):
+    """Buffer again groups that could not be written, they are due right away."""
+    pipeline = get_redis_connection("default").pipeline(transaction=True)
+
+    for group, event in pending.items():
+        pipeline.hincrby(get_pending_key(group), "count", event["count"])
+        pipeline.hsetnx(get_pending_key(group), "title", event["title"])
+        pipeline.zadd(DUE_KEY, {group: time.time()}, nx=True)
+
+    pipeline.execute()
+
+
+def build_notification(group, event):
+    user_id, kind, _ = group.split(":")
+    single, several = MESSAGES[kind]
+    message = single if event["count"] == 1 else several
+
+    return Notification(user_id=int(user_id), message=message.format(**event))
+
+
+def incr_unread_counts(deltas):
+    """
+    Adds deltas to the cached unread counts of users.
+
+    Args:
+        deltas: Mapping of user ID to the number of notifications delivered, or
+            negative, read.
+    """
+    connection = get_redis_connection("default")
+    incr_if_cached = connection.register_script(INCR_IF_CACHED_SCRIPT)
+    pipeline = connection.pipeline(transaction=False)
+
+    for user_id, delta in deltas.items():
+        if delta:
+            incr_if_cached(
+                keys=[get_unread_key(user_id)], args=[delta], client=pipeline
+            )
+
+    pipeline.execute()
+
+
+def deliver(notifications):
+    """Write notifications with one bulk INSERT and count them as unread."""
+    Notification.objects.bulk_create(notifications)
+
+    deltas = {}
+    for notification in notifications:
+        deltas[notification.user_id] = deltas.get(notification.user_id, 0) + 1
+
+    incr_unread_counts(deltas)
+
+
+def get_unread_count(user_id):
+    """
+    Returns the number of unread notifications of a user.
+
+    The count is read from Redis, and on a miss counted once using the partial index
+    of unread notifications, then cached for `NOTIFICATIONS_UNREAD_COUNT_TIMEOUT`
+    seconds, which bounds any drift.
+    """
+    connection = get_redis_connection("default")
+    count = connection.get(get_unread_key(user_id))
+
+    if count is not None:
+        return int(count)
+
+    count = Notification.objects.filter(user_id=user_id, read_at__isnull=True).count()
+    connection.set(
+        get_unread_key(user_id),
+        count,
+        ex=settings.NOTIFICATIONS_UNREAD_COUNT_TIMEOUT,
+        nx=True,
+    )
+    return count
+
+
+async def aget_unread_count(user_id):
+    """Asynchronous version of `get_unread_count`, for the async views."""
+    connection = get_async_redis_connection()
+    count = await connection.get(get_unread_key(user_id))
+
+    if count is not None:
+        return int(count)
+
+    count = await Notification.objects.filter(
+        user_id=user_id, read_at__isnull=True
+    ).acount()
+    await connection.set(
+        get_unread_key(user_id),
+        count,
+        ex=settings.NOTIFICATIONS_UNREAD_COUNT_TIMEOUT,
+        nx=True,
+    )
+    return count
+
+
+def mark_read(user_id, notification_ids=None):
+    """
+    Marks notifications of a user as read with a single UPDATE.
+
+    Args:
+        user_id: ID of the user.
+        notification_ids: IDs of the notifications to mark, all of them if None.
+
+    Returns:
+        int: Number of notifications that were unread.
+    """
+    queryset = Notification.objects.filter(user_id=user_id, read_at__isnull=True)
+
+    if notification_ids is not None:
+        queryset = queryset.filter(id__in=notification_ids)
+
+    updated = queryset.update(read_at=timezone.now())
+    incr_unread_counts({user_id: -updated})
+
+    return updated
+
+
+def prune_notifications(older_than, batch_size):
+    """
+    Deletes the notifications created before `older_than`, one batch at a time.
+
+    Batches are selected in primary key order, which follows the creation order, so
+    each one only reads the oldest rows. Cached unread counts of the affected users
+    are dropped and counted again on their next read.
+
+    Returns:
+        int: Number of deleted notifications.
+    """
+    connection = get_redis_connection("default")
+    total = 0
+
+    while True:
+        rows = list(
+            Notification.objects.filter(created__lt=older_than)
+            .order_by("id")
+            .values_list("id", "user_id")[:batch_size]
+        )
+        if not rows:
+            return total
+
+        Notification.objects.filter(id__in=[row[0] for row in rows]).delete()
+        connection.delete(*{get_unread_key(user_id) for _, user_id in rows})
+        total += len(rows)
+
+        if len(rows) < batch_size:
+            return total
@@ -0,0 +1,126 @@
+"""
+Transactional outbox of the Celery tasks queued by the feeds signals.
+
+Signals used to send their tasks to the broker right away, one round trip each in the
+save path of the request, and the tasks could run before the transaction committed.
+Tasks are now saved as `OutboxEvent` rows in the same transaction as the change that
+queued them. Once it commits, the events of the transaction are published over a
+single broker connection and their rows deleted with one query.
+
+Events left behind, e.g. when the process died between the commit and the
+publication, are published by `relay_outbox_task`. Delivery is at least once, so the
+tasks must be idempotent.
+"""
+
+import threading
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+# Models
+from apps.feeds.models import OutboxEvent
+
+# Utils
+from utils.debounce import DebouncedTask, debounce
+from utils.metrics import incr_metric
+
+METRIC_NAME = "outbox"
+
+# IDs of the events saved by the transactions of the current thread, not yet published
+_local = threading.local()
+
+
+def _get_pending():
+    if not hasattr(_local, "pending"):
+        _local.pending = []
+
+    return _local.pending
+
+
+def publish(task, *args):
+    """
+    Queue a task once the current transaction commits, or right away outside of one.
+
+    Args:
+        task: The Celery task.
+        args: Its JSON serializable arguments.
+    """
+    event = OutboxEvent.objects.create(task=task.name, args=list(args))
+    _get_pending().append(event.id)
+
+    # Every event registers a flush, the first one publishes the whole transaction
+    transaction.on_commit(flush)
+
+
+def flush():
+    """Publish the events saved by the transactions of this thread that committed."""
+    event_ids, _local.pending = _get_pending(), []
+
+    # Events of rolled back transactions are in the list, but not in the table
+    if event_ids:
+        publish_events(OutboxEvent.objects.filter(id__in=event_ids))
+
+
+def publish_events(events, limit=None):
+    """
+    Send events to the broker over a single connection, then delete them.
+
+    The rows are locked while they are published, rows locked by another process
+    publishing them are skipped. Events of a `DebouncedTask` are debounced.
+
+    Args:
+        events: Queryset of the events to publish.
+        limit: Maximum number of events to publish.
+
+    Returns:
+        int: The number of published events.
+    """
+    with transaction.atomic():
+        events = list(events.select_for_update(skip_locked=True).order_by("id")[:limit])
+
+        if not events:
+            return 0
+
+        with current_app.producer_or_acquire() as producer:
+            for event in events:
+                task = current_app.tasks[event.task]
+
+                if isinstance(task, DebouncedTask):
+                    debounce(task, *event.args, producer=producer)
+                else:
+                    task.apply_async(event.args, producer=producer)
+
+        OutboxEvent.objects.filter(id__in=[event.id for event in events]).delete()
+
+    incr_metric(METRIC_NAME, "published", len(events))
+    return len(events)
+
+
+def relay_events(batch_size):
+    """
+    Publish the events older than `OUTBOX_RELAY_DELAY` seconds, in batches.
+
+    Younger events are left to the `flush` of their transaction.
+
+    Returns:
+        int: The number of relayed events.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.OUTBOX_RELAY_DELAY)
+    relayed = 0
+
+    while True:
+        published = publish_events(
+            OutboxEvent.objects.filter(created__lt=cutoff), batch_size
+        )
+        relayed += published
+
+        if published < batch_size:
+            break
+
+    if relayed:
+        incr_metric(METRIC_NAME, "relayed", relayed)
+
+    return relayed
@@ -1,4 +1,4 @@
 from .category import CategorySerializer
 from .comment import CommentSerializer
 from .post import PostSerializer
-from .notification import NotificationSerializer
+from .notification import NotificationSerializer, NotificationReadSerializer
@@ -7,4 +7,15 @@ from apps.feeds.models import Notification
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = ["id", "message"]
+        fields = ["id", "message", "created", "read_at"]
+
+
+class NotificationReadSerializer(serializers.Serializer):
+    """Notifications to mark as read, every unread notification if `ids` is omitted."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=1000,
+    )
@@ -13,6 +13,8 @@ class PostSerializer(serializers.ModelSerializer):
     likes_count = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     location = serializers.SerializerMethodField()
+    liked_by_me = serializers.SerializerMethodField()
+    commented_by_me = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -27,12 +29,14 @@ class PostSerializer(serializers.ModelSerializer):
             "likes_count",
             "comments_count",
             "location",
+            "liked_by_me",
+            "commented_by_me",
             "created",
             "modified",
         ]
 
     def get_author(self, obj):
-        # Return the location data for the post
+        # Return the author's username, `user` is loaded along with the post
         return obj.author
 
     def get_location(self, obj):
@@ -40,9 +44,17 @@ class PostSerializer(serializers.ModelSerializer):
         return obj.location
 
     def get_likes_count(self, obj):
-        # Return the location data for the post
+        # Return the likes count, `statistics` is loaded along with the post
         return obj.likes_count if obj.likes_count is not None else 0
 
     def get_comments_count(self, obj):
-        # Return the location data for the post
+        # Return the comments count, `statistics` is loaded along with the post
         return obj.comments_count if obj.comments_count is not None else 0
+
+    def get_liked_by_me(self, obj):
+        # Annotated by `PostQuerySet.with_viewer_state`, never queried per post
+        return getattr(obj, "liked_by_me", False)
+
+    def get_commented_by_me(self, obj):
+        # Annotated by `PostQuerySet.with_viewer_state`, never queried per post
+        return getattr(obj, "commented_by_me", False)
@@ -1,5 +1,5 @@
 from .post import created_post_signal
-from .post_statistic import created_post_statistic_signal
 from .comment import created_comment_signal, deleted_comment_signal
 from .like import created_like_signal, deleted_like_signal
 from .cache import invalidate_cache
+from .tasks import record_queue_wait, record_run_time, stamp_published_at
@@ -1,3 +1,5 @@
+import logging
+
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
@@ -5,6 +7,11 @@ from django.core.cache import cache
 # Models
 from apps.feeds import models
 
+# Utils
+from utils import invalidate_tags, build_object_key, build_collection_tag
+
+logger = logging.getLogger(__name__)
+
 
 @receiver(post_save, sender=models.Post)
 @receiver(post_delete, sender=models.Post)
@@ -20,15 +27,25 @@ def invalidate_cache(sender, instance, **kwargs):
 
     match model_name:
         case "post":
-            cache.delete_pattern("posts:params:*")
-            cache.delete(f"posts:{instance.id}")
+            invalidate_tags("posts")
+            cache.delete(build_object_key(("posts", instance.id)))
         case "comment":
-            cache.delete_pattern("posts:params:*")
-            cache.delete(f"posts:{instance.post.id}")
-            cache.delete_pattern(f"posts:{instance.post.id}:comments:params:*")
-            cache.delete(f"posts:{instance.post.id}:comments:{instance.id}")
+            invalidate_tags(
+                "posts",
+                build_collection_tag(("posts", instance.post_id), resource="comments"),
+            )
+            cache.delete_many(
+                [
+                    build_object_key(("posts", instance.post_id)),
+                    build_object_key(
+                        ("posts", instance.post_id), ("comments", instance.id)
+                    ),
+                ]
+            )
         case "like":
-            cache.delete_pattern("posts:params:*")
-            cache.delete(f"posts:{instance.post.id}")
+            invalidate_tags("posts")
+            cache.delete(build_object_key(("posts", instance.post_id)))
         case _:
-            print(f"No cache invalidation rule defined for model: {model_name}")
+            logger.warning(
+                "No cache invalidation rule defined for model: %s", model_name
+            )
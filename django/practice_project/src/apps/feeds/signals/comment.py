@@ -1,41 +1,62 @@
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 # Models
 from apps.feeds import models
 
-# Tasks
-from apps.feeds import tasks
+# Counters, notifications and timelines
+from apps.feeds import counters, notifications, timelines
 
 
 @receiver(post_save, sender=models.Comment)
 def created_comment_signal(sender, instance, created, **kwargs):
     """
-    Trigger tasks for comment creation:
-    - Increment the comments count in PostStatistics.
-    - Notify the author of the post about the new comment (if not self-comment).
+    Trigger tasks for comment creation, once it is committed:
+    - Buffer an increment of the comments count (see `apps.feeds.counters`).
+    - Buffer a notification of the author of the post, if not self-comment
+      (see `apps.feeds.notifications`).
     """
     if created:
-        # Increment the comments count
-        tasks.increment_comments_count_task.delay(instance.post.id)
+        # Buffer the comment once it is committed, it is saved to the post statistics
+        # by the periodic flush
+        transaction.on_commit(
+            partial(counters.incr_post_counter, instance.post_id, "comments_count", 1)
+        )
+
+        # The user now follows the category of the post in their home timeline, once
+        # the comment is committed
+        transaction.on_commit(
+            partial(timelines.add_interest, instance.user_id, instance.post.category_id)
+        )
 
         # Check if the comment author is not the post author
         post_author = instance.post.user  # Get the post author
         comment_author = instance.user  # Get the user who made the comment
 
         if post_author and post_author != comment_author:
-            # Notify the post author if the comment is by someone else
-            tasks.send_notification_task.delay(
-                user_id=post_author.id,
-                message=f"Your post titled '{instance.post.title}' has a new comment.",
+            # Notify the post author if the comment is by someone else, comments made
+            # within the coalescing window are merged into one notification
+            transaction.on_commit(
+                partial(
+                    notifications.notify,
+                    post_author.id,
+                    notifications.COMMENT,
+                    instance.post_id,
+                    instance.post.title,
+                )
             )
 
 
 @receiver(post_delete, sender=models.Comment)
 def deleted_comment_signal(sender, instance, **kwargs):
     """
-    Trigger tasks for comment deletion:
-    - Decrement the comments count in PostStatistics.
+    Trigger tasks for comment deletion, once it is committed:
+    - Buffer a decrement of the comments count (see `apps.feeds.counters`).
     """
     if instance.is_deleted:
-        tasks.decrement_comments_count_task.delay(instance.post.id)
+        transaction.on_commit(
+            partial(counters.incr_post_counter, instance.post_id, "comments_count", -1)
+        )
@@ -1,42 +1,62 @@
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 # Models
 from apps.feeds import models
 
-# Tasks
-from apps.feeds import tasks
+# Counters, notifications and timelines
+from apps.feeds import counters, notifications, timelines
 
 
 @receiver(post_save, sender=models.Like)
 def created_like_signal(sender, instance, created, **kwargs):
     """
-    Trigger tasks for like creation:
-    - Increment the likes count in PostStatistics.
-    - Notify the author of the post about the new like (only if post is liked).
+    Trigger tasks for like creation, once it is committed:
+    - Buffer an increment of the likes count (see `apps.feeds.counters`).
+    - Buffer a notification of the author of the post (see `apps.feeds.notifications`).
     """
     if created:
         # Notify the post author, but not if the post author liked their own post
         post_id = instance.post.id
         post_tile = instance.post.title
-        post_author = instance.post.user  # Get the author of the post
-        like_user = instance.user  # Get the user who liked the post
-
-        # Increment the likes count for the post
-        tasks.increment_likes_count_task.delay(post_id)
-
-        if post_author != like_user:
-            # Notify the post author if the liked is by someone else
-            tasks.send_notification_task.delay(
-                user_id=post_author.id,
-                message=f"Your post titled '{post_tile}' was liked.",
+        post_author_id = instance.post.user_id  # The author of the post
+        like_user_id = instance.user_id  # The user who liked the post
+
+        # Buffer the like once it is committed, it is saved to the post statistics by
+        # the periodic flush
+        transaction.on_commit(
+            partial(counters.incr_post_counter, post_id, "likes_count", 1)
+        )
+
+        # The user now follows the category of the post in their home timeline, once
+        # the like is committed
+        transaction.on_commit(
+            partial(timelines.add_interest, like_user_id, instance.post.category_id)
+        )
+
+        if post_author_id != like_user_id:
+            # Notify the post author if the liked is by someone else, likes received
+            # within the coalescing window are merged into one notification
+            transaction.on_commit(
+                partial(
+                    notifications.notify,
+                    post_author_id,
+                    notifications.LIKE,
+                    post_id,
+                    post_tile,
+                )
             )
 
 
 @receiver(post_delete, sender=models.Like)
 def deleted_like_signal(sender, instance, **kwargs):
     """
-    Trigger tasks for like deletion:
-    - Decrement the likes count in PostStatistics.
+    Trigger tasks for like deletion, once it is committed:
+    - Buffer a decrement of the likes count (see `apps.feeds.counters`).
     """
-    tasks.decrement_likes_count_task.delay(instance.post.id)
+    transaction.on_commit(
+        partial(counters.incr_post_counter, instance.post_id, "likes_count", -1)
+    )
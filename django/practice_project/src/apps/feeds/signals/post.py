@@ -1,3 +1,6 @@
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -5,16 +8,39 @@ from django.dispatch import receiver
 from apps.feeds import models
 
 # Tasks
-from apps.feeds import tasks
+from apps.feeds import hashtags, outbox, tasks, timelines
 
 
 @receiver(post_save, sender=models.Post)
-def created_post_signal(sender, instance, created, **kwargs):
+def created_post_signal(sender, instance, created, update_fields=None, **kwargs):
     """
-    Trigger background task for creating PostStatistics when a new post is created.
+    Trigger background task for creating PostStatistics when a new post is created,
+    and add it to the timelines (see `apps.feeds.timelines`).
+    Extract the hashtags of the post again only if its content changed.
+
+    Tasks are published once the transaction commits (see `apps.feeds.outbox`).
     """
     if created:
         # Trigger the task to create post statistics
         models.PostStatistics.objects.create(post=instance)
 
-    tasks.extract_and_associate_hashtags_task.delay(instance.id)
+        # Redis isn't rolled back, the timelines are written once the post is committed
+        transaction.on_commit(
+            partial(timelines.add_interest, instance.user_id, instance.category_id)
+        )
+        transaction.on_commit(partial(timelines.add_post, instance))
+
+        outbox.publish(
+            tasks.fan_out_post_task,
+            instance.id,
+            instance.category_id,
+            instance.created.timestamp(),
+        )
+
+    if update_fields is not None and "content" not in update_fields:
+        return
+
+    if created or hashtags.has_content_changed(instance):
+        # Batched with the other waiting posts once committed, see `apps.feeds.hashtags`
+        transaction.on_commit(partial(hashtags.enqueue_posts, [instance.id]))
+        outbox.publish(tasks.extract_and_associate_hashtags_task, instance.id)
@@ -0,0 +1,51 @@
+import time
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+
+# Utils
+from utils.metrics import incr_metric
+
+
+def get_queue_metric_name(queue):
+    """Return the metric of the tasks consumed from a Celery queue."""
+    return f"celery:{queue}"
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    """
+    Stamp published tasks with the time they were sent, to measure their wait in
+    the queue once a worker picks them up.
+    """
+    if headers is not None:
+        headers["published_at"] = time.time()
+
+
+@task_prerun.connect
+def record_queue_wait(task=None, **kwargs):
+    """Count the tasks of each queue and the seconds they waited in it."""
+    published_at = getattr(task.request, "published_at", None)
+    delivery_info = task.request.delivery_info or {}
+
+    # Eager tasks are neither published nor consumed from a queue
+    if published_at is None or not delivery_info.get("routing_key"):
+        return
+
+    metric_name = get_queue_metric_name(delivery_info["routing_key"])
+    task.request.started_at = time.perf_counter()
+
+    incr_metric(metric_name, "tasks")
+    incr_metric(metric_name, "wait_seconds", max(time.time() - published_at, 0.0))
+
+
+@task_postrun.connect
+def record_run_time(task=None, **kwargs):
+    """Add the seconds the task ran to the metric of its queue."""
+    started_at = getattr(task.request, "started_at", None)
+
+    if started_at is not None:
+        incr_metric(
+            get_queue_metric_name(task.request.delivery_info["routing_key"]),
+            "run_seconds",
+            time.perf_counter() - started_at,
+        )
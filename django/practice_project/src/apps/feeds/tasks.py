@@ -1,79 +1,178 @@
-import re
 import logging
+from datetime import timedelta
 
 from celery import shared_task
-from django_elasticsearch_dsl.registries import registry
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+# Counters, hashtags, indexing, notifications, outbox and timelines
+from apps.feeds import counters, hashtags, indexer, notifications, outbox, timelines
+
+# Utils
+from utils.debounce import DebouncedTask
 
 # Models
-from apps.feeds.models import (
-    Notification,
-    PostStatistics,
-    User,
-    Hashtag,
-    Post,
-)
+from apps.feeds.models import PostStatistics
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task
-def send_notification_task(user_id, message):
-    """Send a notification to the user."""
-    user = User.objects.get(id=user_id)
-    Notification.objects.create(user=user, message=message)
+def flush_notifications_task():
+    """
+    Write the notifications buffered in Redis whose coalescing window is over.
 
+    Run periodically by Celery beat. Each batch is one bulk INSERT, failed batches
+    are buffered again for the next flush.
+    """
+    batch_size = settings.NOTIFICATIONS_FLUSH_BATCH_SIZE
 
-@shared_task
-def sync_post_statistics_task(post_statistics_id):
-    """Update the Elasticsearch document for the given PostStatistics."""
-    post_statistics = PostStatistics.objects.get(id=post_statistics_id)
-    registry.update(post_statistics)
+    while True:
+        pending = notifications.pop_due_notifications(batch_size)
 
+        if pending:
+            try:
+                notifications.deliver(
+                    [
+                        notifications.build_notification(group, event)
+                        for group, event in pending.items()
+                    ]
+                )
+            except Exception:
+                notifications.restore_notifications(pending)
+                raise
 
-@shared_task
-def increment_comments_count_task(post_id):
-    """Increment the comments_count field in PostStatistics when a new comment is created."""
-    post_statistics = PostStatistics.objects.get(post_id=post_id)
-    post_statistics.comments_count = post_statistics.comments_count + 1
-    post_statistics.save()
+        if len(pending) < batch_size:
+            return
 
 
 @shared_task
-def decrement_comments_count_task(post_id):
-    """Decrement the comments_count field in PostStatistics when a comment is deleted."""
-    post_statistics = PostStatistics.objects.get(post_id=post_id)
-    post_statistics.comments_count = post_statistics.comments_count - 1
-    post_statistics.save()
+def prune_notifications_task():
+    """
+    Delete the notifications older than `NOTIFICATIONS_RETENTION_DAYS`, in batches.
 
+    Run periodically by Celery beat, so that the table stays bounded.
+    """
+    deleted = notifications.prune_notifications(
+        timezone.now() - timedelta(days=settings.NOTIFICATIONS_RETENTION_DAYS),
+        settings.NOTIFICATIONS_PRUNE_BATCH_SIZE,
+    )
+    logger.info("Deleted %s old notifications", deleted)
 
-@shared_task
-def increment_likes_count_task(post_id):
-    """Increment the likes count in PostStatistics."""
-    post_statistics = PostStatistics.objects.get(post_id=post_id)
-    post_statistics.likes_count = post_statistics.likes_count + 1
-    post_statistics.save()
 
+@shared_task(base=DebouncedTask, bind=True, max_retries=None)
+def index_pending_posts_task(self):
+    """
+    Index the posts queued by `apps.feeds.indexer`, in bulk.
 
-@shared_task
-def decrement_likes_count_task(post_id):
-    """Decrement the likes count in PostStatistics."""
-    post_statistics = PostStatistics.objects.get(post_id=post_id)
-    post_statistics.likes_count = post_statistics.likes_count - 1
-    post_statistics.save()
+    Run periodically by Celery beat and whenever a full batch is waiting. Failed
+    batches are queued again and the drain is retried with an exponential backoff.
+    """
+    try:
+        indexer.drain_pending_posts()
+    except Exception as exc:
+        logger.exception("Failed to index the pending posts")
+        raise self.retry(exc=exc, countdown=min(2**self.request.retries, 60))
+
+
+def apply_post_statistics_deltas(deltas):
+    """
+    Add the buffered deltas to the counters of many posts, never going below zero.
+
+    On PostgreSQL every post is updated by a single `UPDATE ... FROM (VALUES ...)`.
+
+    Args:
+        deltas: Mapping of post ID to a dict of counter name to delta.
+    """
+    rows = [
+        (post_id, delta.get("likes_count", 0), delta.get("comments_count", 0))
+        for post_id, delta in deltas.items()
+    ]
+
+    if connection.vendor != "postgresql":
+        with transaction.atomic():
+            for post_id, likes_delta, comments_delta in rows:
+                PostStatistics.objects.filter(post_id=post_id).update(
+                    likes_count=Greatest(F("likes_count") + likes_delta, 0),
+                    comments_count=Greatest(F("comments_count") + comments_delta, 0),
+                )
+        return
+
+    values = ", ".join(["(%s, %s, %s)"] * len(rows))
+    params = [value for row in rows for value in row]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {PostStatistics._meta.db_table} AS statistics
+            SET likes_count = GREATEST(statistics.likes_count + deltas.likes_count, 0),
+                comments_count = GREATEST(statistics.comments_count + deltas.comments_count, 0)
+            FROM (VALUES {values}) AS deltas (post_id, likes_count, comments_count)
+            WHERE statistics.post_id = deltas.post_id
+            """,
+            params,
+        )
 
 
 @shared_task
+def flush_post_counters_task():
+    """
+    Apply the like and comment counters buffered in Redis to PostStatistics.
+
+    Run periodically by Celery beat. Each batch is one bulk UPDATE, the affected posts
+    are then queued for the batching indexer. The deltas are removed from Redis only
+    once the UPDATE committed, see `apps.feeds.counters`.
+    """
+    batch_size = settings.POST_COUNTERS_FLUSH_BATCH_SIZE
+
+    while True:
+        deltas = counters.claim_pending_counters(batch_size)
+
+        if deltas:
+            try:
+                apply_post_statistics_deltas(deltas)
+            except Exception:
+                # Keep the deltas for the next flush rather than losing them
+                counters.unclaim_counters(list(deltas))
+                raise
+
+            counters.release_claimed_counters(list(deltas))
+            indexer.enqueue_posts(list(deltas))
+
+        if len(deltas) < batch_size:
+            return
+
+
+@shared_task(base=DebouncedTask)
 def extract_and_associate_hashtags_task(post_id):
     """
     Extract hashtags from the post's content and associate them with the post.
+
+    Debounced, a burst of edits of a post is extracted once. The other posts waiting
+    for their hashtags are extracted in the same batch, see `apps.feeds.hashtags`.
     """
-    post = Post.objects.get(id=post_id)
-    hashtag_pattern = r"#(\w+)"
-    hashtags = re.findall(hashtag_pattern, post.content)
-    hashtag_objects = []
+    hashtags.associate_pending_hashtags(post_id)
+
 
-    for tag in hashtags:
-        hashtag_obj, created = Hashtag.objects.get_or_create(name=tag)
-        hashtag_objects.append(hashtag_obj)
+@shared_task
+def fan_out_post_task(post_id, category_id, score):
+    """
+    Add a new post to the home timelines of the audience of its category.
+    """
+    timelines.fan_out_post(post_id, category_id, score)
+
+
+@shared_task
+def relay_outbox_task():
+    """
+    Publish the outbox events that were not published after their transaction.
+
+    Run periodically by Celery beat, see `apps.feeds.outbox`.
+    """
+    relayed = outbox.relay_events(settings.OUTBOX_RELAY_BATCH_SIZE)
 
-    post.hashtags.set(hashtag_objects)
+    if relayed:
+        logger.warning("Relayed %s outbox events left behind", relayed)
@@ -3,3 +3,12 @@ from .comment import CommentViewSetTest
 from .like import LikeAPIViewTest
 from .notification import NotificationAPIViewTest
 from .post import PostViewSetTest
+from .post_cache import PostListCacheTest, TwoTierCacheTest
+from .pagination import KeysetPaginationTest
+from .post_search import PostSearchTest
+from .query_count import FeedsQueryCountTest
+from .home_feed import HomeFeedTest
+from .query_plans import ActiveIndexesTest
+from .viewer_state import PostViewerStateTest
+from .async_read import AsyncReadViewsTest
+from .payload_cache import CompressionTest, PayloadCacheTest
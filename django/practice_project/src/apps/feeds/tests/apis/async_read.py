@@ -0,0 +1,211 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.feeds import counters
+from apps.feeds.documents import PostDocument
+from apps.feeds.factories import (
+    CategoryFactory,
+    PostFactory,
+    UserFactory,
+)
+from apps.feeds.models import Comment, Like, Notification, Post, User
+from utils import get_async_redis_connection
+
+from .post_search import FakeSearch
+
+
+class FakeAsyncSearch(FakeSearch):
+    """`FakeSearch` with the coroutines of an `AsyncSearch`."""
+
+    def _clone(self, **params):
+        clone = FakeAsyncSearch(self.ids, self.requests)
+        clone.params = {**self.params, **params}
+        return clone
+
+    async def count(self):
+        return super().count()
+
+    async def execute(self):
+        return super().execute()
+
+
+class AsyncReadViewsTest(TestCase):
+    """Test cases for the async read endpoints of posts, comments and notifications."""
+
+    def setUp(self):
+        self.user = UserFactory(username="reader")
+        self.category = CategoryFactory()
+        self.posts = PostFactory.create_batch(3, user=self.user, category=self.category)
+
+        token = AccessToken.for_user(self.user)
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        # Also drops the pending counters and unread counts kept in Redis
+        cache.clear()
+
+    def like(self, post):
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=post, user=self.user)
+
+    async def get(self, url, params=None):
+        """Send a GET request authenticated with the token of the user."""
+        return await self.async_client.get(url, params, headers=self.headers)
+
+    async def test_requires_token(self):
+        """Test that requests without a valid token are rejected like the API does."""
+        response = await self.async_client.get(reverse("async-post-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await self.async_client.get(
+            reverse("async-post-list"), headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_requests_are_throttled(self):
+        """Test that the throttles of the API apply to the async views too."""
+        with mock.patch.dict(UserRateThrottle.THROTTLE_RATES, {"user": "1/day"}):
+            response = await self.get(reverse("async-post-list"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = await self.get(reverse("async-post-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+    async def test_list_posts_matches_sync_list(self):
+        """Test that the async list returns the page of the sync list."""
+        response = await self.get(reverse("async-post-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual(
+            [post["id"] for post in response.json()["results"]],
+            [post.id for post in reversed(self.posts)],
+        )
+
+    async def test_retrieve_post_with_viewer_state_and_pending_counters(self):
+        """Test that a post carries the state of the viewer and the buffered counters."""
+        post = self.posts[0]
+
+        # Buffered in Redis once committed, not yet flushed to the statistics
+        await sync_to_async(self.like)(post)
+
+        response = await self.get(reverse("async-post-detail", args=[post.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()["liked_by_me"])
+        self.assertFalse(response.json()["commented_by_me"])
+        self.assertEqual(response.json()["likes_count"], 1)
+
+    async def test_list_posts_last_page(self):
+        """Test that `page=last` returns the last page, like the sync list."""
+        response = await self.get(
+            reverse("async-post-list"), {"page": "last", "page_size": 2}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post["id"] for post in response.json()["results"]], [self.posts[0].id]
+        )
+        self.assertIsNone(response.json()["next"])
+
+    async def test_list_posts_with_keyset_pagination(self):
+        """Test that cursors of the async list walk through every post."""
+        url = reverse("async-post-list")
+        params = {"pagination": "keyset", "page_size": 2}
+        ids = []
+
+        while url:
+            response = await self.get(url, params)
+            params = None
+
+            ids += [post["id"] for post in response.json()["results"]]
+            url = response.json()["next"]
+
+        self.assertEqual(ids, [post.id for post in reversed(self.posts)])
+
+    async def test_search_posts(self):
+        """Test that searches are run with the async Elasticsearch client."""
+        ids = [self.posts[1].id, self.posts[0].id]
+        fake_search = FakeAsyncSearch(ids)
+
+        with mock.patch.object(PostDocument, "async_search", return_value=fake_search):
+            response = await self.get(
+                reverse("async-post-list"), {"search": "title", "page_size": 1}
+            )
+
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual([post["id"] for post in response.json()["results"]], ids[:1])
+        self.assertEqual(
+            fake_search.requests, [{"from_": 0, "size": 1, "_source": False}]
+        )
+
+    async def test_retrieve_deleted_post(self):
+        """Test that soft-deleted posts are not found."""
+        post = self.posts[0]
+        await Post.objects.filter(id=post.id).aupdate(deleted_at=timezone.now())
+
+        response = await self.get(reverse("async-post-detail", args=[post.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn("detail", response.json())
+
+    async def test_list_comments(self):
+        """Test that the comments of a post are listed oldest first."""
+        post = self.posts[0]
+        first = await Comment.objects.acreate(post=post, user=self.user, content="1")
+        second = await Comment.objects.acreate(post=post, user=self.user, content="2")
+
+        response = await self.get(reverse("async-comment-list", args=[post.id]))
+
+        self.assertEqual(
+            [comment["id"] for comment in response.json()["results"]],
+            [first.id, second.id],
+        )
+        self.assertEqual(response.json()["results"][0]["user"], "reader")
+
+    async def test_list_notifications_with_unread_count(self):
+        """Test that notifications are listed newest first, with the unread count."""
+        notifications = [
+            await Notification.objects.acreate(
+                user=self.user, message=f"Notification {index}"
+            )
+            for index in range(3)
+        ]
+        other = await User.objects.acreate(username="other")
+        await Notification.objects.acreate(user=other, message="Not for the reader")
+
+        response = await self.get(reverse("async-notification-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [notification["id"] for notification in response.json()["results"]],
+            [notification.id for notification in reversed(notifications)],
+        )
+        self.assertEqual(response.json()["unread_count"], 3)
+
+    def test_redis_pool_disconnected_with_its_loop(self):
+        """Test that the Redis pool of an event loop is disconnected when it shuts down."""
+
+        async def read_counters():
+            await counters.aattach_pending_counters(self.posts)
+            return get_async_redis_connection().connection_pool
+
+        pool = asyncio.run(read_counters())
+
+        self.assertTrue(pool._available_connections)
+        self.assertFalse(
+            any(connection.is_connected for connection in pool._available_connections)
+        )
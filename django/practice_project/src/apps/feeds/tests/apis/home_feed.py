@@ -0,0 +1,144 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds import counters, tasks, timelines
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Like, Post
+
+
+class HomeFeedTest(APITestCase):
+    """Test cases for the home timeline served by `?feed=home`."""
+
+    def setUp(self):
+        self.reader = UserFactory(username="reader")
+        self.author = UserFactory(username="author")
+        self.news = CategoryFactory(name="news")
+        self.sports = CategoryFactory(name="sports")
+
+        self.client.force_authenticate(user=self.reader)
+
+        # Run the fan-out published by the outbox right away, like a worker would
+        patcher = mock.patch.object(
+            tasks.fan_out_post_task,
+            "apply_async",
+            side_effect=lambda args, **options: tasks.fan_out_post_task(*args),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        connection = get_redis_connection("default")
+        connection.delete(
+            *connection.scan_iter(match=f"{timelines.TIMELINE_KEY_PREFIX}:*")
+        )
+        counters.release_claimed_counters(list(counters.claim_pending_counters(1000)))
+
+    def post(self, category, user=None):
+        # The fan-out is published by the outbox once the transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return PostFactory(user=user or self.author, category=category)
+
+    def like(self, post):
+        # The reader joins the audience of the category once the like is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=post, user=self.reader)
+
+    def get_home_ids(self, **params):
+        response = self.client.get(reverse("post-list"), {"feed": "home", **params})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in response.data["results"]]
+
+    def test_global_timeline_without_interests(self):
+        """Test that users who never posted, liked or commented get every post."""
+        posts = [self.post(self.news), self.post(self.sports)]
+
+        self.assertEqual(self.get_home_ids(), [post.id for post in posts][::-1])
+
+    def test_timelines_written_on_commit(self):
+        """Test that posts are only added to the timelines once they are committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            post = PostFactory(user=self.author, category=self.news)
+
+            self.assertEqual(self.get_home_ids(), [])
+
+        self.assertEqual(self.get_home_ids(), [post.id])
+
+    def test_home_follows_categories_of_interactions(self):
+        """Test that the home timeline holds the posts of the reader's categories."""
+        liked = self.post(self.news)
+        self.post(self.sports)
+        self.like(liked)
+
+        self.assertEqual(self.get_home_ids(), [liked.id])
+
+        # New posts of the category are fanned out to the existing home timeline
+        new = self.post(self.news)
+        self.post(self.sports)
+
+        self.assertEqual(self.get_home_ids(), [new.id, liked.id])
+
+    @override_settings(TIMELINE_FANOUT_MAX_AUDIENCE=1)
+    def test_large_categories_merged_on_read(self):
+        """Test that categories with a large audience are merged into the timeline."""
+        own = self.post(self.sports, user=self.reader)
+        liked = self.post(self.news)
+        self.like(liked)
+        self.assertEqual(self.get_home_ids(), [liked.id, own.id])
+
+        # news has 2 followers, its posts aren't fanned out anymore
+        get_redis_connection("default").delete(timelines.get_merged_key(self.reader.id))
+        new = self.post(self.news)
+
+        self.assertNotIn(
+            str(new.id).encode(),
+            get_redis_connection("default").zrange(
+                timelines.get_home_key(self.reader.id), 0, -1
+            ),
+        )
+        self.assertEqual(self.get_home_ids(), [new.id, liked.id, own.id])
+
+    def test_deleted_posts_are_skipped(self):
+        """Test that posts deleted after they were added aren't returned."""
+        own = self.post(self.news, user=self.reader)
+        deleted = self.post(self.news)
+        Post.objects.filter(id=deleted.id).update(deleted_at=timezone.now())
+
+        self.assertEqual(self.get_home_ids(), [own.id])
+
+    def test_page_loaded_with_constant_queries(self):
+        """Test that a page of the timeline costs as many queries whatever its size."""
+        self.post(self.news, user=self.reader)
+
+        # The posts with their relations, then their hashtags
+        for _ in range(2):
+            self.post(self.news)
+        with self.assertNumQueries(2):
+            self.get_home_ids(page_size=2)
+
+        for _ in range(8):
+            self.post(self.news)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.get_home_ids(page_size=10)), 10)
+
+    def test_rebuild_timelines(self):
+        """Test that the timelines are rebuilt from the database."""
+        own = self.post(self.news, user=self.reader)
+        self.post(self.sports)
+
+        get_redis_connection("default").delete(
+            *get_redis_connection("default").scan_iter(
+                match=f"{timelines.TIMELINE_KEY_PREFIX}:*"
+            )
+        )
+        call_command("rebuild_timelines", stdout=StringIO())
+
+        self.assertEqual(self.get_home_ids(), [own.id])
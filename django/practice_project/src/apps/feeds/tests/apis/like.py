@@ -1,9 +1,14 @@
+from unittest import skipUnless
+
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from apps.feeds.factories import PostFactory, UserFactory
-from apps.feeds.models import Like
+from apps.feeds import counters
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Like, Post, User
 
 
 class LikeAPIViewTest(APITestCase):
@@ -13,11 +18,17 @@ class LikeAPIViewTest(APITestCase):
         """Set up test data, including users, posts, and likes."""
         self.user = UserFactory(is_staff=False)  # Regular user
         self.admin_user = UserFactory(is_staff=True)  # Admin user
-        self.post = PostFactory()  # Create a test post
+        self.category = CategoryFactory()
+        self.post = PostFactory(
+            user=self.admin_user, category=self.category
+        )  # Create a test post
         self.url = reverse(
             "like-post", args=[self.post.id]
         )  # URL for liking/unliking a post
 
+    def tearDown(self):
+        counters.release_claimed_counters(list(counters.claim_pending_counters(1000)))
+
     def force_authenticate(self, user):
         """Authenticate the client as the specified user."""
         self.client.force_authenticate(user=user)
@@ -87,3 +98,91 @@ class LikeAPIViewTest(APITestCase):
         self.assertFalse(
             Like.objects.filter(post=self.post, user=self.admin_user).exists()
         )
+
+    def test_like_is_unique(self):
+        """Test that a user cannot like the same post twice."""
+        Like.objects.create(post=self.post, user=self.user)
+
+        with self.assertRaises(IntegrityError):
+            Like.objects.create(post=self.post, user=self.user)
+
+    def test_toggle_counts_likes(self):
+        """Test that toggling a like updates the likes count both ways."""
+        self.force_authenticate(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url)
+
+        self.assertEqual(self.post.pending_counters, {"likes_count": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url)
+
+        del self.post.pending_counters
+        self.assertEqual(self.post.pending_counters, {"likes_count": 0})
+
+    @skipUnless(connection.vendor == "postgresql", "Single statement on PostgreSQL")
+    def test_toggle_single_statement(self):
+        """Test that the likes table is changed by a single statement per toggle."""
+        self.force_authenticate(self.user)
+
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.url)
+
+            self.assertEqual(
+                len([q for q in queries.captured_queries if "feeds_like" in q["sql"]]),
+                1,
+            )
+
+    @skipUnless(connection.vendor == "postgresql", "Single statement on PostgreSQL")
+    def test_toggle_single_query(self):
+        """Test that the like signals don't load the post or users of a toggle."""
+        self.force_authenticate(self.user)
+
+        for _ in range(2):
+            with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+                self.client.post(self.url)
+
+    def test_toggle_reads_post_once(self):
+        """Test that the like signals reuse the post read by the toggle."""
+        self.force_authenticate(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(self.url)
+
+        tables = [Post._meta.db_table, User._meta.db_table]
+        reads = [
+            query["sql"]
+            for query in queries.captured_queries
+            if any(f"FROM {table}" in query["sql"].replace('"', "") for table in tables)
+        ]
+        self.assertEqual(len(reads), 1)
+
+    def test_liked_lookup(self):
+        """Test that the liked posts among the given ones are returned in one query."""
+        other_post = PostFactory(user=self.admin_user, category=self.category)
+        not_liked = PostFactory(user=self.admin_user, category=self.category)
+        Like.objects.create(post=self.post, user=self.user)
+        Like.objects.create(post=other_post, user=self.user)
+        Like.objects.create(post=not_liked, user=self.admin_user)
+
+        self.force_authenticate(self.user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("like-liked"),
+                {"ids": f"{self.post.id},{other_post.id},{not_liked.id}"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["liked"], sorted([self.post.id, other_post.id]))
+
+    def test_liked_lookup_invalid_ids(self):
+        """Test that IDs which aren't integers are rejected."""
+        self.force_authenticate(self.user)
+
+        response = self.client.get(reverse("like-liked"), {"ids": "1,abc"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
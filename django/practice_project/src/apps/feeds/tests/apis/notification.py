@@ -1,7 +1,9 @@
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
+from django_redis import get_redis_connection
 
+from apps.feeds import notifications
 from apps.feeds.factories import NotificationFactory, UserFactory
 from apps.feeds.models import Notification
 
@@ -19,8 +21,15 @@ class NotificationAPIViewTest(APITestCase):
         self.notification = NotificationFactory(user=self.regular_user)
         self.other_notification = NotificationFactory(user=self.admin_user)
 
-        # Define URL
+        # Define URLs
         self.list_url = reverse("notification-list")
+        self.read_url = reverse("notification-read")
+
+    def tearDown(self):
+        get_redis_connection("default").delete(
+            notifications.get_unread_key(self.admin_user.id),
+            notifications.get_unread_key(self.regular_user.id),
+        )
 
     def force_authenticate(self, user):
         """Helper method to authenticate a user."""
@@ -97,3 +106,89 @@ class NotificationAPIViewTest(APITestCase):
 
         # Assert that the response status code is 401 (Unauthorized)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_keeps_page_numbers_by_default(self):
+        """Test that clients not asking for cursors keep the count and page links."""
+        NotificationFactory.create_batch(11, user=self.regular_user)
+
+        self.force_authenticate(self.regular_user)
+
+        response = self.client.get(self.list_url, {"page": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 12)
+        self.assertIsNotNone(response.data["previous"])
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_is_newest_first_keyset(self):
+        """Test that keyset pages are linked by a cursor, newest first, without a count."""
+        NotificationFactory.create_batch(11, user=self.regular_user)
+
+        self.force_authenticate(self.regular_user)
+
+        response = self.client.get(self.list_url, {"pagination": "keyset"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(response.data["unread_count"], 12)
+
+        ids = [notification["id"] for notification in response.data["results"]]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [notification["id"] for notification in response.data["results"]],
+            list(
+                Notification.objects.filter(user=self.regular_user)
+                .order_by("-created", "-id")
+                .values_list("id", flat=True)[10:]
+            ),
+        )
+
+    def test_mark_read(self):
+        """Test that the given notifications are marked as read."""
+        other = NotificationFactory(user=self.regular_user)
+        self.force_authenticate(self.regular_user)
+
+        response = self.client.post(
+            self.read_url, {"ids": [self.notification.id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"updated": 1, "unread_count": 1})
+
+        self.notification.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNotNone(self.notification.read_at)
+        self.assertIsNone(other.read_at)
+
+        response = self.client.get(self.list_url, {"unread": "true"})
+        self.assertEqual(
+            [notification["id"] for notification in response.data["results"]],
+            [other.id],
+        )
+
+    def test_mark_all_read(self):
+        """Test that every notification is marked as read when no IDs are given."""
+        NotificationFactory.create_batch(2, user=self.regular_user)
+        self.force_authenticate(self.regular_user)
+
+        response = self.client.post(self.read_url, {}, format="json")
+
+        self.assertEqual(response.data, {"updated": 3, "unread_count": 0})
+        self.assertFalse(
+            Notification.objects.filter(
+                user=self.regular_user, read_at__isnull=True
+            ).exists()
+        )
+
+    def test_mark_read_ignores_other_users(self):
+        """Test that a user cannot mark another user's notifications as read."""
+        self.force_authenticate(self.regular_user)
+
+        response = self.client.post(
+            self.read_url, {"ids": [self.other_notification.id]}, format="json"
+        )
+
+        self.assertEqual(response.data["updated"], 0)
+        self.other_notification.refresh_from_db()
+        self.assertIsNone(self.other_notification.read_at)
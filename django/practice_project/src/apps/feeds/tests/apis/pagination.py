@@ -0,0 +1,111 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds.factories import (
+    CategoryFactory,
+    NotificationFactory,
+    PostFactory,
+    UserFactory,
+)
+from apps.feeds.models import Comment, Post
+
+
+class KeysetPaginationTest(APITestCase):
+    """Test cases for the cursor based pagination of posts, comments and notifications."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.category = CategoryFactory()
+        self.posts = PostFactory.create_batch(5, user=self.user, category=self.category)
+
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def walk(self, url, page_size=2, on_page=None):
+        """Follow the `next` links from the first keyset page, return every row ID."""
+        response = self.client.get(
+            url, {"pagination": "keyset", "page_size": page_size}
+        )
+        ids = []
+
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), page_size)
+            ids.extend(row["id"] for row in response.data["results"])
+
+            if on_page:
+                on_page()
+
+            if not response.data["next"]:
+                return ids
+
+            response = self.client.get(response.data["next"])
+
+    def test_posts_are_ordered_newest_first(self):
+        """Test that every post is returned once, most recently modified first."""
+        expected = list(
+            Post.objects.order_by("-modified", "-id").values_list("id", flat=True)
+        )
+
+        self.assertEqual(self.walk(reverse("post-list")), expected)
+
+    def test_pages_are_stable_under_inserts(self):
+        """Test that posts created while paginating neither shift nor repeat rows."""
+        expected = list(
+            Post.objects.order_by("-modified", "-id").values_list("id", flat=True)
+        )
+
+        ids = self.walk(
+            reverse("post-list"),
+            on_page=lambda: PostFactory(user=self.user, category=self.category),
+        )
+
+        self.assertEqual(ids, expected)
+
+    def test_comments_are_ordered_oldest_first(self):
+        """Test that comments are paginated on (created, id)."""
+        post = self.posts[0]
+        comments = [
+            Comment.objects.create(post=post, user=self.user, content=str(index))
+            for index in range(5)
+        ]
+
+        ids = self.walk(reverse("comment-list", args=[post.id]))
+
+        self.assertEqual(ids, [comment.id for comment in comments])
+
+    def test_notifications_are_ordered_by_id(self):
+        """Test that notifications are paginated newest first."""
+        notifications = NotificationFactory.create_batch(5, user=self.user)
+
+        ids = self.walk(reverse("notification-list"))
+
+        self.assertEqual(ids, [notification.id for notification in notifications][::-1])
+
+    def test_no_count_query(self):
+        """Test that keyset pages don't count the rows of the table."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("post-list"), {"pagination": "keyset"})
+
+        self.assertNotIn("count", response.data)
+        self.assertFalse(
+            any("COUNT(" in query["sql"].upper() for query in queries.captured_queries)
+        )
+
+    def test_page_numbers_are_kept_by_default(self):
+        """Test that clients not asking for cursors keep the page number format."""
+        response = self.client.get(reverse("post-list"))
+
+        self.assertEqual(response.data["count"], 5)
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        response = self.client.get(reverse("post-list"), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
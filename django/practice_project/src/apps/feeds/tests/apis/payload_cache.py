@@ -0,0 +1,131 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Comment, Like
+from utils.compression import IDENTITY, compress, decompress
+from utils.metrics import get_metrics, reset_metrics
+
+METRIC_NAME = "cache:CommentViewSet.list"
+
+
+@override_settings(
+    CACHE_RESPONSE_COMPRESSION="zlib", CACHE_RESPONSE_COMPRESS_MIN_BYTES=0
+)
+class PayloadCacheTest(APITestCase):
+    """Test cases for the compact payloads cached by PayloadCacheResponseMixin."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.post = PostFactory(user=self.user, category=CategoryFactory())
+        Comment.objects.bulk_create(
+            Comment(post=self.post, user=self.user, content=f"Comment {index}")
+            for index in range(20)
+        )
+
+        self.list_url = reverse("comment-list", args=[self.post.id])
+        self.client.force_authenticate(user=self.user)
+        reset_metrics(METRIC_NAME)
+        reset_metrics(f"{METRIC_NAME}:payload")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_hit_is_served_from_payload_with_etag(self):
+        """Test that a hit returns the rendered content and ETag of the miss."""
+        first = self.client.get(self.list_url)
+        second = self.client.get(self.list_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(get_metrics(METRIC_NAME), {"miss": 1, "hit": 1})
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test that a request with the current ETag gets an empty 304."""
+        etag = self.client.get(self.list_url)["ETag"]
+
+        response = self.client.get(self.list_url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_payload_is_compressed_and_measured(self):
+        """Test that the stored payload is smaller than the rendered content."""
+        response = self.client.get(self.list_url)
+        payload_metrics = get_metrics(f"{METRIC_NAME}:payload")
+
+        self.assertEqual(payload_metrics["stored"], 1)
+        self.assertEqual(payload_metrics["rendered_bytes"], len(response.content))
+        self.assertLess(payload_metrics["stored_bytes"], len(response.content))
+        self.assertIn("miss_seconds", payload_metrics)
+
+    def test_post_etag_depends_on_viewer(self):
+        """Test that the ETag of a post changes with the state of the viewer."""
+        url = reverse("post-detail", args=[self.post.id])
+        before = self.client.get(url)
+
+        Like.objects.create(post=self.post, user=self.user)
+        after = self.client.get(url)
+
+        self.assertTrue(after.json()["liked_by_me"])
+        self.assertNotEqual(after["ETag"], before["ETag"])
+
+        response = self.client.get(url, headers={"If-None-Match": after["ETag"]})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_post_hit_is_not_rendered_again(self):
+        """Test that the viewer state is added to a cached post without rendering it."""
+        url = reverse("post-detail", args=[self.post.id])
+        Like.objects.create(post=self.post, user=self.user)
+        self.client.get(url)
+        reset_metrics("cache:PostViewSet.retrieve:payload")
+
+        with mock.patch.object(JSONRenderer, "render") as render:
+            response = self.client.get(url)
+
+        render.assert_not_called()
+        self.assertTrue(response.json()["liked_by_me"])
+
+        payload_metrics = get_metrics("cache:PostViewSet.retrieve:payload")
+        self.assertEqual(payload_metrics["viewer_states"], 1)
+        self.assertIn("viewer_state_seconds", payload_metrics)
+
+
+class CompressionTest(SimpleTestCase):
+    """Test cases for the codecs of the cached payloads."""
+
+    content = b'{"results": [' + b'{"content": "Comment"},' * 100 + b"{}]}"
+
+    @override_settings(
+        CACHE_RESPONSE_COMPRESSION="zlib", CACHE_RESPONSE_COMPRESS_MIN_BYTES=0
+    )
+    def test_round_trip(self):
+        """Test that a compressed payload decompresses to the original content."""
+        codec, payload = compress(self.content)
+
+        self.assertEqual(codec, "zlib")
+        self.assertLess(len(payload), len(self.content))
+        self.assertEqual(decompress(codec, payload), self.content)
+
+    @override_settings(
+        CACHE_RESPONSE_COMPRESSION="zlib", CACHE_RESPONSE_COMPRESS_MIN_BYTES=10_000
+    )
+    def test_small_payload_is_kept_as_is(self):
+        """Test that payloads under the minimum size are not compressed."""
+        self.assertEqual(compress(self.content), (IDENTITY, self.content))
+
+    @override_settings(
+        CACHE_RESPONSE_COMPRESSION="unknown", CACHE_RESPONSE_COMPRESS_MIN_BYTES=0
+    )
+    def test_unavailable_codec_is_ignored(self):
+        """Test that a codec that isn't installed stores the payload as-is."""
+        with self.assertLogs("utils.compression", "WARNING"):
+            self.assertEqual(compress(self.content), (IDENTITY, self.content))
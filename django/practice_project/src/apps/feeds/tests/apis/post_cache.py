@@ -0,0 +1,154 @@
+import json
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Like
+from utils.cache import get_tag_version_key, get_tag_versions, invalidate_tags
+from utils.cache_backends import LocalLRUCache
+from utils.cache_keys import build_namespace_from_resources
+from utils.metrics import get_metrics, reset_metrics
+
+METRIC_NAME = "cache:PostViewSet.list"
+
+
+class PostListCacheTest(APITestCase):
+    """Test cases for the stale-while-revalidate cache of PostViewSet.list."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.category = CategoryFactory()
+        self.post = PostFactory(user=self.user, category=self.category)
+
+        self.list_url = reverse("post-list")
+        self.lock_key = (
+            f"swr:{build_namespace_from_resources([{'posts': None}], {})}:lock"
+        )
+
+        self.client.force_authenticate(user=self.user)
+        reset_metrics(METRIC_NAME)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_repeated_list_is_served_from_cache(self):
+        """Test that the second identical request is a cache hit."""
+        first = self.client.get(self.list_url)
+        second = self.client.get(self.list_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(get_metrics(METRIC_NAME), {"miss": 1, "hit": 1})
+
+    def test_invalidated_list_is_served_stale_while_locked(self):
+        """Test that the stale response is served while another worker recomputes it."""
+        first = self.client.get(self.list_url)
+        # Liked by someone else, the state of the viewer is never served stale
+        Like.objects.create(post=self.post, user=UserFactory())
+
+        lock = cache.lock(self.lock_key, timeout=10)
+        self.assertTrue(lock.acquire(blocking=False))
+
+        try:
+            stale = self.client.get(self.list_url)
+        finally:
+            lock.release()
+
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+        self.assertEqual(stale.content, first.content)
+        self.assertEqual(get_metrics(METRIC_NAME), {"miss": 1, "stale": 1})
+
+    def test_invalidated_list_is_recomputed_once_unlocked(self):
+        """Test that a new post shows up once the stale entry has been recomputed."""
+        self.client.get(self.list_url)
+        PostFactory(user=self.user, category=self.category)
+
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(get_metrics(METRIC_NAME), {"miss": 2})
+
+
+class TwoTierCacheTest(SimpleTestCase):
+    """Test cases for the in-process tier of the default cache backend."""
+
+    def setUp(self):
+        self.local_cache = cache.local_cache
+        reset_metrics(cache._metric_name)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_repeated_get_is_served_from_local_tier(self):
+        """Test that only the first read of a hot key goes to Redis."""
+        cache.set("posts:1", {"title": "Hello"})
+
+        self.assertEqual(cache.get("posts:1"), {"title": "Hello"})
+        self.assertEqual(cache.get("posts:1"), {"title": "Hello"})
+
+        stats = cache.get_tier_stats()
+        self.assertEqual(stats["local"]["hit"], 1)
+        self.assertEqual(stats["local"]["miss"], 1)
+        self.assertEqual(stats["redis"]["hit"], 1)
+
+    def test_write_drops_local_copy(self):
+        """Test that a write or delete is not hidden by the local copy."""
+        cache.set("posts:1", "old")
+        cache.get("posts:1")
+
+        cache.set("posts:1", "new")
+        self.assertEqual(cache.get("posts:1"), "new")
+
+        cache.delete("posts:1")
+        self.assertIsNone(cache.get("posts:1"))
+
+    def test_invalidation_from_another_worker(self):
+        """Test that a message on the invalidation channel drops the local copy."""
+        cache.set("posts:1", "value")
+        cache.get("posts:1")
+        made_key = cache.make_key("posts:1")
+
+        cache.client.get_client().publish(cache._channel, json.dumps([made_key]))
+
+        deadline = time.monotonic() + 2
+        while self.local_cache.get(made_key) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertIsNone(self.local_cache.get(made_key))
+
+    def test_other_keys_bypass_local_tier(self):
+        """Test that keys outside the configured prefixes are not kept locally."""
+        cache.set("users:1", "value")
+
+        self.assertEqual(cache.get("users:1"), "value")
+        self.assertIsNone(self.local_cache.get(cache.make_key("users:1")))
+
+    def test_tag_versions_bypass_local_tier(self):
+        """Test that an invalidation is seen by the next read of every worker."""
+        invalidate_tags("posts")
+        get_tag_versions(["posts"])
+
+        self.assertIsNone(
+            self.local_cache.get(cache.make_key(get_tag_version_key("posts")))
+        )
+
+    def test_local_tier_is_bounded(self):
+        """Test that the least recently used entries are evicted first."""
+        local_cache = LocalLRUCache(max_entries=5, timeout=30)
+
+        for index in range(10):
+            local_cache.set(f"key:{index}", "x" * 200, local_cache.epoch)
+
+            # Keep the first entry in use
+            local_cache.get("key:0")
+
+        self.assertEqual(len(local_cache.entries), 5)
+        self.assertIsNotNone(local_cache.get("key:0"))
+        self.assertIsNone(local_cache.get("key:1"))
+        self.assertIsNotNone(local_cache.get("key:9"))
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds.documents import PostDocument
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Post
+
+
+class FakeSearch:
+    """Stand-in for an Elasticsearch search over a fixed list of post IDs."""
+
+    def __init__(self, ids, requests=None):
+        self.ids = ids
+        self.requests = [] if requests is None else requests
+        self.params = {}
+
+    def _clone(self, **params):
+        clone = FakeSearch(self.ids, self.requests)
+        clone.params = {**self.params, **params}
+        return clone
+
+    def query(self, *args, **kwargs):
+        return self._clone()
+
+    def sort(self, *args, **kwargs):
+        return self._clone()
+
+    def filter(self, *args, **kwargs):
+        return self._clone()
+
+    def extra(self, **params):
+        return self._clone(**params)
+
+    def source(self, fields):
+        return self._clone(_source=fields)
+
+    def count(self):
+        return len(self.ids)
+
+    def execute(self):
+        self.requests.append(self.params)
+        start, size = self.params.get("from_", 0), self.params.get("size", 10)
+
+        return [
+            SimpleNamespace(meta=SimpleNamespace(id=str(pk)))
+            for pk in self.ids[start : start + size]
+        ]
+
+
+class PostSearchTest(APITestCase):
+    """Test cases for PostViewSet.list backed by Elasticsearch."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.category = CategoryFactory()
+        self.posts = PostFactory.create_batch(5, user=self.user, category=self.category)
+
+        self.list_url = reverse("post-list")
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def search(self, ids, params):
+        """Run a list request whose search matches `ids` in that order."""
+        fake_search = FakeSearch(ids)
+
+        with mock.patch.object(PostDocument, "search", return_value=fake_search):
+            response = self.client.get(self.list_url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, fake_search.requests
+
+    def test_page_is_hydrated_in_search_order(self):
+        """Test that hits are returned as posts, in the order of the search."""
+        ids = [post.id for post in reversed(self.posts)]
+
+        response, _ = self.search(ids, {"order_by": "likes_count"})
+
+        self.assertEqual(response.json()["count"], 5)
+        self.assertEqual([post["id"] for post in response.json()["results"]], ids)
+        self.assertEqual(response.json()["results"][0]["author"], self.user.username)
+
+    def test_only_requested_page_is_fetched(self):
+        """Test that pagination is pushed down to Elasticsearch, without sources."""
+        ids = [post.id for post in self.posts]
+
+        response, requests = self.search(
+            ids, {"search": "title", "page": 2, "page_size": 2}
+        )
+
+        self.assertEqual([post["id"] for post in response.json()["results"]], ids[2:4])
+        self.assertEqual(requests, [{"from_": 2, "size": 2, "_source": False}])
+
+    def test_deleted_posts_are_skipped(self):
+        """Test that hits of soft-deleted posts are not returned."""
+        Post.objects.filter(id=self.posts[0].id).update(deleted_at=timezone.now())
+
+        response, _ = self.search([post.id for post in self.posts], {"search": "t"})
+
+        self.assertNotIn(
+            self.posts[0].id, [post["id"] for post in response.json()["results"]]
+        )
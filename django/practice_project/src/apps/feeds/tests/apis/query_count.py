@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds.factories import (
+    CategoryFactory,
+    NotificationFactory,
+    PostFactory,
+    UserFactory,
+)
+from apps.feeds.models import Comment, Like
+
+# Page sizes compared by the regression tests, the larger one must not cost more queries
+SMALL_PAGE, LARGE_PAGE = 2, 10
+
+
+class FeedsQueryCountTest(APITestCase):
+    """Regression tests ensuring the query count of a page doesn't grow with its size."""
+
+    def setUp(self):
+        self.user = UserFactory(username="reader", is_staff=True)
+        self.category = CategoryFactory(name="news")
+        self.post = PostFactory(user=self.user, category=self.category)
+
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def count_queries(self, url, params=None):
+        """Return the number of queries run by an uncached GET request."""
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def assertListQueriesConstant(self, url, create):
+        """Assert that a full page of LARGE_PAGE rows costs as much as one of SMALL_PAGE."""
+        create(SMALL_PAGE)
+        small = self.count_queries(url, {"page_size": SMALL_PAGE})
+
+        create(LARGE_PAGE - SMALL_PAGE)
+        large = self.count_queries(url, {"page_size": LARGE_PAGE})
+
+        self.assertEqual(small, large)
+
+    def create_commenters(self, count):
+        """Create users, each liking and commenting on the post."""
+        for index in range(count):
+            user = UserFactory(username=f"commenter{Comment.objects.count()}_{index}")
+            Comment.objects.create(post=self.post, user=user, content="Nice")
+            Like.objects.create(post=self.post, user=user)
+
+    def test_post_list(self):
+        """Test that listing posts doesn't query each author or statistics."""
+
+        def create(count):
+            for index in range(count):
+                author = UserFactory(username=f"author{self.post.id}_{index}_{count}")
+                PostFactory(user=author, category=CategoryFactory(name=f"c{author.id}"))
+
+        self.assertListQueriesConstant(reverse("post-list"), create)
+
+    def test_post_detail(self):
+        """Test that retrieving a post doesn't depend on its likes and comments."""
+        url = reverse("post-detail", args=[self.post.id])
+
+        before = self.count_queries(url)
+        self.create_commenters(LARGE_PAGE)
+
+        self.assertEqual(self.count_queries(url), before)
+
+    def test_comment_list(self):
+        """Test that listing comments doesn't query each comment author."""
+        self.assertListQueriesConstant(
+            reverse("comment-list", args=[self.post.id]), self.create_commenters
+        )
+
+    def test_comment_detail(self):
+        """Test that retrieving a comment costs a fixed number of queries."""
+        self.create_commenters(1)
+        comment = Comment.objects.get()
+
+        with self.assertNumQueries(1):
+            self.client.get(reverse("comment-detail", args=[self.post.id, comment.id]))
+
+    def test_category_list(self):
+        """Test that listing categories costs a fixed number of queries."""
+
+        def create(count):
+            for index in range(count):
+                CategoryFactory(name=f"category{index}_{count}")
+
+        self.assertListQueriesConstant(reverse("category-list"), create)
+
+    def test_category_detail(self):
+        """Test that retrieving a category doesn't depend on its posts."""
+        url = reverse("category-detail", args=[self.category.id])
+
+        before = self.count_queries(url)
+        PostFactory.create_batch(LARGE_PAGE, user=self.user, category=self.category)
+
+        self.assertEqual(self.count_queries(url), before)
+
+    def test_notification_list(self):
+        """Test that listing notifications costs a fixed number of queries."""
+
+        def create(count):
+            NotificationFactory.create_batch(count, user=self.user)
+
+        self.assertListQueriesConstant(reverse("notification-list"), create)
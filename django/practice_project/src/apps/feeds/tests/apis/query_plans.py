@@ -0,0 +1,151 @@
+import json
+from unittest import skipUnless
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Comment
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def iter_plan_nodes(node):
+    """Yield a node of an EXPLAIN (FORMAT JSON) plan and all of its children."""
+    yield node
+
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are checked on PostgreSQL")
+class ActiveIndexesTest(APITestCase):
+    """
+    Checks the plans of the hot list queries against the partial indexes of the
+    active rows.
+
+    The tables of the tests are tiny, sequential scans are disabled so that the
+    planner shows whether a matching index exists rather than what is cheapest.
+    """
+
+    def setUp(self):
+        self.user = UserFactory(username="reader", is_staff=True)
+        self.category = CategoryFactory(name="news")
+        self.post = PostFactory(user=self.user, category=self.category)
+        Comment.objects.create(post=self.post, user=self.user, content="First")
+
+        self.client.force_authenticate(user=self.user)
+
+    def get_list_query(self, url, table, params=None):
+        """Return the SQL of the ordered SELECT run on `table` by a GET request."""
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return next(
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and f'FROM "{table}"' in query["sql"]
+            and "ORDER BY" in query["sql"]
+        )
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return list(iter_plan_nodes(plan[0]["Plan"]))
+
+    def assertUsesIndex(self, sql, table, sorted_column, index_names=None):
+        """
+        Assert that a query reads `table` from an index, one of `index_names` if given,
+        and doesn't sort the rows on `sorted_column` in memory.
+        """
+        nodes = self.explain(sql)
+
+        used_indexes = [
+            node["Index Name"]
+            for node in nodes
+            if node["Node Type"] in INDEX_SCANS and node.get("Relation Name") == table
+        ]
+        self.assertTrue(used_indexes, f"{table} isn't read from an index")
+
+        if index_names:
+            self.assertTrue(set(used_indexes) & set(index_names), used_indexes)
+
+        sort_keys = [
+            key
+            for node in nodes
+            if node["Node Type"] == "Sort"
+            for key in node["Sort Key"]
+        ]
+        self.assertFalse(
+            any(sorted_column in key for key in sort_keys),
+            f"Rows are sorted in memory on {sort_keys}",
+        )
+
+    def test_post_list(self):
+        """Test that the posts feed reads the active posts index in order."""
+        sql = self.get_list_query(
+            reverse("post-list"), "feeds_post", {"pagination": "keyset"}
+        )
+
+        self.assertUsesIndex(
+            sql, "feeds_post", "modified", ["feeds_post_active_modified_idx"]
+        )
+
+    def test_post_list_after_cursor(self):
+        """Test that a page after a cursor seeks the active posts index to it."""
+        PostFactory(user=self.user, category=self.category)
+        response = self.client.get(
+            reverse("post-list"), {"pagination": "keyset", "page_size": 1}
+        )
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+
+        sql = self.get_list_query(
+            reverse("post-list"), "feeds_post", {"cursor": cursor, "page_size": 1}
+        )
+
+        self.assertUsesIndex(
+            sql, "feeds_post", "modified", ["feeds_post_active_modified_idx"]
+        )
+        self.assertTrue(
+            any(
+                "modified" in node.get("Index Cond", "")
+                for node in self.explain(sql)
+                if node.get("Relation Name") == "feeds_post"
+            ),
+            "The index isn't searched from the cursor",
+        )
+
+    def test_comment_list(self):
+        """Test that the comments of a post are read from the active comments index."""
+        sql = self.get_list_query(
+            reverse("comment-list", args=[self.post.id]),
+            "feeds_comment",
+            {"pagination": "keyset"},
+        )
+
+        self.assertUsesIndex(
+            sql, "feeds_comment", "created", ["feeds_comment_active_post_idx"]
+        )
+
+    def test_category_list(self):
+        """Test that the category list is read in order from an index on the name."""
+        sql = self.get_list_query(reverse("category-list"), "feeds_category")
+
+        # The unique constraint on the name can serve the query as well
+        self.assertUsesIndex(sql, "feeds_category", "name")
@@ -0,0 +1,116 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Comment, Like, Post
+
+
+class PostViewerStateTest(APITestCase):
+    """Test cases for the `liked_by_me` and `commented_by_me` fields of posts."""
+
+    def setUp(self):
+        self.viewer = UserFactory(username="viewer")
+        self.other = UserFactory(username="other")
+        self.category = CategoryFactory(name="news")
+
+        # The timelines are written once the posts and interactions are committed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.liked = PostFactory(user=self.other, category=self.category)
+            self.commented = PostFactory(user=self.other, category=self.category)
+            self.untouched = PostFactory(user=self.other, category=self.category)
+
+            Like.objects.create(post=self.liked, user=self.viewer)
+            Comment.objects.create(post=self.commented, user=self.viewer, content="Hi")
+
+    def tearDown(self):
+        # Also drops the timelines and the pending counters kept in Redis
+        cache.clear()
+
+    def get_states(self, user, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("post-list"), params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {
+            post["id"]: (post["liked_by_me"], post["commented_by_me"])
+            for post in response.json()["results"]
+        }
+
+    def test_list_state_of_viewer(self):
+        """Test that the list tells which posts the viewer liked or commented."""
+        states = self.get_states(self.viewer)
+
+        self.assertEqual(states[self.liked.id], (True, False))
+        self.assertEqual(states[self.commented.id], (False, True))
+        self.assertEqual(states[self.untouched.id], (False, False))
+
+    def test_cached_list_not_shared_between_viewers(self):
+        """Test that a cached page doesn't carry the state of the user who filled it."""
+        self.get_states(self.viewer)
+        states = self.get_states(self.other)
+
+        self.assertEqual(set(states.values()), {(False, False)})
+
+        # Still right when served from the cache
+        self.assertEqual(self.get_states(self.viewer)[self.liked.id], (True, False))
+
+    def test_retrieve_state_of_viewer(self):
+        """Test that a retrieved post tells whether the viewer liked it."""
+        url = reverse("post-detail", args=[self.liked.id])
+
+        for user, expected in ((self.viewer, True), (self.other, False)):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()["liked_by_me"], expected)
+
+    def test_state_spliced_around_lookalike_content(self):
+        """Test that titles looking like the rendered state or IDs are left intact."""
+        title = '{"id":1,"liked_by_me":false,"commented_by_me":false'
+        Post.objects.filter(id=self.liked.id).update(title=title, content=title)
+
+        self.client.force_authenticate(user=self.viewer)
+        response = self.client.get(reverse("post-detail", args=[self.liked.id]))
+
+        self.assertEqual(response.json()["title"], title)
+        self.assertEqual(response.json()["content"], title)
+        self.assertTrue(response.json()["liked_by_me"])
+
+    def test_home_feed_state_of_viewer(self):
+        """Test that the home feed tells which posts the viewer liked or commented."""
+        states = self.get_states(self.viewer, feed="home")
+
+        self.assertEqual(states[self.liked.id], (True, False))
+        self.assertEqual(states[self.commented.id], (False, True))
+
+    def test_constant_queries_in_page_size(self):
+        """Benchmark: the viewer state costs the same queries for 2 or 20 posts."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(20):
+                post = PostFactory(user=self.other, category=self.category)
+                Like.objects.create(post=post, user=self.viewer)
+                Comment.objects.create(post=post, user=self.viewer, content=str(index))
+
+        self.client.force_authenticate(user=self.viewer)
+
+        for params in ({}, {"feed": "home"}):
+            counts = []
+
+            for page_size in (2, 20):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(
+                        reverse("post-list"), {"page_size": page_size, **params}
+                    )
+
+                self.assertEqual(len(response.json()["results"]), page_size)
+                self.assertTrue(
+                    all(post["liked_by_me"] for post in response.json()["results"])
+                )
+                counts.append(len(queries))
+
+            self.assertEqual(counts[0], counts[1], params)
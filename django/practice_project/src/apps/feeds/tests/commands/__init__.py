@@ -0,0 +1,3 @@
+from .seed_mock_data import SeedMockDataTest
+from .benchmark_api import BenchmarkApiTest, CompareBenchmarksTest
+from .reindex_posts import ReindexPostsTest
@@ -0,0 +1,81 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from benchmarks.compare import compare
+
+
+class BenchmarkApiTest(TestCase):
+    """Test cases for the benchmark_api command."""
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_writes_metrics_of_each_endpoint(self):
+        """Test that every endpoint of the traffic is measured in the JSON results."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "results.json"
+            call_command(
+                "benchmark_api",
+                users=5,
+                posts=20,
+                requests=60,
+                warmup=0,
+                endpoints=["posts", "search", "post", "like", "comment"],
+                label="test",
+                output=str(output),
+                stdout=StringIO(),
+            )
+            results = json.loads(output.read_text())
+
+        self.assertEqual(results["meta"]["label"], "test")
+        self.assertEqual(results["meta"]["elasticsearch"], "stub")
+        self.assertEqual(results["total"]["requests"], 60)
+        self.assertEqual(results["total"]["errors"], 0)
+        self.assertEqual(
+            set(results["endpoints"]), {"posts", "search", "post", "like", "comment"}
+        )
+
+        for metrics in results["endpoints"].values():
+            self.assertLessEqual(metrics["p50_ms"], metrics["p95_ms"])
+            self.assertLessEqual(metrics["p95_ms"], metrics["p99_ms"])
+            self.assertGreater(metrics["queries_per_request"], 0)
+
+        # The rate of an endpoint is over its own share of the run
+        busy_seconds = sum(
+            metrics["requests"] / metrics["rps"]
+            for metrics in results["endpoints"].values()
+        )
+        self.assertLessEqual(busy_seconds, results["meta"]["seconds"] * 1.01)
+
+
+class CompareBenchmarksTest(SimpleTestCase):
+    """Test cases for the comparison of two benchmark results."""
+
+    def results(self, rps, p99_ms, queries):
+        metrics = {
+            "rps": rps,
+            "p50_ms": 10,
+            "p95_ms": 20,
+            "p99_ms": p99_ms,
+            "queries_per_request": queries,
+        }
+        return {"endpoints": {"posts": metrics}}
+
+    def test_regressions_depend_on_direction(self):
+        """Test that lower RPS and higher latencies or queries are regressions."""
+        rows = compare(self.results(100, 30, 2), self.results(80, 40, 2), threshold=10)
+        regressed = {metric for _, metric, *_, regression in rows if regression}
+
+        self.assertEqual(regressed, {"rps", "p99_ms"})
+
+    def test_improvements_are_not_regressions(self):
+        """Test that changes in the good direction are never reported."""
+        rows = compare(self.results(100, 30, 4), self.results(200, 15, 2), threshold=10)
+
+        self.assertFalse(any(row[-1] for row in rows))
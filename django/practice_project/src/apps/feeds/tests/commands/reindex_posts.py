@@ -0,0 +1,117 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.feeds import indexer
+from apps.feeds.documents import PostDocument
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.management.commands import reindex_posts
+
+# Patched in the tests loading posts
+create_index = reindex_posts.Command.create_index
+
+
+@override_settings(ELASTICSEARCH_DSL_AUTOSYNC=True)
+class ReindexPostsTest(TestCase):
+    """Test cases for the reindex_posts command."""
+
+    def setUp(self):
+        self.client = mock.patch.object(
+            reindex_posts.connections, "get_connection"
+        ).start()()
+        self.client.indices.exists_alias.return_value = True
+        self.client.indices.get_alias.return_value = {"posts-old": {}}
+
+        mock.patch.object(
+            reindex_posts.Command, "create_index", return_value="posts-new"
+        ).start()
+        self.load = mock.patch.object(
+            reindex_posts.Command, "load", return_value=0
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+        self.post = PostFactory(user=UserFactory(), category=CategoryFactory())
+        self.redis = indexer.get_redis_connection("default")
+
+    def tearDown(self):
+        self.redis.delete(
+            indexer.PENDING_KEY,
+            indexer.REINDEX_TARGET_KEY,
+            reindex_posts.CHECKPOINT_KEY,
+        )
+
+    def reindex(self, **options):
+        call_command("reindex_posts", stdout=StringIO(), **options)
+
+    def test_alias_is_swapped_atomically(self):
+        """Test that the alias searched by the document moves to the new index."""
+        (alias,) = PostDocument.search()._index
+
+        self.reindex()
+
+        self.client.indices.update_aliases.assert_called_once_with(
+            actions=[
+                {"add": {"index": "posts-new", "alias": alias}},
+                {"remove": {"index": "posts-old", "alias": alias}},
+            ]
+        )
+        self.client.indices.delete.assert_called_once_with(index="posts-old")
+        self.assertIsNone(indexer.get_reindex_target())
+        self.assertFalse(self.redis.exists(reindex_posts.CHECKPOINT_KEY))
+
+    def test_live_updates_are_written_to_both_indices(self):
+        """Test that posts indexed during the load are written to the new index too."""
+        bulk = mock.patch.object(indexer.helpers, "bulk", return_value=(2, [])).start()
+        self.load.side_effect = lambda *args: indexer.index_posts([self.post])
+
+        self.reindex()
+
+        indices = [action["_index"] for action in bulk.call_args.args[1]]
+        self.assertEqual(indices, ["posts", "posts-new"])
+
+    def test_new_index_is_a_copy_of_the_searched_index(self):
+        """Test that the new index has the mappings of the document's index."""
+        command = reindex_posts.Command(stdout=StringIO())
+        command.alias = reindex_posts.INDEX._name
+
+        with mock.patch.object(
+            type(reindex_posts.INDEX), "create", autospec=True
+        ) as create:
+            index_name = create_index(command)
+
+        (index,) = create.call_args.args
+        self.assertEqual(index._name, index_name)
+        self.assertTrue(index_name.startswith(f"{PostDocument._index._name}-"))
+        self.assertEqual(
+            index.to_dict()["mappings"], PostDocument._index.to_dict()["mappings"]
+        )
+        self.assertEqual(index.to_dict()["settings"]["refresh_interval"], "-1")
+
+    def test_chunks_never_overwrite_live_updates(self):
+        """Test that the bulk-loaded documents are only created."""
+        actions = reindex_posts.build_actions(self.post.pk, self.post.pk, "posts-new")
+
+        self.assertEqual(len(actions), 1)
+        self.assertEqual(actions[0]["_op_type"], "create")
+        self.assertEqual(actions[0]["_index"], "posts-new")
+
+    def test_failed_run_stops_the_dual_write(self):
+        """Test that a crash clears the target, and that the reindex can be aborted."""
+        self.load.side_effect = ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            self.reindex()
+
+        self.assertIsNone(indexer.get_reindex_target())
+        self.assertTrue(
+            self.redis.hexists(reindex_posts.CHECKPOINT_KEY, "interrupted_at")
+        )
+
+        self.reindex(abort=True)
+
+        self.client.indices.delete.assert_called_once_with(
+            index="posts-new", ignore_unavailable=True
+        )
+        self.assertFalse(self.redis.exists(reindex_posts.CHECKPOINT_KEY))
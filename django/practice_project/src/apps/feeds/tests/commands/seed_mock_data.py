@@ -0,0 +1,76 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.test import TestCase
+
+from apps.feeds import hashtags
+from apps.feeds.models import Comment, Like, Post, PostStatistics, User
+
+
+class SeedMockDataTest(TestCase):
+    """Test cases for the bulk seed_mock_data command."""
+
+    options = {"users": 10, "categories": 3, "posts": 30, "hashtags": 20}
+
+    def seed(self, **options):
+        call_command("seed_mock_data", stdout=StringIO(), **{**self.options, **options})
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_creates_consistent_rows(self):
+        """Test that the statistics and hashtags match the generated rows."""
+        self.seed(batch_size=7)
+
+        posts = Post.objects.filter(title__startswith="seed0 post")
+        self.assertEqual(posts.count(), 30)
+        self.assertEqual(User.objects.filter(username__startswith="seed0_").count(), 10)
+
+        for statistics in PostStatistics.objects.filter(post__in=posts):
+            self.assertEqual(
+                statistics.likes_count,
+                Like.objects.filter(post=statistics.post).count(),
+            )
+            self.assertEqual(
+                statistics.comments_count,
+                Comment.objects.filter(post=statistics.post).count(),
+            )
+
+        post = posts.first()
+        self.assertEqual(
+            sorted(post.hashtags.values_list("name", flat=True)),
+            sorted(hashtags.extract_hashtags(post.content)),
+        )
+        self.assertFalse(hashtags.has_content_changed(post))
+
+    def test_same_seed_generates_same_data(self):
+        """Test that the data only depends on the seed."""
+
+        def summarize():
+            return list(
+                Post.objects.filter(title__startswith="seed1 post")
+                .annotate(likes_total=Count("likes"))
+                .order_by("title")
+                .values_list("content", "user__username", "likes_total")
+            )
+
+        with transaction.atomic():
+            self.seed(seed=1)
+            expected = summarize()
+            transaction.set_rollback(True)
+
+        self.seed(seed=1)
+
+        self.assertEqual(len(expected), 30)
+        self.assertEqual(summarize(), expected)
+
+    def test_existing_seed_is_refused(self):
+        """Test that seeding twice with the same seed fails instead of colliding."""
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed()
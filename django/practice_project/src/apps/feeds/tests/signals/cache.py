@@ -0,0 +1,101 @@
+from django.core.cache import cache
+from django.urls import reverse
+from hypothesis import given, strategies as st
+from hypothesis.extra.django import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.feeds.models import Post, Comment, Like
+from apps.feeds.signals.cache import invalidate_cache
+from utils import default_cache_key_func, default_object_cache_key_func
+
+ids = st.integers(min_value=1, max_value=10**9)
+
+query_params = st.dictionaries(
+    keys=st.text(alphabet="abcdefghijklmnopqrstuvwxyz_", min_size=1, max_size=10),
+    values=st.lists(st.text(max_size=10), min_size=1, max_size=3),
+    max_size=4,
+)
+
+
+@st.composite
+def cached_urls(draw):
+    """Draw one of the cached URL shapes of the feeds API, with its path arguments."""
+    post_id = draw(ids)
+    comment_id = draw(ids)
+
+    return draw(
+        st.sampled_from(
+            [
+                ("post-list", {}),
+                ("post-detail", {"pk": post_id}),
+                ("comment-list", {"post_id": post_id}),
+                ("comment-detail", {"post_id": post_id, "pk": comment_id}),
+            ]
+        )
+    )
+
+
+def invalidating_events(url_name, url_kwargs):
+    """Return the (sender, instance) pairs whose save or delete must invalidate the URL."""
+    post_id = url_kwargs.get("post_id", url_kwargs.get("pk", 1))
+    comment_id = url_kwargs.get("pk", 1)
+
+    comment = Comment(id=comment_id, post_id=post_id)
+    post_events = [
+        (Post, Post(id=post_id)),
+        (Like, Like(post_id=post_id)),
+        (Comment, comment),
+    ]
+
+    match url_name:
+        case "post-list" | "post-detail":
+            return post_events
+        case "comment-list" | "comment-detail":
+            return [(Comment, comment)]
+
+
+class CacheInvalidationPropertyTest(SimpleTestCase):
+    """Every cached URL shape must be reachable by the invalidation signals."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def build_request(self, url_name, url_kwargs, params):
+        path = reverse(url_name, kwargs=url_kwargs)
+        return Request(self.factory.get(path, params))
+
+    def build_key(self, url_name, request):
+        if url_name.endswith("-list"):
+            return default_cache_key_func(None, None, request, (), {})
+
+        return default_object_cache_key_func(None, None, None, request, (), {})
+
+    @given(url=cached_urls(), params=query_params, event_index=st.integers(0, 2))
+    def test_cached_url_is_invalidated(self, url, params, event_index):
+        """Test that a cached response is never served after a related write."""
+        url_name, url_kwargs = url
+        events = invalidating_events(url_name, url_kwargs)
+        sender, instance = events[event_index % len(events)]
+
+        request = self.build_request(url_name, url_kwargs, params)
+        cache.set(self.build_key(url_name, request), "cached response")
+
+        invalidate_cache(sender=sender, instance=instance)
+
+        self.assertIsNone(cache.get(self.build_key(url_name, request)))
+
+    @given(url=cached_urls(), params=query_params, other_params=query_params)
+    def test_distinct_query_params_never_share_a_key(self, url, params, other_params):
+        """Test that two different query strings never map to the same cache key."""
+        url_name, url_kwargs = url
+
+        if not url_name.endswith("-list") or params == other_params:
+            return
+
+        key = self.build_key(url_name, self.build_request(url_name, url_kwargs, params))
+        other_key = self.build_key(
+            url_name, self.build_request(url_name, url_kwargs, other_params)
+        )
+
+        self.assertNotEqual(key, other_key)
@@ -0,0 +1,8 @@
+from .post_statistics import PostStatisticsTaskTest, PostStatisticsConcurrencyTest
+from .post_counters import PostCountersTest
+from .indexer import PostIndexerTest
+from .hashtags import HashtagExtractionTest
+from .notifications import NotificationBufferTest
+from .outbox import OutboxTest
+from .routes import TaskRoutesTest
+from .debounce import DebounceTest
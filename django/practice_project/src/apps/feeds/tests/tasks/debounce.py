@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.feeds import indexer, tasks
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from utils.debounce import debounce, get_debounce_key, release
+from utils.metrics import get_metrics, reset_metrics
+
+TASK = tasks.extract_and_associate_hashtags_task
+METRIC_NAME = f"debounce:{TASK.name}"
+
+
+class DebounceTest(TestCase):
+    """Test cases for the debouncing of repeated calls of the feeds tasks."""
+
+    def setUp(self):
+        self.post = PostFactory(user=UserFactory(), category=CategoryFactory())
+        reset_metrics(METRIC_NAME)
+
+    def tearDown(self):
+        release(TASK, self.post.id)
+
+    def test_burst_is_collapsed_into_one_run(self):
+        """Test that identical calls made while one is scheduled are collapsed."""
+        with mock.patch.object(TASK, "apply_async") as apply_async:
+            scheduled = [debounce(TASK, self.post.id, countdown=2) for _ in range(5)]
+
+        self.assertEqual(scheduled, [True, False, False, False, False])
+        apply_async.assert_called_once_with((self.post.id,), countdown=2)
+        self.assertEqual(get_metrics(METRIC_NAME), {"scheduled": 1, "collapsed": 4})
+
+    def test_call_during_run_schedules_again(self):
+        """Test that the task releases its key when it starts, so no call is lost."""
+        with mock.patch.object(TASK, "apply_async"):
+            debounce(TASK, self.post.id, countdown=0)
+
+        # The worker starts the task when due, a new call comes in while it runs
+        with mock.patch.object(
+            tasks.hashtags, "associate_pending_hashtags"
+        ) as associate_pending_hashtags:
+            TASK(self.post.id)
+
+        associate_pending_hashtags.assert_called_once()
+
+        with mock.patch.object(TASK, "apply_async") as apply_async:
+            self.assertTrue(debounce(TASK, self.post.id))
+
+        apply_async.assert_called_once()
+
+    def test_collapsed_call_postpones_the_run(self):
+        """Test that the run waits for the countdown of the last call of the burst."""
+        with mock.patch.object(TASK, "apply_async") as apply_async:
+            debounce(TASK, self.post.id, countdown=0)
+            self.assertFalse(debounce(TASK, self.post.id, countdown=30))
+
+            # The run scheduled by the first call starts too early
+            with mock.patch.object(
+                tasks.hashtags, "associate_pending_hashtags"
+            ) as associate_pending_hashtags:
+                TASK(self.post.id)
+
+        associate_pending_hashtags.assert_not_called()
+        self.assertEqual(apply_async.call_count, 2)
+        self.assertAlmostEqual(apply_async.call_args.kwargs["countdown"], 30, delta=1)
+        self.assertEqual(
+            get_metrics(METRIC_NAME), {"scheduled": 1, "collapsed": 1, "deferred": 1}
+        )
+
+    def test_failed_schedule_is_released(self):
+        """Test that a call the broker refused doesn't collapse the next ones."""
+        with mock.patch.object(TASK, "apply_async", side_effect=ConnectionError):
+            with self.assertRaises(ConnectionError):
+                debounce(TASK, self.post.id)
+
+        self.assertIsNone(
+            indexer.get_redis_connection("default").get(
+                get_debounce_key(TASK, [self.post.id])
+            )
+        )
+
+    @override_settings(ELASTICSEARCH_DSL_AUTOSYNC=True)
+    def test_repeated_index_syncs_are_collapsed(self):
+        """Test that a post queued for indexing again is counted as collapsed."""
+        reset_metrics(indexer.METRIC_NAME)
+
+        # Creating the post in setUp already queued it
+        indexer.get_redis_connection("default").delete(indexer.PENDING_KEY)
+
+        try:
+            for _ in range(3):
+                indexer.enqueue_posts([self.post.id])
+        finally:
+            indexer.get_redis_connection("default").delete(indexer.PENDING_KEY)
+
+        self.assertEqual(get_metrics(indexer.METRIC_NAME), {"collapsed": 2})
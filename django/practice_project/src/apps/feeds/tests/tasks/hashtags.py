@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django_redis import get_redis_connection
+
+from apps.feeds import hashtags, tasks
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Hashtag, Post
+from utils.debounce import release
+
+
+class HashtagExtractionTest(TestCase):
+    """Test cases for the batched extraction of the hashtags of posts."""
+
+    def setUp(self):
+        self.user = UserFactory(username="author")
+        self.category = CategoryFactory()
+        # Also publishes the tasks queued in the outbox by the post signal
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post = PostFactory(
+                user=self.user, category=self.category, content="#django #python"
+            )
+        # Runs the queued extraction now rather than once due, the factory links random
+        # hashtags after the post is saved
+        tasks.extract_and_associate_hashtags_task.apply((self.post.id,), throw=True)
+
+    def tearDown(self):
+        cache.delete(hashtags.get_content_hash_key(self.post.id))
+        get_redis_connection("default").delete(hashtags.PENDING_KEY)
+        release(tasks.extract_and_associate_hashtags_task, self.post.id)
+
+    def get_names(self):
+        return set(self.post.hashtags.values_list("name", flat=True))
+
+    def set_content(self, content):
+        Post.objects.filter(id=self.post.id).update(content=content)
+
+    def test_extract_hashtags_dedupes(self):
+        """Test that each hashtag is extracted once, in order of first appearance."""
+        self.assertEqual(
+            hashtags.extract_hashtags("#b #a some text #b #c_1 #a"),
+            ["b", "a", "c_1"],
+        )
+        self.assertEqual(hashtags.extract_hashtags(""), [])
+
+    def test_hashtags_associated(self):
+        """Test that the hashtags found in the content are associated with the post."""
+        self.assertEqual(self.get_names(), {"django", "python"})
+
+    def test_constant_query_count(self):
+        """Test that the number of queries doesn't depend on the number of tags."""
+        # Post, current links, then the links removed are loaded and deleted
+        self.set_content("no tags")
+        with self.assertNumQueries(4):
+            hashtags.associate_hashtags(self.post.id)
+
+        # Post, hashtags upserted then loaded, current links, new links
+        self.set_content(" ".join(f"#tag{index}" for index in range(200)))
+        with self.assertNumQueries(5):
+            hashtags.associate_hashtags(self.post.id)
+
+        self.assertEqual(self.post.hashtags.count(), 200)
+        self.assertEqual(Hashtag.objects.filter(name__startswith="tag").count(), 200)
+
+    def test_only_changed_links_written(self):
+        """Test that stale links are removed and existing hashtags reused."""
+        django_id = Hashtag.objects.get(name="django").id
+        self.set_content("#django #celery")
+
+        hashtags.associate_hashtags(self.post.id)
+
+        self.assertEqual(self.get_names(), {"django", "celery"})
+        self.assertEqual(Hashtag.objects.get(name="django").id, django_id)
+        self.assertTrue(Hashtag.objects.filter(name="python").exists())
+
+    def test_unchanged_content_skips_task(self):
+        """Test that saves not changing the content don't queue the extraction."""
+        with mock.patch.object(
+            tasks.extract_and_associate_hashtags_task, "apply_async"
+        ) as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.post.title = "New title"
+                self.post.save()
+                self.post.save(update_fields=["title"])
+
+            apply_async.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.post.content = "#django"
+                self.post.save()
+
+            apply_async.assert_called_once_with(
+                (self.post.id,), countdown=mock.ANY, producer=mock.ANY
+            )
+
+    def test_pending_posts_extracted_in_one_batch(self):
+        """Test that a task extracts the posts waiting with its own in one batch."""
+        posts = Post.objects.bulk_create(
+            Post(
+                title=f"Batched {index}",
+                content=f"#batch{index} #shared",
+                user=self.user,
+                category=self.category,
+            )
+            for index in range(3)
+        )
+        get_redis_connection("default").delete(hashtags.PENDING_KEY)
+        hashtags.enqueue_posts([post.id for post in posts])
+
+        # Posts, hashtags upserted then loaded, current links, new links
+        with self.assertNumQueries(5):
+            self.assertEqual(hashtags.associate_pending_hashtags(posts[0].id), 3)
+
+        for index, post in enumerate(posts):
+            self.assertEqual(
+                set(post.hashtags.values_list("name", flat=True)),
+                {f"batch{index}", "shared"},
+            )
+
+        # The other tasks find their post already extracted
+        with self.assertNumQueries(1):
+            self.assertEqual(hashtags.associate_pending_hashtags(posts[1].id), 0)
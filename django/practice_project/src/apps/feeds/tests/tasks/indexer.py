@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.feeds import indexer, tasks
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import PostStatistics
+from utils.metrics import get_metrics, reset_metrics
+
+
+def fake_bulk(client, actions, **kwargs):
+    """Stand-in for `helpers.bulk` acknowledging every action."""
+    return len(list(actions)), []
+
+
+@override_settings(ELASTICSEARCH_DSL_AUTOSYNC=True)
+class PostIndexerTest(TestCase):
+    """Test cases for the batching Elasticsearch indexer of posts."""
+
+    def setUp(self):
+        self.bulk = mock.patch.object(
+            indexer.helpers, "bulk", side_effect=fake_bulk
+        ).start()
+        mock.patch.object(indexer.connections, "get_connection").start()
+        self.addCleanup(mock.patch.stopall)
+
+        self.user = UserFactory()
+        self.category = CategoryFactory()
+        self.posts = PostFactory.create_batch(3, user=self.user, category=self.category)
+
+        reset_metrics(indexer.METRIC_NAME)
+
+    def tearDown(self):
+        indexer.get_redis_connection("default").delete(indexer.PENDING_KEY)
+
+    def get_pending_ids(self):
+        connection = indexer.get_redis_connection("default")
+        return sorted(
+            int(post_id) for post_id in connection.zrange(indexer.PENDING_KEY, 0, -1)
+        )
+
+    def test_saves_are_queued_once(self):
+        """Test that saving posts and statistics queues each post once, without indexing."""
+        for statistics in PostStatistics.objects.all():
+            statistics.save()
+
+        self.assertEqual(self.get_pending_ids(), sorted(post.id for post in self.posts))
+        self.bulk.assert_not_called()
+
+    def test_drain_indexes_in_one_bulk_request(self):
+        """Test that queued posts are indexed with one bulk request per batch."""
+        indexed = indexer.drain_pending_posts()
+
+        self.assertEqual(indexed, 3)
+        self.assertEqual(self.bulk.call_count, 1)
+        self.assertEqual(self.get_pending_ids(), [])
+
+        metrics = get_metrics(indexer.METRIC_NAME)
+        self.assertEqual(metrics["docs"], 3)
+        self.assertEqual(metrics["batches"], 1)
+
+    def test_failed_batch_is_queued_again(self):
+        """Test that posts of a failed bulk request are indexed by the next drain."""
+        self.bulk.side_effect = ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            indexer.drain_pending_posts()
+
+        self.assertEqual(self.get_pending_ids(), sorted(post.id for post in self.posts))
+
+    @override_settings(ELASTICSEARCH_INDEX_BATCH_SIZE=5)
+    def test_full_batch_is_drained_right_away(self):
+        """Test that a full batch doesn't wait for the periodic drain."""
+        with mock.patch.object(indexer, "debounce") as debounce:
+            PostFactory.create_batch(1, user=self.user, category=self.category)
+            debounce.assert_not_called()
+
+            PostFactory.create_batch(1, user=self.user, category=self.category)
+            debounce.assert_called_with(tasks.index_pending_posts_task, countdown=0)
+
+        tasks.index_pending_posts_task()
+
+        self.assertEqual(self.bulk.call_count, 1)
+        self.assertEqual(get_metrics(indexer.METRIC_NAME)["docs"], 5)
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from apps.feeds import counters, notifications, tasks
+from apps.feeds.factories import (
+    CategoryFactory,
+    NotificationFactory,
+    PostFactory,
+    UserFactory,
+)
+from apps.feeds.models import Comment, Like, Notification
+
+
+@override_settings(NOTIFICATIONS_COALESCE_WINDOW=0)
+class NotificationBufferTest(TestCase):
+    """Test cases for the buffered and coalesced notifications."""
+
+    def setUp(self):
+        self.author = UserFactory(username="author")
+        self.category = CategoryFactory()
+        self.post = PostFactory(user=self.author, category=self.category, title="Hello")
+
+    def tearDown(self):
+        counters.release_claimed_counters(list(counters.claim_pending_counters(1000)))
+
+        connection = get_redis_connection("default")
+        connection.delete(
+            notifications.DUE_KEY,
+            notifications.get_unread_key(self.author.id),
+            *connection.scan_iter(match=f"{notifications.PENDING_KEY_PREFIX}:*"),
+        )
+
+    def like(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(count):
+                Like.objects.create(
+                    post=self.post, user=UserFactory(username=f"fan{index}")
+                )
+
+    def get_messages(self):
+        return list(
+            Notification.objects.filter(user=self.author)
+            .order_by("id")
+            .values_list("message", flat=True)
+        )
+
+    def test_events_are_buffered(self):
+        """Test that likes don't write notifications until the flush."""
+        self.like(3)
+
+        self.assertEqual(self.get_messages(), [])
+
+    def test_flush_coalesces_events(self):
+        """Test that events of the same kind about a post become one notification."""
+        self.like(37)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.post, user=UserFactory(), content="Nice")
+
+        # A single bulk INSERT writes every due group
+        with self.assertNumQueries(1):
+            tasks.flush_notifications_task()
+
+        self.assertCountEqual(
+            self.get_messages(),
+            [
+                "Your post titled 'Hello' got 37 likes.",
+                "Your post titled 'Hello' has a new comment.",
+            ],
+        )
+        self.assertEqual(notifications.get_unread_count(self.author.id), 2)
+
+        # Nothing is left to flush
+        tasks.flush_notifications_task()
+        self.assertEqual(len(self.get_messages()), 2)
+
+    def test_self_like_not_notified(self):
+        """Test that authors aren't notified of their own likes."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.post, user=self.author)
+
+        tasks.flush_notifications_task()
+
+        self.assertEqual(self.get_messages(), [])
+
+    @override_settings(NOTIFICATIONS_COALESCE_WINDOW=60)
+    def test_window_not_over(self):
+        """Test that groups are kept until their coalescing window is over."""
+        self.like(2)
+
+        tasks.flush_notifications_task()
+
+        self.assertEqual(self.get_messages(), [])
+
+    def test_unread_count_follows_deliveries_and_reads(self):
+        """Test that the cached unread count is updated without counting rows."""
+        self.assertEqual(notifications.get_unread_count(self.author.id), 0)
+
+        self.like(2)
+        tasks.flush_notifications_task()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.get_unread_count(self.author.id), 1)
+
+        notifications.mark_read(self.author.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.get_unread_count(self.author.id), 0)
+
+    def test_prune_deletes_old_notifications(self):
+        """Test that notifications older than the cutoff are deleted in batches."""
+        NotificationFactory.create_batch(5, user=self.author)
+        recent = NotificationFactory(user=self.author)
+        Notification.objects.exclude(id=recent.id).update(
+            created=timezone.now() - timedelta(days=100)
+        )
+        self.assertEqual(notifications.get_unread_count(self.author.id), 6)
+
+        with override_settings(NOTIFICATIONS_PRUNE_BATCH_SIZE=2):
+            tasks.prune_notifications_task()
+
+        self.assertQuerySetEqual(
+            Notification.objects.filter(user=self.author), [recent]
+        )
+        self.assertEqual(notifications.get_unread_count(self.author.id), 1)
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.feeds import outbox, tasks
+from apps.feeds.models import OutboxEvent
+from utils.metrics import get_metrics, reset_metrics
+
+
+class OutboxTest(TestCase):
+    """Test cases for the transactional outbox of the tasks queued by signals."""
+
+    def setUp(self):
+        reset_metrics(outbox.METRIC_NAME)
+
+        patcher = mock.patch.object(tasks.fan_out_post_task, "apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_events_are_published_after_commit(self):
+        """Test that events are only sent once their transaction commits, together."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            outbox.publish(tasks.fan_out_post_task, 1, 2, 3.0)
+            outbox.publish(tasks.fan_out_post_task, 4, 5, 6.0)
+
+            self.apply_async.assert_not_called()
+            self.assertEqual(OutboxEvent.objects.count(), 2)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(
+            self.apply_async.call_args_list,
+            [
+                mock.call([1, 2, 3.0], producer=mock.ANY),
+                mock.call([4, 5, 6.0], producer=mock.ANY),
+            ],
+        )
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(get_metrics(outbox.METRIC_NAME), {"published": 2})
+
+    def test_rolled_back_events_are_not_published(self):
+        """Test that events of a rolled back transaction are never sent."""
+        with self.captureOnCommitCallbacks(execute=True):
+            outbox.publish(tasks.fan_out_post_task, 1, 2, 3.0)
+            OutboxEvent.objects.all().delete()  # As if rolled back
+            outbox.publish(tasks.fan_out_post_task, 4, 5, 6.0)
+
+        self.apply_async.assert_called_once_with([4, 5, 6.0], producer=mock.ANY)
+
+    def test_relay_publishes_events_left_behind(self):
+        """Test that the relay only publishes the events older than the delay."""
+        OutboxEvent.objects.bulk_create(
+            OutboxEvent(task=tasks.fan_out_post_task.name, args=[post_id, 1, 0.0])
+            for post_id in range(3)
+        )
+        OutboxEvent.objects.filter(args__0__lt=2).update(
+            created=timezone.now() - timedelta(hours=1)
+        )
+
+        with self.settings(OUTBOX_RELAY_BATCH_SIZE=1):
+            tasks.relay_outbox_task()
+
+        self.assertEqual(self.apply_async.call_count, 2)
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("args", flat=True)), [[2, 1, 0.0]]
+        )
+        self.assertEqual(
+            get_metrics(outbox.METRIC_NAME), {"published": 2, "relayed": 2}
+        )
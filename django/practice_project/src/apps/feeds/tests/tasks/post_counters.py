@@ -0,0 +1,159 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from apps.feeds import counters, tasks
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import Comment, Like, Post, PostStatistics
+
+
+class PostCountersTest(TestCase):
+    """Test cases for the like and comment counters buffered in Redis."""
+
+    def setUp(self):
+        self.user = UserFactory(username="author")
+        self.category = CategoryFactory()
+        self.post = PostFactory(user=self.user, category=self.category)
+
+    def tearDown(self):
+        counters.release_claimed_counters(list(counters.claim_pending_counters(1000)))
+
+    def get_post(self):
+        return Post.objects.select_related("statistics").get(id=self.post.id)
+
+    def like(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(count):
+                Like.objects.create(
+                    post=self.post, user=UserFactory(username=f"fan{index}")
+                )
+
+    def test_likes_are_buffered(self):
+        """Test that likes are counted in real time without updating the database."""
+        self.like(3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.post, user=self.user, content="Thanks")
+
+        statistics = PostStatistics.objects.get(post=self.post)
+        self.assertEqual(statistics.likes_count, 0)
+        self.assertEqual(statistics.comments_count, 0)
+
+        post = self.get_post()
+        self.assertEqual(post.likes_count, 3)
+        self.assertEqual(post.comments_count, 1)
+
+    def test_rolled_back_likes_are_not_buffered(self):
+        """Test that the deltas are only buffered once the like is committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Like.objects.create(post=self.post, user=UserFactory())
+                raise RuntimeError
+
+        self.assertEqual(
+            counters.get_pending_counters([self.post.id]), {self.post.id: {}}
+        )
+
+    def test_flush_applies_pending_deltas(self):
+        """Test that the flush saves the deltas and clears the buffer."""
+        self.like(3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.filter(post=self.post).first().delete()
+
+        tasks.flush_post_counters_task()
+
+        statistics = PostStatistics.objects.get(post=self.post)
+        self.assertEqual(statistics.likes_count, 2)
+        self.assertEqual(
+            counters.get_pending_counters([self.post.id]), {self.post.id: {}}
+        )
+        self.assertEqual(self.get_post().likes_count, 2)
+
+    def test_flush_clamps_at_zero(self):
+        """Test that flushed counters never go below zero."""
+        counters.incr_post_counter(self.post.id, "likes_count", -5)
+
+        tasks.flush_post_counters_task()
+
+        self.assertEqual(PostStatistics.objects.get(post=self.post).likes_count, 0)
+
+    def test_failed_flush_keeps_deltas(self):
+        """Test that deltas are buffered again when the database update fails."""
+        self.like(2)
+
+        with mock.patch.object(
+            tasks, "apply_post_statistics_deltas", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                tasks.flush_post_counters_task.apply(throw=True)
+
+        self.assertEqual(self.get_post().likes_count, 2)
+
+        tasks.flush_post_counters_task()
+        self.assertEqual(PostStatistics.objects.get(post=self.post).likes_count, 2)
+
+    def test_claimed_deltas_are_counted_until_saved(self):
+        """Test that reads still count the deltas a flush is applying."""
+        self.like(2)
+        apply_post_statistics_deltas = tasks.apply_post_statistics_deltas
+
+        def apply_deltas(deltas):
+            # The deltas are claimed but not yet saved
+            self.assertEqual(self.get_post().likes_count, 2)
+            apply_post_statistics_deltas(deltas)
+
+        with mock.patch.object(
+            tasks, "apply_post_statistics_deltas", side_effect=apply_deltas
+        ):
+            tasks.flush_post_counters_task()
+
+        self.assertEqual(self.get_post().likes_count, 2)
+        self.assertEqual(
+            counters.get_pending_counters([self.post.id]), {self.post.id: {}}
+        )
+
+    def test_overlapping_flushes_claim_deltas_once(self):
+        """Test that a flush doesn't claim the deltas another flush is applying."""
+        self.like(2)
+        first = counters.claim_pending_counters(1000)
+
+        # Liked again while the first flush runs, a second flush starts
+        counters.incr_post_counter(self.post.id, "likes_count", 1)
+        second = counters.claim_pending_counters(1000)
+
+        self.assertEqual(first, {self.post.id: {"likes_count": 2}})
+        self.assertEqual(second, {})
+        self.assertEqual(self.get_post().likes_count, 3)
+
+        counters.release_claimed_counters(list(first))
+        third = counters.claim_pending_counters(1000)
+        counters.release_claimed_counters(list(third))
+
+        self.assertEqual(third, {self.post.id: {"likes_count": 1}})
+
+    @override_settings(POST_COUNTERS_CLAIM_TIMEOUT=0)
+    def test_claims_of_a_dead_flush_are_taken_over(self):
+        """Test that deltas claimed by a flush that died are flushed again."""
+        self.like(2)
+        counters.claim_pending_counters(1000)
+
+        tasks.flush_post_counters_task()
+
+        self.assertEqual(PostStatistics.objects.get(post=self.post).likes_count, 2)
+        self.assertEqual(self.get_post().likes_count, 2)
+
+    def test_list_loads_pending_counters_at_once(self):
+        """Test that pending deltas of a page are read in one Redis round trip."""
+        posts = [self.post, PostFactory(user=self.user, category=self.category)]
+        self.like(2)
+
+        with mock.patch.object(
+            counters, "get_pending_counters", wraps=counters.get_pending_counters
+        ) as get_pending_counters:
+            counters.attach_pending_counters(posts)
+            likes = [post.likes_count for post in posts]
+
+        self.assertEqual(get_pending_counters.call_count, 1)
+        self.assertEqual(likes, [2, 0])
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+
+from apps.feeds import tasks
+from apps.feeds.factories import CategoryFactory, PostFactory, UserFactory
+from apps.feeds.models import PostStatistics
+
+# Number of tasks run concurrently by the stress test
+CONCURRENT_TASKS = 50
+
+
+class PostStatisticsTaskTest(TestCase):
+    """Test cases for the bulk updates of the counters of PostStatistics."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.category = CategoryFactory()
+        self.post = PostFactory(user=self.user, category=self.category)
+
+    def get_statistics(self):
+        return PostStatistics.objects.get(post=self.post)
+
+    def test_increment_and_decrement(self):
+        """Test that each delta updates its own counter."""
+        tasks.apply_post_statistics_deltas({self.post.id: {"likes_count": 2}})
+        tasks.apply_post_statistics_deltas(
+            {self.post.id: {"likes_count": -1, "comments_count": 1}}
+        )
+
+        statistics = self.get_statistics()
+        self.assertEqual(statistics.likes_count, 1)
+        self.assertEqual(statistics.comments_count, 1)
+
+    def test_counters_are_clamped_at_zero(self):
+        """Test that a decrement of a zero counter leaves it at zero."""
+        tasks.apply_post_statistics_deltas(
+            {self.post.id: {"likes_count": -1, "comments_count": -1}}
+        )
+
+        statistics = self.get_statistics()
+        self.assertEqual(statistics.likes_count, 0)
+        self.assertEqual(statistics.comments_count, 0)
+
+    def test_single_update_statement(self):
+        """Test that a counter update doesn't read the statistics first."""
+        with CaptureQueriesContext(connection) as queries:
+            tasks.apply_post_statistics_deltas({self.post.id: {"likes_count": 1}})
+
+        statements = [query["sql"].split()[0].upper() for query in queries]
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertNotIn("SELECT", statements)
+
+
+class PostStatisticsConcurrencyTest(TransactionTestCase):
+    """Stress test applying counter deltas from many workers at once."""
+
+    def setUp(self):
+        self.post = PostFactory(user=UserFactory(), category=CategoryFactory())
+
+    def run_concurrently(self, delta, count):
+        def run(_):
+            try:
+                tasks.apply_post_statistics_deltas({self.post.id: delta})
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(run, range(count)))
+
+    @skipUnlessDBFeature("test_db_allows_multiple_connections")
+    def test_concurrent_updates_are_not_lost(self):
+        """Test that concurrent increments and decrements give exact counts."""
+        self.run_concurrently({"likes_count": 1}, CONCURRENT_TASKS)
+        self.run_concurrently({"comments_count": 1}, CONCURRENT_TASKS)
+        self.run_concurrently({"comments_count": -1}, CONCURRENT_TASKS // 2)
+
+        statistics = PostStatistics.objects.get(post=self.post)
+        self.assertEqual(statistics.likes_count, CONCURRENT_TASKS)
+        self.assertEqual(statistics.comments_count, CONCURRENT_TASKS // 2)
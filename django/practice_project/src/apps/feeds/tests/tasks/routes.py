@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from apps.feeds import tasks
+from config.celery import app
+
+
+class TaskRoutesTest(SimpleTestCase):
+    """Test cases for the routing of the feeds tasks to their queues."""
+
+    def get_queue(self, task):
+        return app.amqp.router.route({}, task.name)["queue"].name
+
+    def test_hot_path_tasks_routed_to_realtime(self):
+        """Test that the cheap tasks of likes, comments and the outbox don't wait."""
+        for task in (
+            tasks.flush_post_counters_task,
+            tasks.flush_notifications_task,
+            tasks.relay_outbox_task,
+        ):
+            self.assertEqual(self.get_queue(task), "realtime")
+
+    def test_slow_tasks_routed_to_bulk(self):
+        """Test that hashtag extraction and indexing get their own workers."""
+        for task in (
+            tasks.extract_and_associate_hashtags_task,
+            tasks.index_pending_posts_task,
+            tasks.prune_notifications_task,
+        ):
+            self.assertEqual(self.get_queue(task), "bulk")
+
+    def test_routes_name_existing_tasks(self):
+        """Test that every route is for a registered task, not a removed one."""
+        for name in settings.CELERY_TASK_ROUTES:
+            self.assertIn(name, app.tasks)
+
+    def test_other_tasks_routed_to_default(self):
+        """Test that tasks without a route use the default queue."""
+        self.assertEqual(self.get_queue(tasks.fan_out_post_task), "default")
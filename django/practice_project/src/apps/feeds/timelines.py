@@ -0,0 +1,235 @@
+"""
+Precomputed home timelines of posts, kept in Redis sorted sets.
+
+There are no follows between users, the audience of a category is made of the users
+who posted, liked or commented in it. Every post is added to the capped timeline of
+its category (and to the global one), then fanned out on write by
+`fan_out_post_task` to the home timeline of each user of the category's audience.
+
+Categories whose audience is larger than `TIMELINE_FANOUT_MAX_AUDIENCE` are not fanned
+out, their timeline is merged into the home timeline of the reader instead, and the
+merged result is cached for `TIMELINE_MERGED_TIMEOUT` seconds (fan-out on read).
+
+Redis isn't rolled back with the database, so the signals write the timelines once the
+transaction of the post, like or comment commits.
+
+Home timelines expire after `TIMELINE_HOME_TIMEOUT` seconds without being read and
+fan-out skips the missing ones, so inactive users cost nothing. A missing home
+timeline is rebuilt from the timelines of the user's categories on the next read.
+"""
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# Prefix of the Redis keys of the timelines
+TIMELINE_KEY_PREFIX = "timeline"
+
+# Timeline of every post, served to users without any category yet
+GLOBAL_KEY = f"{TIMELINE_KEY_PREFIX}:global"
+
+# Adds a post to a timeline that exists and keeps its most recent posts only
+ADD_IF_EXISTS_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    redis.call("zadd", KEYS[1], ARGV[1], ARGV[2])
+    redis.call("zremrangebyrank", KEYS[1], 0, -tonumber(ARGV[3]) - 1)
+end
+return nil
+"""
+
+
+def get_category_key(category_id):
+    """Return the Redis key of the timeline of a category."""
+    return f"{TIMELINE_KEY_PREFIX}:category:{category_id}"
+
+
+def get_home_key(user_id):
+    """Return the Redis key of the home timeline of a user."""
+    return f"{TIMELINE_KEY_PREFIX}:home:{user_id}"
+
+
+def get_merged_key(user_id):
+    """Return the Redis key of the home timeline merged with the large categories."""
+    return f"{TIMELINE_KEY_PREFIX}:merged:{user_id}"
+
+
+def get_audience_key(category_id):
+    """Return the Redis key of the set of users following a category."""
+    return f"{TIMELINE_KEY_PREFIX}:audience:{category_id}"
+
+
+def get_interests_key(user_id):
+    """Return the Redis key of the set of categories followed by a user."""
+    return f"{TIMELINE_KEY_PREFIX}:interests:{user_id}"
+
+
+def _add(pipeline, key, post_id, score):
+    pipeline.zadd(key, {post_id: score})
+    pipeline.zremrangebyrank(key, 0, -settings.TIMELINE_MAX_LENGTH - 1)
+
+
+def add_interest(user_id, category_id):
+    """
+    Adds a user to the audience of a category.
+
+    The home timeline of a user joining an audience is dropped, it is rebuilt with
+    the posts of the category on the next read.
+    """
+    connection = get_redis_connection("default")
+
+    if connection.sadd(get_interests_key(user_id), category_id):
+        pipeline = connection.pipeline(transaction=False)
+        pipeline.sadd(get_audience_key(category_id), user_id)
+        pipeline.delete(get_home_key(user_id), get_merged_key(user_id))
+        pipeline.execute()
+
+
+def add_post(post):
+    """Adds a new post to the timelines of its category and the global one."""
+    score = post.created.timestamp()
+
+    pipeline = get_redis_connection("default").pipeline(transaction=False)
+    _add(pipeline, get_category_key(post.category_id), post.id, score)
+    _add(pipeline, GLOBAL_KEY, post.id, score)
+    pipeline.execute()
+
+
+def fan_out_post(post_id, category_id, score):
+    """
+    Adds a post to the existing home timelines of the audience of its category.
+
+    Categories with a large audience are skipped, they are merged on read.
+
+    Returns:
+        int: Number of users of the audience, 0 when the post isn't fanned out.
+    """
+    connection = get_redis_connection("default")
+    audience_key = get_audience_key(category_id)
+
+    if connection.scard(audience_key) > settings.TIMELINE_FANOUT_MAX_AUDIENCE:
+        return 0
+
+    add_if_exists = connection.register_script(ADD_IF_EXISTS_SCRIPT)
+    pipeline = connection.pipeline(transaction=False)
+    audience = 0
+
+    for user_id in connection.sscan_iter(audience_key, count=1000):
+        add_if_exists(
+            keys=[get_home_key(int(user_id))],
+            args=[score, post_id, settings.TIMELINE_MAX_LENGTH],
+            client=pipeline,
+        )
+        audience += 1
+
+        # Bound the size of each round trip
+        if audience % 1000 == 0:
+            pipeline.execute()
+
+    pipeline.execute()
+    return audience
+
+
+def _store_union(connection, key, sources, timeout):
+    """Store the most recent posts of several timelines under `key`."""
+    pipeline = connection.pipeline(transaction=True)
+    pipeline.zunionstore(key, sources, aggregate="MAX")
+    pipeline.zremrangebyrank(key, 0, -settings.TIMELINE_MAX_LENGTH - 1)
+    pipeline.expire(key, timeout)
+    pipeline.execute()
+
+
+def get_home_timeline_key(user_id):
+    """
+    Returns the key of the sorted set holding the home timeline of a user.
+
+    Builds the home timeline if it expired, and merges the timelines of the
+    categories that are too large to be fanned out.
+    """
+    connection = get_redis_connection("default")
+    category_ids = sorted(
+        int(category_id)
+        for category_id in connection.smembers(get_interests_key(user_id))
+    )
+
+    if not category_ids:
+        return GLOBAL_KEY
+
+    home_key = get_home_key(user_id)
+    category_keys = [get_category_key(category_id) for category_id in category_ids]
+
+    pipeline = connection.pipeline(transaction=False)
+    pipeline.expire(home_key, settings.TIMELINE_HOME_TIMEOUT)
+    for category_id in category_ids:
+        pipeline.scard(get_audience_key(category_id))
+    exists, *audiences = pipeline.execute()
+
+    if not exists:
+        _store_union(
+            connection, home_key, category_keys, settings.TIMELINE_HOME_TIMEOUT
+        )
+
+    large_keys = [
+        key
+        for key, audience in zip(category_keys, audiences)
+        if audience > settings.TIMELINE_FANOUT_MAX_AUDIENCE
+    ]
+
+    if not large_keys:
+        return home_key
+
+    merged_key = get_merged_key(user_id)
+
+    if not connection.exists(merged_key):
+        _store_union(
+            connection,
+            merged_key,
+            [home_key, *large_keys],
+            settings.TIMELINE_MERGED_TIMEOUT,
+        )
+
+    return merged_key
+
+
+class HydratedTimeline:
+    """
+    Lazy sequence of the posts of a timeline, newest first.
+
+    Meant to be handed to a paginator: only the IDs of the requested slice are read
+    from the sorted set, then their rows are loaded with a single `in_bulk` query on
+    `queryset` and returned in the timeline order. Posts missing from `queryset`
+    (e.g. soft-deleted) are skipped.
+    """
+
+    def __init__(self, key, queryset):
+        self.key = key
+        self.queryset = queryset
+        self.connection = get_redis_connection("default")
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.connection.zcard(self.key)
+
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index : index + 1][0]
+
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+
+        if stop <= start:
+            return []
+
+        ids = [int(pk) for pk in self.connection.zrevrange(self.key, start, stop - 1)]
+
+        rows = self.queryset.in_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]
+
+
+def get_home_timeline(user_id, queryset):
+    """Return the home timeline of a user, as posts of `queryset`."""
+    return HydratedTimeline(get_home_timeline_key(user_id), queryset)
@@ -5,6 +5,10 @@ from apps.feeds.apis import (
     CommentViewSet,
     LikeViewSet,
     NotificationViewSet,
+    AsyncPostListView,
+    AsyncPostDetailView,
+    AsyncCommentListView,
+    AsyncNotificationListView,
 )
 
 urlpatterns = [
@@ -12,7 +16,12 @@ urlpatterns = [
     path(
         "notifications/",
         NotificationViewSet.as_view({"get": "list"}),
-        name="notification-detail",
+        name="notification-list",
+    ),
+    path(
+        "notifications/read/",
+        NotificationViewSet.as_view({"post": "mark_read"}),
+        name="notification-read",
     ),
     # Category routes
     path(
@@ -59,6 +68,28 @@ urlpatterns = [
     path(
         "posts/<int:post_id>/like/",
         LikeViewSet.as_view({"post": "like_or_unlike"}),
-        name="like-detail",
+        name="like-post",
+    ),
+    path(
+        "posts/liked/",
+        LikeViewSet.as_view({"get": "liked"}),
+        name="like-liked",
+    ),
+    # Async read routes, served by the uvicorn workers (see scripts/start-asgi.sh)
+    path(
+        "async/notifications/",
+        AsyncNotificationListView.as_view(),
+        name="async-notification-list",
+    ),
+    path("async/posts/", AsyncPostListView.as_view(), name="async-post-list"),
+    path(
+        "async/posts/<int:pk>/",
+        AsyncPostDetailView.as_view(),
+        name="async-post-detail",
+    ),
+    path(
+        "async/posts/<int:post_id>/comments/",
+        AsyncCommentListView.as_view(),
+        name="async-comment-list",
     ),
 ]
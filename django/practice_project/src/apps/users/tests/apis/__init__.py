@@ -2,3 +2,4 @@
 # from .sign_up import SignUpViewTests
 # from .user_profile import UserProfileViewTests
 # from .user import UserViewSetTests
+from .query_count import UsersQueryCountTest
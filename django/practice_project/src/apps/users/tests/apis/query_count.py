@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.users.factories import UserFactory, UserProfileFactory
+
+# Page sizes compared by the regression tests, the larger one must not cost more queries
+SMALL_PAGE, LARGE_PAGE = 2, 10
+
+
+class UsersQueryCountTest(APITestCase):
+    """Regression tests ensuring the query count of a page doesn't grow with its size."""
+
+    def setUp(self):
+        self.admin_user = UserFactory(username="admin", is_staff=True)
+        self.profile = UserProfileFactory(user=self.admin_user)
+
+        self.client.force_authenticate(user=self.admin_user)
+
+    def count_queries(self, url, params=None):
+        """Return the number of queries run by a GET request."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def create_users(self, count):
+        for index in range(count):
+            UserProfileFactory(user=UserFactory(username=f"user{count}_{index}"))
+
+    def test_user_list(self):
+        """Test that listing users costs a fixed number of queries."""
+        url = reverse("user-list")
+
+        self.create_users(SMALL_PAGE)
+        small = self.count_queries(url, {"page_size": SMALL_PAGE})
+
+        self.create_users(LARGE_PAGE - SMALL_PAGE)
+        large = self.count_queries(url, {"page_size": LARGE_PAGE})
+
+        self.assertEqual(small, large)
+
+    def test_user_detail(self):
+        """Test that retrieving a user doesn't depend on the number of users."""
+        url = reverse("user-detail", args=[self.admin_user.id])
+
+        before = self.count_queries(url)
+        self.create_users(LARGE_PAGE)
+
+        self.assertEqual(self.count_queries(url), before)
+
+    def test_user_profile(self):
+        """Test that retrieving the current profile costs a fixed number of queries."""
+        url = reverse("user-profile")
+
+        before = self.count_queries(url)
+        self.create_users(LARGE_PAGE)
+
+        self.assertEqual(self.count_queries(url), before)
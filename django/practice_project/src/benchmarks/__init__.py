@@ -0,0 +1,12 @@
+"""
+Benchmarks of the API.
+
+`python manage.py benchmark_api` seeds a dataset with `seed_mock_data`, sends a mix
+of reads and writes to the API endpoints in-process and writes the requests per second,
+p50/p95/p99 latencies and queries per request of each endpoint to a JSON file.
+`python -m benchmarks.compare` diffs two of these files, e.g. of two commits.
+
+`benchmarks.settings` runs them without any service: SQLite (or the PostgreSQL of the
+`SQL_*` variables), fakeredis for the cache and eager Celery tasks. Elasticsearch is
+replaced by `benchmarks.elasticsearch.StubSearch`.
+"""
@@ -0,0 +1,97 @@
+"""
+Compare two results of `python manage.py benchmark_api`, e.g. of two commits.
+
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+
+Prints the change of every metric of every endpoint, marking the ones that got worse by
+more than `--threshold` percent. Exits with status 1 if any did with `--fail`, to be used
+as a check before a release.
+"""
+
+import argparse
+import json
+import sys
+
+# Compared metrics, and whether a higher value is better
+METRICS = {
+    "rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "queries_per_request": False,
+}
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(base, head, threshold):
+    """
+    Compare the endpoints of two results.
+
+    Args:
+        base: Results of the reference run.
+        head: Results of the run to check.
+        threshold: Change in percent from which a metric is reported as a regression.
+
+    Returns:
+        list: A (endpoint, metric, base value, head value, change in percent,
+            regressed) tuple for every metric of the endpoints found in both results.
+    """
+    rows = []
+
+    for endpoint, head_metrics in head["endpoints"].items():
+        base_metrics = base["endpoints"].get(endpoint)
+        if base_metrics is None:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            before, after = base_metrics[metric], head_metrics[metric]
+            if before:
+                change = (after - before) / before * 100
+            else:
+                change = 0.0 if not after else float("inf")
+
+            worse = -change if higher_is_better else change
+            rows.append((endpoint, metric, before, after, change, worse > threshold))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base", help="Results of the reference run")
+    parser.add_argument("head", help="Results of the run to check")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="Change in percent from which a metric is reported as a regression",
+    )
+    parser.add_argument(
+        "--fail", action="store_true", help="Exit with status 1 if a metric regressed"
+    )
+    args = parser.parse_args(argv)
+
+    base, head = load(args.base), load(args.head)
+    rows = compare(base, head, args.threshold)
+
+    print(f"base: {base['meta'].get('label')}  head: {head['meta'].get('label')}")
+    print(f"{'endpoint':<14} {'metric':<20} {'base':>10} {'head':>10} {'change':>9}")
+
+    for endpoint, metric, before, after, change, regressed in rows:
+        print(
+            f"{endpoint:<14} {metric:<20} {before:10.2f} {after:10.2f} "
+            f"{change:+8.1f}%" + ("  REGRESSION" if regressed else "")
+        )
+
+    regressions = sum(row[-1] for row in rows)
+    print(f"{regressions} regression(s) over {args.threshold:g}%")
+
+    return 1 if args.fail and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
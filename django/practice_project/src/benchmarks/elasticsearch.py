@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+# Models
+from apps.feeds.models import Post
+
+# Documents
+from apps.feeds.documents import PostDocument
+
+
+class StubSearch:
+    """
+    Stand-in for the Elasticsearch searches of `PostDocument`, answered by the database.
+
+    Supports what the post list uses: a `match` on the title, the ordering and
+    `from`/`size`. Other queries and filters are ignored. Hits are ordered by
+    modification time, whatever the requested ordering.
+    """
+
+    def __init__(self, queryset=None, params=None):
+        self.queryset = Post.objects.active() if queryset is None else queryset
+        self.params = params or {}
+
+    def _clone(self, queryset=None, **params):
+        return StubSearch(
+            self.queryset if queryset is None else queryset, {**self.params, **params}
+        )
+
+    def query(self, name=None, **fields):
+        if name == "match" and "title" in fields:
+            return self._clone(self.queryset.filter(title__icontains=fields["title"]))
+
+        return self._clone()
+
+    def sort(self, *args, **kwargs):
+        return self._clone()
+
+    def filter(self, *args, **kwargs):
+        return self._clone()
+
+    def extra(self, **params):
+        return self._clone(**params)
+
+    def source(self, fields):
+        return self._clone()
+
+    def count(self):
+        return self.queryset.count()
+
+    def execute(self):
+        start = self.params.get("from_", 0)
+        size = self.params.get("size", 10)
+        ids = self.queryset.order_by("-modified", "-id").values_list("id", flat=True)
+
+        return [
+            SimpleNamespace(meta=SimpleNamespace(id=str(pk)))
+            for pk in ids[start : start + size]
+        ]
+
+
+@contextmanager
+def stub_search():
+    """Answer the searches of `PostDocument` with `StubSearch` while in the block."""
+    with mock.patch.object(
+        PostDocument, "search", lambda *args, **kwargs: StubSearch()
+    ):
+        yield
@@ -0,0 +1,62 @@
+"""
+Settings of the benchmarks, runnable without Redis, Celery workers nor Elasticsearch.
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings python manage.py migrate
+    DJANGO_SETTINGS_MODULE=benchmarks.settings python manage.py benchmark_api
+
+The database is the SQLite file `BENCHMARK_SQLITE_PATH`, unless `SQL_ENGINE` is set to
+benchmark against PostgreSQL, e.g. the one of docker-compose.dev.yml.
+"""
+
+import os
+from pathlib import Path
+
+import fakeredis
+import fakeredis.aioredis
+
+from config.settings.base import *  # noqa: F403
+from config.settings.base import CACHES, REST_FRAMEWORK
+
+DEBUG = False
+
+ALLOWED_HOSTS = ["testserver", "localhost"]
+
+if "SQL_ENGINE" not in os.environ:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv(
+                "BENCHMARK_SQLITE_PATH",
+                str(Path(__file__).resolve().parent / "benchmark.sqlite3"),
+            ),
+            # Concurrent writers wait for the lock instead of failing
+            "OPTIONS": {"timeout": 30, "transaction_mode": "IMMEDIATE"},
+        }
+    }
+
+# Every thread of the benchmark shares the same in-memory Redis
+_redis_server = fakeredis.FakeServer()
+
+CACHES["default"]["OPTIONS"].update(
+    {
+        "CONNECTION_POOL_KWARGS": {
+            "connection_class": fakeredis.FakeConnection,
+            "server": _redis_server,
+        },
+        "ASYNC_CONNECTION_POOL_KWARGS": {
+            "connection_class": fakeredis.aioredis.FakeConnection,
+            "server": _redis_server,
+        },
+    }
+)
+
+# Tasks run in the request that queued them, their cost is part of its latency
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# Posts aren't indexed, searches are answered by `benchmarks.elasticsearch.StubSearch`
+ELASTICSEARCH_DSL_AUTOSYNC = False
+ELASTICSEARCH_DSL_AUTO_REFRESH = False
+
+# The benchmark sends far more requests than a user is allowed to
+REST_FRAMEWORK = {**REST_FRAMEWORK, "DEFAULT_THROTTLE_CLASSES": []}
@@ -138,13 +138,83 @@ CELERY_BROKER_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_BROKER_DB}"
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Queues of the tasks, each consumed by its own workers with their own concurrency and
+# prefetch (see scripts/start-celery.sh), so that slow batches never delay hot tasks:
+# - realtime: cheap tasks on the path of likes, comments, notifications and the outbox.
+# - default: timeline fan-outs and tasks not routed below.
+# - bulk: slow batches, hashtag extraction, Elasticsearch indexing and pruning.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "apps.feeds.tasks.flush_post_counters_task": {"queue": "realtime"},
+    "apps.feeds.tasks.flush_notifications_task": {"queue": "realtime"},
+    "apps.feeds.tasks.relay_outbox_task": {"queue": "realtime"},
+    "apps.feeds.tasks.extract_and_associate_hashtags_task": {"queue": "bulk"},
+    "apps.feeds.tasks.index_pending_posts_task": {"queue": "bulk"},
+    "apps.feeds.tasks.prune_notifications_task": {"queue": "bulk"},
+}
+
+# Seconds a debounced task waits for a burst of identical calls to settle, and seconds
+# after which a scheduled call that never ran can be scheduled again (see utils.debounce)
+TASK_DEBOUNCE_COUNTDOWN = float(os.getenv("TASK_DEBOUNCE_COUNTDOWN", 1))
+TASK_DEBOUNCE_TIMEOUT = int(os.getenv("TASK_DEBOUNCE_TIMEOUT", 60))
+
+# Seconds between two flushes of the like/comment counters buffered in Redis
+POST_COUNTERS_FLUSH_INTERVAL = float(os.getenv("POST_COUNTERS_FLUSH_INTERVAL", 5))
+
+# Number of posts whose counters are saved by each bulk UPDATE
+POST_COUNTERS_FLUSH_BATCH_SIZE = int(os.getenv("POST_COUNTERS_FLUSH_BATCH_SIZE", 1000))
+
+# Seconds after which the counters claimed by a flush that didn't finish are flushed again
+POST_COUNTERS_CLAIM_TIMEOUT = int(os.getenv("POST_COUNTERS_CLAIM_TIMEOUT", 300))
+
+# Seconds during which notifications of the same kind about the same post are merged
+NOTIFICATIONS_COALESCE_WINDOW = float(os.getenv("NOTIFICATIONS_COALESCE_WINDOW", 60))
+
+# Seconds between two flushes of the notifications buffered in Redis
+NOTIFICATIONS_FLUSH_INTERVAL = float(os.getenv("NOTIFICATIONS_FLUSH_INTERVAL", 5))
+
+# Number of notifications written by each bulk INSERT
+NOTIFICATIONS_FLUSH_BATCH_SIZE = int(os.getenv("NOTIFICATIONS_FLUSH_BATCH_SIZE", 1000))
+
+# Seconds the unread count of a user is cached, it is kept up to date meanwhile
+NOTIFICATIONS_UNREAD_COUNT_TIMEOUT = int(
+    os.getenv("NOTIFICATIONS_UNREAD_COUNT_TIMEOUT", 60 * 60)
+)
+
+# Days notifications are kept, older ones are deleted by the periodic prune
+NOTIFICATIONS_RETENTION_DAYS = int(os.getenv("NOTIFICATIONS_RETENTION_DAYS", 90))
+
+# Seconds between two prunes, and number of notifications deleted at once
+NOTIFICATIONS_PRUNE_INTERVAL = float(os.getenv("NOTIFICATIONS_PRUNE_INTERVAL", 60 * 60))
+NOTIFICATIONS_PRUNE_BATCH_SIZE = int(os.getenv("NOTIFICATIONS_PRUNE_BATCH_SIZE", 5000))
+
+# Number of most recent posts kept in each timeline of `apps.feeds.timelines`
+TIMELINE_MAX_LENGTH = int(os.getenv("TIMELINE_MAX_LENGTH", 800))
+
+# Categories followed by more users are merged into home timelines on read
+TIMELINE_FANOUT_MAX_AUDIENCE = int(os.getenv("TIMELINE_FANOUT_MAX_AUDIENCE", 10000))
+
+# Seconds a home timeline is kept without being read
+TIMELINE_HOME_TIMEOUT = int(os.getenv("TIMELINE_HOME_TIMEOUT", 7 * 24 * 60 * 60))
+
+# Seconds a home timeline merged with the large categories is cached
+TIMELINE_MERGED_TIMEOUT = int(os.getenv("TIMELINE_MERGED_TIMEOUT", 30))
+
+# Number of posts whose hashtags are extracted together by one task
+HASHTAGS_BATCH_SIZE = int(os.getenv("HASHTAGS_BATCH_SIZE", 200))
+
 # Cache Configuration
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "utils.cache_backends.TwoTierRedisCache",
         "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_CACHE_DB}",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # In-process tier in front of Redis for the hottest keys
+            "LOCAL_CACHE_MAX_ENTRIES": int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", 1000)),
+            "LOCAL_CACHE_TIMEOUT": int(os.getenv("LOCAL_CACHE_TIMEOUT", 30)),
+            # Not the tag versions: an invalidation must be seen by the next request
+            "LOCAL_CACHE_KEY_PREFIXES": ["swr:posts", "posts:"],
         },
     }
 }
@@ -162,10 +232,73 @@ ELASTICSEARCH_INDEX_NAMES = {
     "apps.feeds.documents.post": "publisher",
 }
 
+# Saved posts are indexed in bulk by `apps.feeds.indexer` instead of one request per save
+ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = "apps.feeds.indexer.BatchedSignalProcessor"
+
+# Seconds between two drains of the posts waiting to be indexed
+ELASTICSEARCH_INDEX_INTERVAL = float(os.getenv("ELASTICSEARCH_INDEX_INTERVAL", 0.5))
+
+# Number of posts indexed by each bulk request, a full batch is drained right away
+ELASTICSEARCH_INDEX_BATCH_SIZE = int(os.getenv("ELASTICSEARCH_INDEX_BATCH_SIZE", 500))
+
+# Retries of the bulk requests rejected because Elasticsearch is overloaded
+ELASTICSEARCH_INDEX_MAX_RETRIES = int(os.getenv("ELASTICSEARCH_INDEX_MAX_RETRIES", 5))
+
+# Seconds between two runs of the relay publishing the outbox events left behind
+OUTBOX_RELAY_INTERVAL = float(os.getenv("OUTBOX_RELAY_INTERVAL", 30))
+
+# Age in seconds after which an outbox event is considered left behind by its transaction
+OUTBOX_RELAY_DELAY = int(os.getenv("OUTBOX_RELAY_DELAY", 60))
+
+# Number of outbox events published by each batch of the relay
+OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", 500))
+
+# Periodic tasks run by Celery beat
+CELERY_BEAT_SCHEDULE = {
+    "flush-post-counters": {
+        "task": "apps.feeds.tasks.flush_post_counters_task",
+        "schedule": POST_COUNTERS_FLUSH_INTERVAL,
+    },
+    "flush-notifications": {
+        "task": "apps.feeds.tasks.flush_notifications_task",
+        "schedule": NOTIFICATIONS_FLUSH_INTERVAL,
+    },
+    "prune-notifications": {
+        "task": "apps.feeds.tasks.prune_notifications_task",
+        "schedule": NOTIFICATIONS_PRUNE_INTERVAL,
+    },
+    "index-pending-posts": {
+        "task": "apps.feeds.tasks.index_pending_posts_task",
+        "schedule": ELASTICSEARCH_INDEX_INTERVAL,
+    },
+    "relay-outbox": {
+        "task": "apps.feeds.tasks.relay_outbox_task",
+        "schedule": OUTBOX_RELAY_INTERVAL,
+    },
+}
+
 REST_FRAMEWORK_EXTENSIONS = {
-    # Cache timeout in seconds (5 minutes)
-    "DEFAULT_CACHE_RESPONSE_TIMEOUT": 60 * 5,
+    # Cache timeout in seconds (5 minutes by default). Cached responses are invalidated
+    # on write by `apps.feeds.signals.cache`, so this can safely be raised.
+    "DEFAULT_CACHE_RESPONSE_TIMEOUT": int(os.getenv("CACHE_RESPONSE_TIMEOUT", 60 * 5)),
     "DEFAULT_CACHE_KEY_FUNC": "utils.default_cache_key_func",
     "DEFAULT_LIST_CACHE_KEY_FUNC": "utils.default_list_cache_key_func",
     "DEFAULT_OBJECT_CACHE_KEY_FUNC": "utils.default_object_cache_key_func",
 }
+
+# Seconds a stale cached response may still be served while one worker recomputes it
+CACHE_RESPONSE_STALE_TIMEOUT = int(os.getenv("CACHE_RESPONSE_STALE_TIMEOUT", 60))
+
+# Lease of the lock held by the worker recomputing a cached response
+CACHE_RESPONSE_LOCK_TIMEOUT = int(os.getenv("CACHE_RESPONSE_LOCK_TIMEOUT", 10))
+
+# Codec of the cached responses: "zstd", "lz4" (if installed), "zlib" or "" for none
+CACHE_RESPONSE_COMPRESSION = os.getenv("CACHE_RESPONSE_COMPRESSION", "zstd")
+
+# Cached responses smaller than this are stored uncompressed
+CACHE_RESPONSE_COMPRESS_MIN_BYTES = int(
+    os.getenv("CACHE_RESPONSE_COMPRESS_MIN_BYTES", 1024)
+)
+
+# Seconds the metrics recorded by a worker are buffered before being sent to Redis
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 1))
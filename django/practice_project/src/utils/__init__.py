@@ -1,7 +1,18 @@
-from .pagination import StandardPagination
+from .pagination import StandardPagination, KeysetPagination, KeysetPaginationMixin
 from .schema import extend_schema, extend_schema_view, OpenApiParameter
 from .cache import (
     default_cache_key_func,
     default_list_cache_key_func,
     default_object_cache_key_func,
+    invalidate_tags,
 )
+from .cache_keys import build_object_key, build_collection_tag
+from .cache_response import (
+    swr_cache_response,
+    payload_cache_response,
+    PayloadCacheResponseMixin,
+    set_etag,
+)
+from .search import HydratedSearchResults, AsyncHydratedSearchResults
+from .async_redis import get_async_redis_connection
+from .async_views import AsyncReadAPIView
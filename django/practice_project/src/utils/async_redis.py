@@ -0,0 +1,64 @@
+import asyncio
+import weakref
+
+from django.conf import settings
+from redis.asyncio import ConnectionPool, Redis
+
+# Connection pools of each event loop, by cache alias
+_pools = weakref.WeakKeyDictionary()
+
+# Generators disconnecting the pools of each event loop, see `_disconnect_on_shutdown`
+_shutdown_hooks = weakref.WeakKeyDictionary()
+
+
+async def _disconnect_on_shutdown(pools):
+    """
+    Disconnects the pools of an event loop when the loop shuts down.
+
+    Started once per loop and suspended until then: `asyncio.run`, used by asgiref
+    and the ASGI servers, closes the pending async generators of a loop before closing
+    it. Connections left open would be closed by the garbage collector instead, on a
+    closed loop.
+    """
+    try:
+        yield
+    finally:
+        for pool in pools.values():
+            await pool.disconnect()
+
+
+def get_async_redis_connection(alias="default"):
+    """
+    Returns a `redis.asyncio` client on the Redis server of a cache.
+
+    The counterpart of `django_redis.get_redis_connection` for async views. Pools of
+    `redis.asyncio` can't be shared between event loops, one pool is kept per loop.
+    Its arguments are read from the `ASYNC_CONNECTION_POOL_KWARGS` option of the cache.
+
+    Must be called from a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+
+    if loop not in _pools:
+        pools = _pools[loop] = {}
+
+        # Loops only keep weak references to their async generators
+        _shutdown_hooks[loop] = _disconnect_on_shutdown(pools)
+        asyncio.ensure_future(anext(_shutdown_hooks[loop]))
+
+    pools = _pools[loop]
+
+    if alias not in pools:
+        params = settings.CACHES[alias]
+        locations = params["LOCATION"]
+
+        # django-redis accepts several servers, the first one is the primary
+        if isinstance(locations, str):
+            locations = locations.split(",")
+
+        pools[alias] = ConnectionPool.from_url(
+            locations[0].strip(),
+            **params.get("OPTIONS", {}).get("ASYNC_CONNECTION_POOL_KWARGS", {}),
+        )
+
+    return Redis(connection_pool=pools[alias])
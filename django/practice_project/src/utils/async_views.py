@@ -0,0 +1,110 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class AsyncReadAPIView(View):
+    """
+    Base of the read-only views running on the event loop of the ASGI application.
+
+    DRF views are synchronous, each request holds a worker while it waits on Postgres,
+    Redis or Elasticsearch. These views are coroutines instead: Redis and Elasticsearch
+    are awaited on the event loop, and queries of the async ORM run in the thread of
+    the request while the loop serves other requests.
+
+    - Requests are authenticated with the same JSON web tokens as the API, then
+      throttled with the same `DEFAULT_THROTTLE_CLASSES` and rates.
+    - Handlers receive a DRF `Request` and return the data of the response, so the
+      paginations and serializers of the sync views are reused.
+    - API exceptions are rendered like DRF does, e.g. 404 with a `detail`.
+    """
+
+    http_method_names = ["get", "options"]
+    authentication_class = JWTAuthentication
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            self._paginator = self.pagination_class()
+
+        return self._paginator
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() not in self.http_method_names:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+
+        if request.method == "OPTIONS":
+            return await self.options(request, *args, **kwargs)
+
+        self.authentication = self.authentication_class()
+
+        try:
+            self.request = Request(request, authenticators=())
+            self.request.user = await self.authenticate(request)
+            await sync_to_async(self.check_throttles)(self.request)
+
+            data = await self.get(self.request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+        return JsonResponse(data, safe=False)
+
+    async def authenticate(self, request):
+        """
+        Returns the user of the JSON web token of the request.
+
+        Raises:
+            NotAuthenticated: If the request has no token.
+            AuthenticationFailed: If the token or its user isn't valid.
+        """
+        header = self.authentication.get_header(request)
+        raw_token = self.authentication.get_raw_token(header) if header else None
+
+        if raw_token is None:
+            raise exceptions.NotAuthenticated()
+
+        validated_token = self.authentication.get_validated_token(raw_token)
+
+        return await sync_to_async(self.authentication.get_user)(validated_token)
+
+    def get_throttles(self):
+        return [throttle() for throttle in self.throttle_classes]
+
+    def check_throttles(self, request):
+        """
+        Checks the request against every throttle, like `APIView` does.
+
+        Raises:
+            Throttled: If a throttle refuses the request.
+        """
+        durations = [
+            throttle.wait()
+            for throttle in self.get_throttles()
+            if not throttle.allow_request(request, self)
+        ]
+
+        if durations:
+            durations = [duration for duration in durations if duration is not None]
+            raise exceptions.Throttled(wait=max(durations, default=None))
+
+    def handle_exception(self, exc):
+        data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        response = JsonResponse(data, status=exc.status_code)
+
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(
+                self.request
+            )
+
+        if getattr(exc, "wait", None):
+            response["Retry-After"] = "%d" % exc.wait
+
+        return response
@@ -1,4 +1,16 @@
-import hashlib
+import time
+
+from django.core.cache import cache
+
+from .cache_keys import (
+    build_namespace_from_resources,
+    build_tags_from_resources,
+    extract_query_params_from_path,
+    extract_resources_and_ids_from_path,
+)
+
+# Prefix of the keys holding the current version of each cache tag
+TAG_VERSION_KEY_PREFIX = "tags"
 
 
 def default_cache_key_func(view_instance, view_method, request, args, kwargs) -> str:
@@ -7,7 +19,7 @@ def default_cache_key_func(view_instance, view_method, request, args, kwargs) ->
 
     namespaces = build_namespace_from_resources(resources_and_ids, query_params)
 
-    return namespaces
+    return build_versioned_key(namespaces, build_tags_from_resources(resources_and_ids))
 
 
 def default_list_cache_key_func(self, view_method, request, args, **kwargs) -> str:
@@ -16,7 +28,7 @@ def default_list_cache_key_func(self, view_method, request, args, **kwargs) -> s
 
     namespaces = build_namespace_from_resources(resources_and_ids, query_params)
 
-    return namespaces
+    return build_versioned_key(namespaces, build_tags_from_resources(resources_and_ids))
 
 
 def default_object_cache_key_func(
@@ -30,107 +42,73 @@ def default_object_cache_key_func(
     return namespaces
 
 
-def generate_hash(input_string):
-    # Create a SHA-256 hash object
-    hash_object = hashlib.sha256()
-
-    # Update the hash object with the input string encoded to bytes
-    hash_object.update(input_string.encode("utf-8"))
+def get_tag_version_key(tag):
+    """Return the cache key holding the current version of a tag."""
+    return f"{TAG_VERSION_KEY_PREFIX}:{tag}"
 
-    # Get the hexadecimal representation of the hash
-    hashed_value = hash_object.hexdigest()
 
-    return hashed_value
-
-
-def build_namespace_from_resources(resources_and_ids, query_params):
+def get_tag_versions(tags):
     """
-    Builds a namespace string from a list of resource-ID dictionaries, appending query parameters
-    in the format 'resource:id:params:key=value&key=value' if the resource ID is None.
-    If no query parameters are provided, it will append an empty 'params:' segment.
+    Fetches the current version of each tag in a single round trip.
 
-    Args:
-        resources_and_ids: List of dictionaries in the format [{'resource': id}, ...]
-        query_params: Dictionary of query parameters (optional, used only when resource_id is None).
-
-    Returns:
-        string: A namespace string in the format 'resource:id' or 'resource' if ID is None,
-                with query parameters appended as a 'params' segment.
-    """
-    namespaces = []
-
-    # Build the base namespace from resources and IDs
-    for resource_dict in resources_and_ids:
-        for resource, resource_id in resource_dict.items():
-            # If resource_id is None, return just the resource name and add params:
-            if resource_id is None:
-                query_str = "&".join(
-                    [f"{key}={value}" for key, value in query_params.items()]
-                )
-
-                # Generate a hash for the query string
-                hashed_query_string = generate_hash(query_str)
-                namespaces.append(f"{resource}:params:{hashed_query_string}")
-            else:
-                # Generate a hash for the resource ID
-                hashed_resource_id = generate_hash(resource_id)
-                namespaces.append(f"{resource}:{hashed_resource_id}")
-
-    # Convert to a single string (join with colon)
-    return ":".join(namespaces)
-
-
-def extract_resources_and_ids_from_path(request):
-    """
-    Extracts resources and their IDs from a request's URL path, excluding the 'api' segment if it's the first.
-    If no ID is present for a resource, it returns None for that resource.
+    Tags that have never been invalidated are initialised with a fresh version, so that
+    a version is never reused after the tag key has been evicted.
 
     Args:
-        request: Django HTTP request object.
+        tags: Iterable of tag names.
 
     Returns:
-        list of dictionaries: [{'resource': id}, ...] where resource is the name and id is the associated value or None.
+        dict: Mapping of tag name to its current version.
     """
+    keys = {get_tag_version_key(tag): tag for tag in tags}
+    versions = cache.get_many(list(keys))
 
-    # Split the URL path into individual segments, removing any empty segments
-    path_segments = [segment for segment in request.path.split("/") if segment]
-
-    # If the path starts with 'api', remove it
-    if path_segments and path_segments[0] == "api":
-        path_segments.pop(0)
-
-    # Initialize an empty list to store the resource-ID pairs
-    resources_and_ids = []
+    for key in keys.keys() - versions.keys():
+        version = time.time_ns()
 
-    # Iterate through the path segments in steps of 2 (resource and ID)
-    for i in range(0, len(path_segments), 2):
-        # Resource is at the even index (0, 2, 4, ...)
-        resource = path_segments[i]
+        # Another worker may have initialised the tag in the meantime
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
 
-        # Check if the next segment exists, if not, assign None for the ID
-        resource_id = path_segments[i + 1] if i + 1 < len(path_segments) else None
+        versions[key] = version
 
-        # Add the resource and its ID (or None) as a dictionary to the result list
-        resources_and_ids.append({resource: resource_id})
+    return {keys[key]: version for key, version in versions.items()}
 
-    return resources_and_ids
 
-
-def extract_query_params_from_path(request):
+def build_versioned_key(namespace, tags):
     """
-    Extracts query parameters from a request's URL path.
+    Appends the current versions of the given tags to a cache key.
+
+    Bumping the version of any tag changes the key, so every response depending on it
+    is invalidated at once without scanning the keyspace. The old entries simply expire.
 
     Args:
-        request: Django HTTP request object.
+        namespace: The cache key built from the request.
+        tags: List of tags the cached response depends on.
 
     Returns:
-        dict: Dictionary of query parameters.
+        string: The cache key with a 'v:<version>' segment per tag.
     """
+    if not tags:
+        return namespace
+
+    versions = get_tag_versions(tags)
+    version_segments = [f"v:{versions[tag]}" for tag in tags]
 
-    # Convert the QueryDict to a dictionary
-    query_params = request.query_params.dict()
+    return ":".join([namespace, *version_segments])
 
-    # Convert the QueryDict to a dictionary and sort it
-    sorted_query_params = dict(sorted(query_params.items()))
 
-    return sorted_query_params
+def invalidate_tags(*tags):
+    """
+    Invalidates every cached response depending on the given tags.
+
+    This is a single write per call, independent of the number of cached keys.
+
+    Args:
+        tags: Tag names to invalidate, e.g. 'posts' or 'posts:5:comments'.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {get_tag_version_key(tag): version for tag in tags},
+        timeout=None,
+    )
@@ -0,0 +1,314 @@
+import fnmatch
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+
+from .metrics import get_metrics, incr_metric
+
+logger = logging.getLogger(__name__)
+
+# Value sent on the invalidation channel to drop every local entry
+CLEAR_ALL = "*"
+
+
+class LocalLRUCache:
+    """
+    Process-wide LRU store of at most `max_entries` values, with a TTL per entry.
+
+    Values are kept as Python objects so that a hit skips unpickling, callers must not
+    mutate them. The store is bounded by its number of entries rather than their size,
+    measuring a value would mean pickling it again on every set.
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Incremented on every invalidation, see `TwoTierRedisCache.get`
+        self.epoch = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, epoch):
+        with self.lock:
+            # An invalidation arrived while the value was read from Redis
+            if epoch != self.epoch:
+                return
+
+            self.entries[key] = (value, time.monotonic() + self.timeout)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, keys):
+        with self.lock:
+            self.epoch += 1
+
+            for key in keys:
+                if key == CLEAR_ALL:
+                    self.entries.clear()
+                elif "*" in key:
+                    for matching_key in fnmatch.filter(list(self.entries), key):
+                        del self.entries[matching_key]
+                else:
+                    self.entries.pop(key, None)
+
+
+class TwoTierRedisCache(RedisCache):
+    """
+    django-redis backend answering repeat reads of hot keys from an in-process LRU.
+
+    Only keys starting with one of `LOCAL_CACHE_KEY_PREFIXES` go through the local tier.
+    Every write or delete of such a key is published on a Redis channel, each worker
+    subscribes to it and drops its local copy. A worker that misses messages (e.g. while
+    reconnecting) clears its whole local tier, and `LOCAL_CACHE_TIMEOUT` bounds how long
+    a local entry can outlive its Redis counterpart.
+
+    Options:
+        LOCAL_CACHE_MAX_ENTRIES: Number of values in the local tier of each worker.
+        LOCAL_CACHE_TIMEOUT: Seconds a value is kept in the local tier.
+        LOCAL_CACHE_KEY_PREFIXES: Prefixes of the keys kept in the local tier.
+    """
+
+    # Local tiers and subscriber threads, shared by the per-thread backend instances
+    _local_caches = {}
+    _subscribers = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+
+        options = params.get("OPTIONS", {})
+        self._local_max_entries = options.get("LOCAL_CACHE_MAX_ENTRIES", 1000)
+        self._local_timeout = options.get("LOCAL_CACHE_TIMEOUT", 30)
+        self._local_prefixes = tuple(options.get("LOCAL_CACHE_KEY_PREFIXES", ()))
+
+        self._local_cache_id = f"{server}:{self.key_prefix}"
+        self._channel = f"cache:invalidate:{self._local_cache_id}"
+        self._metric_name = f"cache_tiers:{self.key_prefix or 'default'}"
+
+    @property
+    def local_cache(self):
+        """Return the local tier of this process, starting its subscriber if needed."""
+        with self._registry_lock:
+            local_cache = self._local_caches.get(self._local_cache_id)
+
+            if local_cache is None:
+                local_cache = LocalLRUCache(
+                    self._local_max_entries, self._local_timeout
+                )
+                self._local_caches[self._local_cache_id] = local_cache
+
+            # Threads don't survive a fork, a pre-forking server needs one per worker
+            subscriber = self._subscribers.get(self._local_cache_id)
+            if subscriber is None or subscriber[0] != os.getpid():
+                thread = threading.Thread(
+                    target=self._listen,
+                    args=(local_cache,),
+                    name="cache-invalidation-subscriber",
+                    daemon=True,
+                )
+                self._subscribers[self._local_cache_id] = (os.getpid(), thread)
+                local_cache.invalidate([CLEAR_ALL])
+                thread.start()
+
+        return local_cache
+
+    def _listen(self, local_cache):
+        while True:
+            try:
+                pubsub = self.client.get_client(write=False).pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(self._channel)
+
+                for message in pubsub.listen():
+                    local_cache.invalidate(json.loads(message["data"]))
+            except Exception:
+                logger.exception("Cache invalidation subscriber disconnected")
+
+                # Messages may have been missed while disconnected
+                local_cache.invalidate([CLEAR_ALL])
+                time.sleep(1)
+
+    def _is_local(self, key):
+        return key.startswith(self._local_prefixes)
+
+    def _publish(self, made_keys):
+        self.local_cache.invalidate(made_keys)
+        self.client.get_client(write=True).publish(self._channel, json.dumps(made_keys))
+
+    def _record(self, tier, hit):
+        incr_metric(self._metric_name, f"{tier}_{'hit' if hit else 'miss'}")
+
+    def get(self, key, default=None, version=None, client=None):
+        if not self._is_local(key):
+            return super().get(key, default, version, client)
+
+        made_key = self.make_key(key, version)
+        local_cache = self.local_cache
+
+        entry = local_cache.get(made_key)
+        self._record("local", entry is not None)
+        if entry is not None:
+            return entry[0]
+
+        epoch = local_cache.epoch
+        value = super().get(key, None, version, client)
+        self._record("redis", value is not None)
+
+        if value is None:
+            return default
+
+        local_cache.set(made_key, value, epoch)
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        local_keys = [key for key in keys if self._is_local(key)]
+        if not local_keys:
+            return super().get_many(keys, version, client)
+
+        local_cache = self.local_cache
+        values = {}
+
+        for key in local_keys:
+            entry = local_cache.get(self.make_key(key, version))
+            self._record("local", entry is not None)
+
+            if entry is not None:
+                values[key] = entry[0]
+
+        remaining_keys = [key for key in keys if key not in values]
+        if not remaining_keys:
+            return values
+
+        epoch = local_cache.epoch
+        fetched = super().get_many(remaining_keys, version, client)
+
+        for key in remaining_keys:
+            if not self._is_local(key):
+                continue
+
+            self._record("redis", key in fetched)
+            if key in fetched:
+                local_cache.set(self.make_key(key, version), fetched[key], epoch)
+
+        values.update(fetched)
+        return values
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set(key, value, timeout, version, **kwargs)
+
+        if self._is_local(key):
+            self._publish([self.make_key(key, version)])
+
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().add(key, value, timeout, version, client)
+
+        if result and self._is_local(key):
+            self._publish([self.make_key(key, version)])
+
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().set_many(data, timeout, version, client)
+
+        made_keys = [self.make_key(key, version) for key in data if self._is_local(key)]
+        if made_keys:
+            self._publish(made_keys)
+
+        return result
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        result = super().delete(key, version, prefix, client)
+
+        if self._is_local(key):
+            self._publish([self.make_key(key, version)])
+
+        return result
+
+    def delete_many(self, keys, version=None, client=None):
+        result = super().delete_many(keys, version, client)
+
+        made_keys = [self.make_key(key, version) for key in keys if self._is_local(key)]
+        if made_keys:
+            self._publish(made_keys)
+
+        return result
+
+    def delete_pattern(self, pattern, version=None, **kwargs):
+        result = super().delete_pattern(pattern, version=version, **kwargs)
+
+        self._publish([self.make_key(pattern, version)])
+
+        return result
+
+    def incr(self, key, delta=1, version=None, client=None, **kwargs):
+        result = super().incr(key, delta, version, client, **kwargs)
+
+        if self._is_local(key):
+            self._publish([self.make_key(key, version)])
+
+        return result
+
+    def decr(self, key, delta=1, version=None, client=None, **kwargs):
+        result = super().decr(key, delta, version, client, **kwargs)
+
+        if self._is_local(key):
+            self._publish([self.make_key(key, version)])
+
+        return result
+
+    def clear(self):
+        result = super().clear()
+
+        self._publish([CLEAR_ALL])
+
+        return result
+
+    def get_tier_stats(self):
+        """
+        Returns the hit ratio of each tier, aggregated over every worker.
+
+        Returns:
+            dict: {'local': {'hit': ..., 'miss': ..., 'hit_ratio': ...}, 'redis': {...}}
+        """
+        counters = get_metrics(self._metric_name)
+        stats = {}
+
+        for tier in ("local", "redis"):
+            hits = counters.get(f"{tier}_hit", 0)
+            misses = counters.get(f"{tier}_miss", 0)
+            lookups = hits + misses
+
+            stats[tier] = {
+                "hit": hits,
+                "miss": misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+        return stats
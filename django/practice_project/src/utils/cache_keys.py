@@ -0,0 +1,161 @@
+import hashlib
+from urllib.parse import urlencode
+
+
+def generate_hash(input_string):
+    # Create a SHA-256 hash object
+    hash_object = hashlib.sha256()
+
+    # Update the hash object with the input string encoded to bytes
+    hash_object.update(input_string.encode("utf-8"))
+
+    # Get the hexadecimal representation of the hash
+    hashed_value = hash_object.hexdigest()
+
+    return hashed_value
+
+
+def build_namespace_from_resources(resources_and_ids, query_params=None):
+    """
+    Builds a namespace string from a list of resource-ID dictionaries, appending query parameters
+    in the format 'resource:id:params:<hash>' if the resource ID is None.
+    If no query parameters are provided, it will append an empty 'params:' segment.
+
+    Resource IDs are kept as-is so that the invalidation code can rebuild the same key
+    from a model instance, e.g. 'posts:5' or 'posts:5:comments:7'.
+
+    Args:
+        resources_and_ids: List of dictionaries in the format [{'resource': id}, ...]
+        query_params: Dictionary of query parameters (optional, used only when resource_id is None).
+
+    Returns:
+        string: A namespace string in the format 'resource:id' or 'resource' if ID is None,
+                with query parameters appended as a 'params' segment.
+    """
+    query_params = query_params or {}
+    namespaces = []
+
+    # Build the base namespace from resources and IDs
+    for resource_dict in resources_and_ids:
+        for resource, resource_id in resource_dict.items():
+            # If resource_id is None, return just the resource name and add params:
+            if resource_id is None:
+                # Encode the parameters so that values containing '&' or '=' can't collide
+                query_str = urlencode(query_params, doseq=True)
+
+                # Generate a hash for the query string
+                hashed_query_string = generate_hash(query_str)
+                namespaces.append(f"{resource}:params:{hashed_query_string}")
+            else:
+                namespaces.append(f"{resource}:{resource_id}")
+
+    # Convert to a single string (join with colon)
+    return ":".join(namespaces)
+
+
+def build_tags_from_resources(resources_and_ids):
+    """
+    Builds the invalidation tags a cached response depends on.
+
+    Only collection URLs (where the last resource has no ID) are tagged. The tag is the
+    resource path with raw IDs, e.g. 'posts' or 'posts:5:comments'.
+
+    Args:
+        resources_and_ids: List of dictionaries in the format [{'resource': id}, ...]
+
+    Returns:
+        list: The tags of the response, empty for detail URLs.
+    """
+    segments = []
+
+    for resource_dict in resources_and_ids:
+        for resource, resource_id in resource_dict.items():
+            segments.append(resource)
+
+            if resource_id is None:
+                return [":".join(segments)]
+
+            segments.append(str(resource_id))
+
+    return []
+
+
+def build_object_key(*resources_and_ids):
+    """
+    Builds the cache key of a detail response from (resource, id) pairs.
+
+    Example:
+        build_object_key(("posts", 5), ("comments", 7)) == "posts:5:comments:7"
+    """
+    return build_namespace_from_resources(
+        [{resource: resource_id} for resource, resource_id in resources_and_ids]
+    )
+
+
+def build_collection_tag(*resources_and_ids, resource):
+    """
+    Builds the tag of a collection nested under the given (resource, id) pairs.
+
+    Example:
+        build_collection_tag(("posts", 5), resource="comments") == "posts:5:comments"
+    """
+    return build_tags_from_resources(
+        [{name: resource_id} for name, resource_id in resources_and_ids]
+        + [{resource: None}]
+    )[0]
+
+
+def extract_resources_and_ids_from_path(request):
+    """
+    Extracts resources and their IDs from a request's URL path, excluding the 'api' segment if it's the first.
+    If no ID is present for a resource, it returns None for that resource.
+
+    Args:
+        request: Django HTTP request object.
+
+    Returns:
+        list of dictionaries: [{'resource': id}, ...] where resource is the name and id is the associated value or None.
+    """
+
+    # Split the URL path into individual segments, removing any empty segments
+    path_segments = [segment for segment in request.path.split("/") if segment]
+
+    # If the path starts with 'api', remove it
+    if path_segments and path_segments[0] == "api":
+        path_segments.pop(0)
+
+    # Initialize an empty list to store the resource-ID pairs
+    resources_and_ids = []
+
+    # Iterate through the path segments in steps of 2 (resource and ID)
+    for i in range(0, len(path_segments), 2):
+        # Resource is at the even index (0, 2, 4, ...)
+        resource = path_segments[i]
+
+        # Check if the next segment exists, if not, assign None for the ID
+        resource_id = path_segments[i + 1] if i + 1 < len(path_segments) else None
+
+        # Add the resource and its ID (or None) as a dictionary to the result list
+        resources_and_ids.append({resource: resource_id})
+
+    return resources_and_ids
+
+
+def extract_query_params_from_path(request):
+    """
+    Extracts query parameters from a request's URL path.
+
+    Args:
+        request: Django HTTP request object.
+
+    Returns:
+        dict: Dictionary of query parameters, mapping each key to the list of its values.
+    """
+
+    # Convert the QueryDict to a dictionary, keeping repeated parameters
+    query_params = dict(request.query_params.lists())
+
+    # Sort it so the same parameters in a different order share a key
+    sorted_query_params = dict(sorted(query_params.items()))
+
+    return sorted_query_params
@@ -0,0 +1,344 @@
+import hashlib
+import time
+from collections import namedtuple
+from functools import wraps, WRAPPER_ASSIGNMENTS
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http.response import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from redis.exceptions import LockError
+from rest_framework_extensions.cache.decorators import CacheResponse
+from rest_framework_extensions.cache.mixins import BaseCacheResponseMixin
+from rest_framework_extensions.settings import extensions_api_settings
+
+from .cache import get_tag_versions
+from .cache_keys import (
+    build_namespace_from_resources,
+    build_tags_from_resources,
+    extract_query_params_from_path,
+    extract_resources_and_ids_from_path,
+)
+from .compression import compress, decompress
+from .metrics import incr_metric
+
+# Rendered JSON of a cached response, compressed with `codec`, and its ETag
+CachedPayload = namedtuple("CachedPayload", ["status", "etag", "codec", "content"])
+
+
+def make_etag(content):
+    """Return the ETag of the content of a response."""
+    return quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest())
+
+
+def set_etag(request, response, etag=None):
+    """
+    Sets the ETag of a rendered response.
+
+    Returns:
+        The response, or an empty 304 response if `If-None-Match` has the ETag.
+    """
+    response["ETag"] = etag or make_etag(response.content)
+
+    return get_conditional_response(request, etag=response["ETag"], response=response)
+
+
+class PayloadCacheMixin:
+    """
+    Stores responses in the cache as compact `CachedPayload`s.
+
+    Only the rendered JSON is kept, compressed with `CACHE_RESPONSE_COMPRESSION`, not
+    the headers: DRF sets them again when finalizing the response. A hit is served as
+    a plain `HttpResponse` of that JSON without going through a renderer, with an ETag
+    computed once when the payload was stored.
+
+    Views adding per-user data to the cached content set `conditional_cache_response`
+    to False and set the ETag of the final content with `set_etag` instead.
+
+    Besides the hits and misses of `metric_name`, `<metric_name>:payload` counts the
+    rendered and stored bytes, and the seconds spent serving hits and misses.
+    """
+
+    def is_conditional(self, view_instance):
+        return getattr(view_instance, "conditional_cache_response", True)
+
+    def build_payload(self, response):
+        content = response.rendered_content
+        codec, compressed = compress(content)
+
+        return CachedPayload(
+            response.status_code, make_etag(content), codec, compressed
+        )
+
+    def build_payload_response(self, request, payload, conditional):
+        response = HttpResponse(
+            content=decompress(payload.codec, payload.content),
+            status=payload.status,
+            content_type="application/json",
+        )
+
+        if not conditional:
+            return response
+
+        return set_etag(request, response, payload.etag)
+
+    def record_payload(self, metric_name, payload, response):
+        payload_metric_name = f"{metric_name}:payload"
+
+        incr_metric(payload_metric_name, "stored")
+        incr_metric(
+            payload_metric_name, "rendered_bytes", len(response.rendered_content)
+        )
+        incr_metric(payload_metric_name, "stored_bytes", len(payload.content))
+
+    def record_latency(self, metric_name, outcome, started):
+        incr_metric(
+            f"{metric_name}:payload",
+            f"{outcome}_seconds",
+            time.perf_counter() - started,
+        )
+
+
+class StaleWhileRevalidateCacheResponse(PayloadCacheMixin):
+    """
+    Cache a DRF response, serving the stale value while a single worker recomputes it.
+
+    Unlike `rest_framework_extensions.cache.decorators.cache_response`, the entry is stored
+    under a key that does not change when its tags are invalidated. The entry remembers the
+    tag versions it was computed with, so after an invalidation (or once the timeout has
+    passed) it becomes stale instead of disappearing:
+
+    - hit: the entry is fresh and returned as-is.
+    - stale: another worker holds the lock and is recomputing, the stale entry is returned.
+    - miss: this worker took the lock (or there was nothing to serve) and recomputed.
+
+    On a cold miss, concurrent requests wait up to `lock_timeout` for the lock holder to
+    fill the cache instead of all running the view.
+    """
+
+    def __init__(
+        self,
+        timeout=None,
+        stale_timeout=None,
+        lock_timeout=None,
+        metric_name=None,
+    ):
+        if timeout is None:
+            timeout = extensions_api_settings.DEFAULT_CACHE_RESPONSE_TIMEOUT
+
+        if stale_timeout is None:
+            stale_timeout = settings.CACHE_RESPONSE_STALE_TIMEOUT
+
+        if lock_timeout is None:
+            lock_timeout = settings.CACHE_RESPONSE_LOCK_TIMEOUT
+
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.metric_name = metric_name
+
+    def __call__(self, func):
+        this = self
+
+        @wraps(func, assigned=WRAPPER_ASSIGNMENTS)
+        def inner(self, request, *args, **kwargs):
+            return this.process_cache_response(
+                view_instance=self,
+                view_method=func,
+                request=request,
+                args=args,
+                kwargs=kwargs,
+            )
+
+        return inner
+
+    def process_cache_response(self, view_instance, view_method, request, args, kwargs):
+        started = time.perf_counter()
+        metric_name = self.metric_name or (
+            f"cache:{view_instance.__class__.__name__}.{view_method.__name__}"
+        )
+        conditional = self.is_conditional(view_instance)
+        key, tags = self.calculate_key_and_tags(request)
+
+        entry = self.get_entry(key)
+        versions = get_tag_versions(tags)
+
+        if entry is not None and self.is_fresh(entry, versions):
+            return self.serve(request, entry, conditional, metric_name, "hit", started)
+
+        lock = cache.lock(
+            f"{key}:lock",
+            timeout=self.lock_timeout,
+            sleep=0.05,
+            blocking_timeout=self.lock_timeout,
+        )
+
+        # A stale entry is served to everybody but the worker holding the lock
+        if not lock.acquire(blocking=entry is None):
+            if entry is not None:
+                return self.serve(
+                    request, entry, conditional, metric_name, "stale", started
+                )
+
+            # The lock holder did not finish in time, compute without coalescing
+            incr_metric(metric_name, "miss")
+            return self.render(view_instance, view_method, request, args, kwargs)
+
+        try:
+            # The previous lock holder may have filled the cache while we waited
+            if entry is None:
+                entry = self.get_entry(key)
+
+                if entry is not None and self.is_fresh(entry, versions):
+                    return self.serve(
+                        request, entry, conditional, metric_name, "hit", started
+                    )
+
+            incr_metric(metric_name, "miss")
+            response = self.render(view_instance, view_method, request, args, kwargs)
+
+            if response.status_code < 400:
+                payload = self.build_payload(response)
+                cache.set(
+                    key,
+                    self.build_entry(payload, versions),
+                    self.timeout + self.stale_timeout,
+                )
+                self.record_payload(metric_name, payload, response)
+
+                if conditional:
+                    response = set_etag(request, response, payload.etag)
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # The lease expired while rendering, another worker owns the lock now
+                pass
+
+        self.record_latency(metric_name, "miss", started)
+        return response
+
+    def serve(self, request, entry, conditional, metric_name, outcome, started):
+        """Return the response of a cached entry, counted as a hit or a stale hit."""
+        incr_metric(metric_name, outcome)
+        response = self.build_payload_response(request, entry["payload"], conditional)
+        self.record_latency(metric_name, outcome, started)
+
+        return response
+
+    def get_entry(self, key):
+        entry = cache.get(key)
+
+        # Entries cached before payloads were compressed are recomputed
+        if not isinstance(entry, dict) or "payload" not in entry:
+            return None
+
+        return entry
+
+    def calculate_key_and_tags(self, request):
+        """Return the tag-independent cache key of the request and its tags."""
+        resources_and_ids = extract_resources_and_ids_from_path(request)
+        query_params = extract_query_params_from_path(request)
+
+        key = build_namespace_from_resources(resources_and_ids, query_params)
+
+        return f"swr:{key}", build_tags_from_resources(resources_and_ids)
+
+    def is_fresh(self, entry, versions):
+        return entry["versions"] == versions and entry["expires_at"] > time.time()
+
+    def render(self, view_instance, view_method, request, args, kwargs):
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
+        response.render()
+
+        return response
+
+    def build_entry(self, payload, versions):
+        return {
+            "versions": versions,
+            "expires_at": time.time() + self.timeout,
+            "payload": payload,
+        }
+
+
+swr_cache_response = StaleWhileRevalidateCacheResponse
+
+
+class PayloadCacheResponse(PayloadCacheMixin, CacheResponse):
+    """
+    `rest_framework_extensions.cache.decorators.cache_response`, storing payloads.
+
+    Keys, timeouts and invalidation are unchanged, entries are `CachedPayload`s instead
+    of pickled (content, status, headers) triples.
+    """
+
+    def __init__(self, timeout=None, key_func=None, metric_name=None, **kwargs):
+        super().__init__(timeout=timeout, key_func=key_func, **kwargs)
+        self.metric_name = metric_name
+
+    def process_cache_response(self, view_instance, view_method, request, args, kwargs):
+        started = time.perf_counter()
+        metric_name = self.metric_name or (
+            f"cache:{view_instance.__class__.__name__}.{view_method.__name__}"
+        )
+        conditional = self.is_conditional(view_instance)
+
+        key = self.calculate_key(
+            view_instance=view_instance,
+            view_method=view_method,
+            request=request,
+            args=args,
+            kwargs=kwargs,
+        )
+        payload = self.cache.get(key)
+
+        if isinstance(payload, CachedPayload):
+            incr_metric(metric_name, "hit")
+            response = self.build_payload_response(request, payload, conditional)
+            self.record_latency(metric_name, "hit", started)
+
+            return response
+
+        incr_metric(metric_name, "miss")
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
+        response.render()
+
+        if response.status_code < 400 or self.cache_errors:
+            payload = self.build_payload(response)
+            self.cache.set(
+                key, payload, self.calculate_timeout(view_instance=view_instance)
+            )
+            self.record_payload(metric_name, payload, response)
+
+            if conditional:
+                response = set_etag(request, response, payload.etag)
+
+        self.record_latency(metric_name, "miss", started)
+        return response
+
+
+payload_cache_response = PayloadCacheResponse
+
+
+class PayloadCacheResponseMixin(BaseCacheResponseMixin):
+    """
+    Caches `list` and `retrieve` like drf-extensions `CacheResponseMixin`, with the
+    same key functions and timeouts, as compact payloads served with an ETag.
+    """
+
+    # Set to False by views changing the cached content per user, see `set_etag`
+    conditional_cache_response = True
+
+    @payload_cache_response(
+        key_func="list_cache_key_func", timeout="list_cache_timeout"
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @payload_cache_response(
+        key_func="object_cache_key_func", timeout="object_cache_timeout"
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,91 @@
+import logging
+import zlib
+
+from django.conf import settings
+
+# Optional codecs, responses are stored uncompressed when they aren't installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+logger = logging.getLogger(__name__)
+
+# Codec of the payloads stored as-is
+IDENTITY = ""
+
+
+# Configured codecs that aren't installed, warned about once
+_unavailable = set()
+
+
+def _get_codecs():
+    """Return the (compress, decompress) functions of each installed codec."""
+    codecs = {"zlib": (zlib.compress, zlib.decompress)}
+
+    if zstandard is not None:
+        # Module-level functions, compressor objects can't be shared between threads
+        codecs["zstd"] = (
+            lambda content: zstandard.compress(content, 3),
+            zstandard.decompress,
+        )
+
+    if lz4 is not None:
+        codecs["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+
+    return codecs
+
+
+CODECS = _get_codecs()
+
+
+def get_codec():
+    """Return the configured `CACHE_RESPONSE_COMPRESSION`, if it is installed."""
+    codec = settings.CACHE_RESPONSE_COMPRESSION
+
+    if codec and codec not in CODECS:
+        if codec not in _unavailable:
+            _unavailable.add(codec)
+            logger.warning(
+                "Compression %r isn't installed, payloads are kept as-is", codec
+            )
+
+        return IDENTITY
+
+    return codec or IDENTITY
+
+
+def compress(content):
+    """
+    Compresses a payload with the configured codec.
+
+    Payloads smaller than `CACHE_RESPONSE_COMPRESS_MIN_BYTES`, or that don't shrink,
+    are kept as-is.
+
+    Returns:
+        tuple: The codec used and the compressed bytes.
+    """
+    codec = get_codec()
+
+    if codec == IDENTITY or len(content) < settings.CACHE_RESPONSE_COMPRESS_MIN_BYTES:
+        return IDENTITY, content
+
+    compressed = CODECS[codec][0](content)
+
+    if len(compressed) >= len(content):
+        return IDENTITY, content
+
+    return codec, compressed
+
+
+def decompress(codec, payload):
+    """Return the content of a payload compressed by `compress`."""
+    if codec == IDENTITY:
+        return payload
+
+    return CODECS[codec][1](payload)
@@ -0,0 +1,129 @@
+"""
+Debouncing of Celery tasks.
+
+A task queued again and again with the same arguments, e.g. for every edit of a post,
+runs once per burst, `countdown` seconds after its last call. The first call takes a
+Redis key per (task, arguments) holding the time the task is due, and schedules it.
+Calls made while the key is held are collapsed: they only push the due time back.
+
+When the task starts, `DebouncedTask` checks the due time. If calls pushed it back,
+the task is scheduled again for that time instead of running. Otherwise the key is
+released before the task reads anything, so a call made while it runs schedules
+another run and the final state is always processed. A burst of calls never more
+than `countdown` seconds apart keeps postponing the run.
+
+Calls are counted in the `debounce:<task name>` metric, as scheduled or collapsed,
+and the runs postponed by a collapsed call as deferred.
+"""
+
+import math
+import time
+
+from celery import Task
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from .metrics import incr_metric
+
+# Holds the key until the given due time if it is free, otherwise pushes its due time
+# back. Returns 1 if the key was taken
+DEBOUNCE_SCRIPT = """
+if redis.call("set", KEYS[1], ARGV[1], "NX", "EX", ARGV[2]) then
+    return 1
+end
+redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2])
+return 0
+"""
+
+# Releases the key if its due time has passed, otherwise returns the due time
+RELEASE_IF_DUE_SCRIPT = """
+local due = redis.call("get", KEYS[1])
+if due and tonumber(due) > tonumber(ARGV[1]) then
+    return due
+end
+redis.call("del", KEYS[1])
+return false
+"""
+
+
+def get_debounce_key(task, args):
+    """Return the Redis key held while a call of a task is scheduled."""
+    return ":".join(["debounce", task.name, *map(str, args)])
+
+
+def debounce(task, *args, countdown=None, **options):
+    """
+    Schedules a task, or postpones the same call if it is already scheduled.
+
+    Args:
+        task: The `DebouncedTask`.
+        args: Its arguments, they identify the call.
+        countdown: Seconds to wait for the burst to settle, `TASK_DEBOUNCE_COUNTDOWN`
+            by default.
+        options: Other options of `apply_async`.
+
+    Returns:
+        bool: Whether the task was scheduled, False if the call was collapsed into
+            the scheduled one.
+    """
+    if countdown is None:
+        countdown = settings.TASK_DEBOUNCE_COUNTDOWN
+
+    metric_name = f"debounce:{task.name}"
+    connection = get_redis_connection("default")
+
+    # The key expires in case the task is lost, the next call schedules it again
+    scheduled = connection.register_script(DEBOUNCE_SCRIPT)(
+        keys=[get_debounce_key(task, args)],
+        args=[
+            time.time() + countdown,
+            math.ceil(countdown) + settings.TASK_DEBOUNCE_TIMEOUT,
+        ],
+    )
+
+    if not scheduled:
+        incr_metric(metric_name, "collapsed")
+        return False
+
+    try:
+        task.apply_async(args, countdown=countdown or None, **options)
+    except Exception:
+        # Not scheduled, let the next call try again
+        release(task, *args)
+        raise
+
+    incr_metric(metric_name, "scheduled")
+    return True
+
+
+def release(task, *args):
+    """Let the next call of a task schedule it again, see `debounce`."""
+    get_redis_connection("default").delete(get_debounce_key(task, args))
+
+
+class DebouncedTask(Task):
+    """
+    Base of the tasks scheduled with `debounce`.
+
+    A run postponed by a later call is scheduled again for its new due time, otherwise
+    the key is released when the task starts.
+    """
+
+    def __call__(self, *args, **kwargs):
+        # Eager runs don't wait for their countdown, they would be deferred forever
+        if self.request.is_eager:
+            release(self, *args)
+            return super().__call__(*args, **kwargs)
+
+        release_if_due = get_redis_connection("default").register_script(
+            RELEASE_IF_DUE_SCRIPT
+        )
+        now = time.time()
+        due = release_if_due(keys=[get_debounce_key(self, args)], args=[now])
+
+        if due is not None:
+            incr_metric(f"debounce:{self.name}", "deferred")
+            self.apply_async(args, kwargs, countdown=float(due) - now)
+            return None
+
+        return super().__call__(*args, **kwargs)
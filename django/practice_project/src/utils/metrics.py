@@ -0,0 +1,105 @@
+import atexit
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# Prefix of the Redis hashes holding the counters of each metric
+METRICS_KEY_PREFIX = "metrics"
+
+# Increments not yet sent to Redis, flushed every METRICS_FLUSH_INTERVAL seconds
+_pending = defaultdict(lambda: defaultdict(int))
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def get_metrics_key(name):
+    """Return the Redis key of the hash holding the counters of a metric."""
+    return f"{METRICS_KEY_PREFIX}:{name}"
+
+
+def incr_metric(name, field, amount=1):
+    """
+    Increments a counter shared by every worker.
+
+    Increments are buffered in-process and sent to Redis in one pipeline at most every
+    `METRICS_FLUSH_INTERVAL` seconds, so recording a metric on a hot path is free.
+
+    Args:
+        name: Name of the metric, e.g. 'cache:PostViewSet.list'.
+        field: Counter to increment within the metric, e.g. 'hit'.
+        amount: Integer or float to add to the counter.
+    """
+    with _pending_lock:
+        _pending[name][field] += amount
+
+    if time.monotonic() - _last_flush >= settings.METRICS_FLUSH_INTERVAL:
+        flush_metrics()
+
+
+def flush_metrics():
+    """Send the buffered increments of this process to Redis."""
+    global _pending, _last_flush
+
+    with _pending_lock:
+        pending, _pending = _pending, defaultdict(lambda: defaultdict(int))
+        _last_flush = time.monotonic()
+
+    if not pending:
+        return
+
+    pipeline = get_redis_connection("default").pipeline(transaction=False)
+
+    for name, counters in pending.items():
+        for field, amount in counters.items():
+            if isinstance(amount, float):
+                pipeline.hincrbyfloat(get_metrics_key(name), field, amount)
+            else:
+                pipeline.hincrby(get_metrics_key(name), field, amount)
+
+    pipeline.execute()
+
+
+def get_metrics(name):
+    """
+    Returns the counters of a metric.
+
+    Args:
+        name: Name of the metric.
+
+    Returns:
+        dict: Mapping of counter name to its value.
+    """
+    flush_metrics()
+
+    connection = get_redis_connection("default")
+    counters = connection.hgetall(get_metrics_key(name))
+
+    return {
+        field.decode(): float(value) if b"." in value else int(value)
+        for field, value in counters.items()
+    }
+
+
+def list_metrics():
+    """Return the names of every recorded metric."""
+    flush_metrics()
+
+    connection = get_redis_connection("default")
+    prefix = f"{METRICS_KEY_PREFIX}:"
+
+    return sorted(
+        key.decode()[len(prefix) :] for key in connection.scan_iter(match=f"{prefix}*")
+    )
+
+
+def reset_metrics(name):
+    """Delete every counter of a metric."""
+    flush_metrics()
+
+    get_redis_connection("default").delete(get_metrics_key(name))
+
+
+atexit.register(flush_metrics)
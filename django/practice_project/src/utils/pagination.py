@@ -1,6 +1,224 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
     page_size = 10
+    page_size_query_param = "page_size"
     max_page_size = 100
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Asynchronous version of `paginate_queryset`, for the async views.
+
+        Besides querysets, paginates any sequence with `acount()` and
+        `aslice(start, stop)` coroutines, e.g. `AsyncHydratedSearchResults`.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+
+        # Counted here, before `page=last` is resolved from the number of pages, the
+        # paginator then never runs a query itself
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        # Bounds of `Paginator.page`, the last page takes the orphans
+        start = (number - 1) * paginator.per_page
+        stop = start + paginator.per_page
+        if stop + paginator.orphans >= paginator.count:
+            stop = paginator.count
+
+        if isinstance(queryset, QuerySet):
+            rows = [row async for row in queryset[start:stop]]
+        else:
+            rows = await queryset.aslice(start, stop)
+
+        self.page = Page(rows, number, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            # The browsable API should display pagination controls
+            self.display_page_controls = True
+
+        return rows
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates on the values of the last returned row instead of an offset.
+
+    Rows are ordered on `ordering`, which must end with a unique field (e.g.
+    `("-modified", "-id")`). The `cursor` returned for the next page encodes the
+    ordering values of the last row, the next page is every row strictly after it.
+    Pages stay stable when rows are inserted concurrently and no `COUNT(*)` is run.
+    """
+
+    page_size = StandardPagination.page_size
+    page_size_query_param = StandardPagination.page_size_query_param
+    max_page_size = StandardPagination.max_page_size
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Asynchronous version of `paginate_queryset`, for the async views."""
+        queryset = self.get_page_queryset(queryset, request)
+
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """Return the queryset of the rows of the requested page, and one more."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.get_after_filter(queryset.model, encoded))
+
+        # One extra row tells whether there is a next page
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_after_filter(self, model, encoded):
+        """Build the filter selecting the rows ordered after the cursor."""
+        values = self.decode_cursor(model, encoded)
+        conditions = []
+
+        # (a, b) after (x, y) is: a after x, or a == x and b after y
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+
+            equal = {
+                other.lstrip("-"): value
+                for other, value in zip(self.ordering[:index], values)
+            }
+            conditions.append(Q(**equal, **{f"{name}__{lookup}": values[index]}))
+
+        # Bounding the first field as well lets the database seek the index on the
+        # ordering to the cursor, rather than filter the rows from the first one
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+
+        return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & reduce(
+            or_, conditions
+        )
+
+    def encode_cursor(self, row):
+        values = [
+            row._meta.get_field(field.lstrip("-")).value_to_string(row)
+            for field in self.ordering
+        ]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, model, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+
+            if len(values) != len(self.ordering):
+                raise ValueError
+
+            return [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Lets clients of a paginated view opt in to keyset pagination.
+
+    Requests with `?pagination=keyset` or a `cursor` are paginated with
+    `KeysetPagination` ordered on `keyset_ordering`, the others keep using
+    `pagination_class`.
+    """
+
+    keyset_ordering = ("-id",)
+    pagination_query_param = "pagination"
+
+    def use_keyset_pagination(self):
+        if self.request is None:
+            return False
+
+        query_params = self.request.query_params
+
+        return (
+            query_params.get(self.pagination_query_param) == "keyset"
+            or KeysetPagination.cursor_query_param in query_params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.use_keyset_pagination():
+                self._paginator = KeysetPagination(self.keyset_ordering)
+            else:
+                self._paginator = super().paginator
+
+        return self._paginator
@@ -0,0 +1,65 @@
+class HydratedSearchResults:
+    """
+    Lazy sequence of model instances matching an Elasticsearch search.
+
+    Meant to be handed to a paginator: only the requested slice is fetched from
+    Elasticsearch (with `from`/`size` and without `_source`), then its rows are loaded
+    with a single `in_bulk` query on `queryset` and returned in the search order.
+    Hits whose row is missing from `queryset` (e.g. soft-deleted) are skipped.
+    """
+
+    def __init__(self, search, queryset):
+        self.search = search
+        self.queryset = queryset
+        self._count = None
+
+    def count(self):
+        """Return the total number of hits, using the count API."""
+        if self._count is None:
+            self._count = self.search.count()
+
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index : index + 1][0]
+
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+
+        if stop <= start:
+            return []
+
+        response = self.search.extra(from_=start, size=stop - start).source(False)
+        ids = [int(hit.meta.id) for hit in response.execute()]
+
+        rows = self.queryset.in_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]
+
+
+class AsyncHydratedSearchResults(HydratedSearchResults):
+    """
+    `HydratedSearchResults` of an `AsyncSearch`, for the async views.
+
+    Paginated with `StandardPagination.apaginate_queryset`: the hits are counted and
+    fetched without blocking the event loop, then loaded with `ain_bulk`.
+    """
+
+    async def acount(self):
+        if self._count is None:
+            self._count = await self.search.count()
+
+        return self._count
+
+    async def aslice(self, start, stop):
+        if stop <= start:
+            return []
+
+        response = self.search.extra(from_=start, size=stop - start).source(False)
+        ids = [int(hit.meta.id) for hit in await response.execute()]
+
+        rows = await self.queryset.ain_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]